@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 import pandas as pd
-from dateutil.relativedelta import relativedelta
+from bucket_rates import apply_shock
+from stress_scenarios import PointShock, Scenario, compile_scenarios
 
 # Data class to store various dates information including settlement and corresponding DataFrames.
 @dataclass
@@ -17,49 +18,21 @@ class RatesSet:
     future: pd.DataFrame      # DataFrame containing future rates.
     swap: pd.DataFrame        # DataFrame containing swap rates.
 
+# Curve steepener of Q7: -1 bp on the quotes maturing in 10 years, +1 bp on those maturing in 15 years.
+Q7_SCENARIO = Scenario("Q7 steepener", (PointShock(10, -0.01), PointShock(15, 0.01)))
+
 def Q7_scenario_rates_adj(
     rates_set: RatesSet, 
     dates_set: DatesSet,
 ) -> RatesSet:
-    # Convert the settlement date string to a pandas Timestamp.
-    settle_date = pd.to_datetime(dates_set.settle)
-    
-    # Calculate target dates: 10 and 15 years after the settlement date.
-    date_10 = settle_date + relativedelta(years=10)
-    date_15 = settle_date + relativedelta(years=15)
-    
-    # Update deposit rates:
-    for i in range(len(rates_set.depos)):
-        # Get the deposit's settle date from the DataFrame.
-        d = dates_set.depos['Settle Dates'].iloc[i]
-        # If the deposit date matches the 15-year target, add 0.01 to the 'Mid' rate.
-        if d == date_15:
-            rates_set.depos["Mid"].iloc[i] += 0.01
-        # If the deposit date matches the 10-year target, subtract 0.01 from the 'Mid' rate.
-        elif d == date_10:
-            rates_set.depos["Mid"].iloc[i] -= 0.01
+    """
+    Applies the Q7 curve steepener (Q7_SCENARIO) to the 'Mid' rates.
 
-    # Update future rates:
-    for i in range(len(rates_set.future)):
-        # Get the future's expiry date from the DataFrame.
-        d = dates_set.future['Expiry'].iloc[i]
-        # If the expiry date matches the 15-year target, add 0.01 to the 'Mid' rate.
-        if d == date_15:
-            rates_set.future["Mid"].iloc[i] += 0.01
-        # If the expiry date matches the 10-year target, subtract 0.01 from the 'Mid' rate.
-        elif d == date_10:
-            rates_set.future["Mid"].iloc[i] -= 0.01
+    Parameters:
+        rates_set (RatesSet): Object containing the DataFrames for depos, future, and swap.
+        dates_set (DatesSet): Object containing the settle date and the dates of the instruments.
 
-    # Update swap rates:
-    for i in range(len(rates_set.swap)):
-        # Get the swap date from the DataFrame.
-        d = dates_set.swap['Swap Dates'].iloc[i]
-        # If the swap date matches the 15-year target, add 0.01 to the 'Mid' rate.
-        if d == date_15:
-            rates_set.swap["Mid"].iloc[i] += 0.01
-        # If the swap date matches the 10-year target, subtract 0.01 from the 'Mid' rate.
-        elif d == date_10:
-            rates_set.swap["Mid"].iloc[i] -= 0.01
-            
-    # Return the adjusted rates set.
-    return rates_set
+    Returns:
+        RatesSet: A new RatesSet with the adjusted rates; rates_set is not modified.
+    """
+    return apply_shock(rates_set, compile_scenarios(dates_set, [Q7_SCENARIO])[0])
@@ -1,8 +1,9 @@
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
-import copy
 from dateutil.relativedelta import relativedelta
-from yearfrac import yearfrac, mod
+from yearfrac import to_datetime64
+from bootstrap import market_instrument_dates
 from typing import List
 
 # Define a data structure for storing various date-related DataFrames along with the settlement date.
@@ -20,6 +21,46 @@ class RatesSet:
     future: pd.DataFrame    # DataFrame containing future rates.
     swap: pd.DataFrame      # DataFrame containing swap rates.
 
+def bucket_shock_matrix(
+    dates_set: DatesSet,
+    bucket_years: List[int],
+    shift: float = 0.01,
+) -> np.ndarray:
+    """
+    Builds the matrix of key-rate (bucket) shifts of the Mid quotes, one row per bucket.
+
+    Each bucket is a pillar at settle + bucket_years[k] years. The shift of an instrument is weighted
+    by triangular functions of its maturity (depo settle date, future expiry, swap date): the weight
+    of bucket k is 1 on its pillar and goes linearly to 0 on the adjacent pillars. Before the first
+    pillar the first bucket has weight 1, after the last pillar the last bucket has weight 1, so the
+    rows always add up to a parallel shift.
+
+    Parameters:
+        dates_set (DatesSet): Object containing the settle date and the dates of the instruments.
+        bucket_years (List[int]): Pillars of the buckets, in years from the settle date, increasing.
+        shift (float): Shift on the pillar of each bucket, in the units of the Mid quotes (0.01 = 1 bp).
+
+    Returns:
+        np.ndarray: Matrix (n_buckets, n_quotes) of shifts with the columns in the order of
+                    market_quotes (depos, futures, swaps), to be passed to bootstrap_many.
+    """
+    if len(bucket_years) == 0 or np.any(np.diff(bucket_years) <= 0):
+        raise ValueError("Bucket years must be non-empty and strictly increasing.")
+
+    # Pillars and maturities of all the instruments as days, compared as in the per-row version
+    settle_date = pd.to_datetime(dates_set.settle)
+    pillars = to_datetime64([settle_date + relativedelta(years=bucket) for bucket in bucket_years])
+    _, _, maturities = market_instrument_dates(dates_set)
+    maturities = to_datetime64(maturities)
+
+    # Row k interpolates the k-th canonical vector: the triangular weights of every bucket at once
+    weights = np.array([
+        np.interp(maturities.astype(np.int64), pillars.astype(np.int64), unit)
+        for unit in np.eye(len(bucket_years))
+    ])
+    return shift * weights
+
+
 def shift_rates_set(
     rates_set: RatesSet, 
     dates_set: DatesSet, 
@@ -28,8 +69,10 @@ def shift_rates_set(
     """
     Applies a shift on the RatesSet for each bucket specified in bucket_years,
     where each bucket represents a number of years relative to the settle date.
-    Internally, the new dates are computed by adding the respective number of years
-    to dates_set.settle, but these computed dates are not returned.
+    The shifts are the rows of bucket_shock_matrix; the caller's rates_set is not modified.
+
+    Batched bootstraps should pass bucket_shock_matrix to bootstrap_many directly instead,
+    without building a RatesSet per bucket.
 
     Parameters:
         rates_set (RatesSet): Object containing the DataFrames for depos, future, and swap.
@@ -37,107 +80,29 @@ def shift_rates_set(
         bucket_years (List[int]): List of integers representing the number of years to add to the settle date.
 
     Returns:
-        List[RatesSet]: A list of RatesSet objects (one for each bucket; currently, the original rates_set
-                        is returned as a placeholder with modified rates).
+        List[RatesSet]: A list of RatesSet objects, one for each bucket, with shifted 'Mid' rates.
     """
-    shifted_rates_list = []  # List to store the shifted RatesSet objects.
-    computed_dates = []      # List to store computed new dates based on bucket_years.
-    
-    # Convert the settlement date string to a pandas Timestamp.
-    settle_date = pd.to_datetime(dates_set.settle)
-    
-    # Compute new dates by adding each bucket (in years) to the settlement date.
-    for bucket in bucket_years:
-        new_date = settle_date + relativedelta(years=bucket)
-        computed_dates.append(new_date)
-
-    # Iterate over each bucket index to apply different shifts.
-    for j in range(len(bucket_years)):
-        # Create a deep copy of the original rates_set to avoid modifying it in-place.
-        ratesSet_bucket = copy.deepcopy(rates_set)
-        
-        # For the first bucket (j == 0), apply an upward shift to the rates.
-        if j == 0:
-            # Process deposit rates.
-            for i in range(len(ratesSet_bucket.depos)):
-                # If the deposit's settle date is before or equal to the first computed date,
-                # increase the 'Mid' rate by 0.01.
-                if dates_set.depos['Settle Dates'].iloc[i] <= computed_dates[0]:
-                    ratesSet_bucket.depos["Mid"].iloc[i] += 0.01
-                # If the deposit's settle date is after or equal to the second computed date,
-                # do nothing (the line is present but does nothing).
-                elif dates_set.depos['Settle Dates'].iloc[i] >= computed_dates[1]:
-                    ratesSet_bucket.depos["Mid"].iloc[i]
-                # Otherwise, apply a proportional upward shift based on the year.
-                else:
-                    ratesSet_bucket.depos["Mid"].iloc[i] += 0.01 * (3 - 1/5 * (dates_set.depos['Settle Dates'].iloc[i].year - 2023))
-            
-            # Process future rates.
-            for i in range(len(ratesSet_bucket.future)):
-                # If the future's expiry date is before or equal to the first computed date,
-                # increase the 'Mid' rate by 0.01.
-                if dates_set.future['Expiry'].iloc[i] <= computed_dates[0]:
-                    ratesSet_bucket.future["Mid"].iloc[i] += 0.01
-                # If the future's expiry date is after or equal to the second computed date, do nothing.
-                elif dates_set.future['Expiry'].iloc[i] >= computed_dates[1]:    
-                    ratesSet_bucket.future["Mid"].iloc[i]
-                # Otherwise, apply a proportional upward shift based on the year.
-                else:
-                    ratesSet_bucket.future["Mid"].iloc[i] += 0.01 * (3 - 1/5 * (dates_set.future['Expiry'].iloc[i].year - 2023))
-
-            # Process swap rates.
-            for i in range(len(ratesSet_bucket.swap)):
-                # If the swap's date is before or equal to the first computed date,
-                # increase the 'Mid' rate by 0.01.
-                if dates_set.swap['Swap Dates'].iloc[i] <= computed_dates[0]:
-                    ratesSet_bucket.swap["Mid"].iloc[i] += 0.01
-                # If the swap's date is after or equal to the second computed date, do nothing.
-                elif dates_set.swap['Swap Dates'].iloc[i] >= computed_dates[1]:
-                    ratesSet_bucket.swap["Mid"].iloc[i]
-                # Otherwise, apply a proportional upward shift based on the year.
-                else:
-                    ratesSet_bucket.swap["Mid"].iloc[i] += 0.01 * (3 - 1/5 * (dates_set.swap['Swap Dates'].iloc[i].year - 2023))
-
-        # For subsequent buckets (j != 0), apply a downward shift to the rates.
-        else:
-            # Process deposit rates.
-            for i in range(len(ratesSet_bucket.depos)):
-                # If the deposit's settle date is before or equal to the first computed date, do nothing.
-                if dates_set.depos['Settle Dates'].iloc[i] <= computed_dates[0]:
-                    ratesSet_bucket.depos["Mid"].iloc[i]
-                # If the deposit's settle date is after or equal to the second computed date, increase the rate by 0.01.
-                elif dates_set.depos['Settle Dates'].iloc[i] >= computed_dates[1]:
-                    ratesSet_bucket.depos["Mid"].iloc[i] += 0.01
-                # Otherwise, apply a proportional downward shift based on the year.
-                else:
-                    ratesSet_bucket.depos["Mid"].iloc[i] += 0.01 * (-2 + 1/5 * (dates_set.depos['Settle Dates'].iloc[i].year - 2023))
-            
-            # Process future rates.
-            for i in range(len(ratesSet_bucket.future)):
-                # If the future's expiry date is before or equal to the first computed date, do nothing.
-                if dates_set.future['Expiry'].iloc[i] <= computed_dates[0]:
-                    ratesSet_bucket.future["Mid"].iloc[i]
-                # If the future's expiry date is after or equal to the second computed date, increase the rate by 0.01.
-                elif dates_set.future['Expiry'].iloc[i] >= computed_dates[1]:
-                    ratesSet_bucket.future["Mid"].iloc[i] += 0.01
-                # Otherwise, apply a proportional downward shift based on the year.
-                else:
-                    ratesSet_bucket.future["Mid"].iloc[i] += 0.01 * (-2 + 1/5 * (dates_set.future['Expiry'].iloc[i].year - 2023))
-
-            # Process swap rates.
-            for i in range(len(ratesSet_bucket.swap)):
-                # If the swap's date is before or equal to the first computed date, do nothing.
-                if dates_set.swap['Swap Dates'].iloc[i] <= computed_dates[0]:
-                    ratesSet_bucket.swap["Mid"].iloc[i]
-                # If the swap's date is after or equal to the second computed date, increase the rate by 0.01.
-                elif dates_set.swap['Swap Dates'].iloc[i] >= computed_dates[1]:
-                    ratesSet_bucket.swap["Mid"].iloc[i] += 0.01
-                # Otherwise, apply a proportional downward shift based on the year.
-                else:
-                    ratesSet_bucket.swap["Mid"].iloc[i] += 0.01 * (-2 + 1/5 * (dates_set.swap['Swap Dates'].iloc[i].year - 2023))
-
-        # Append the shifted RatesSet for this bucket to the list.
-        shifted_rates_list.append(ratesSet_bucket)
-    
-    # Return the list of shifted RatesSet objects.
-    return shifted_rates_list
+    return [apply_shock(rates_set, shock) for shock in bucket_shock_matrix(dates_set, bucket_years)]
+
+
+def apply_shock(rates_set: RatesSet, shock: np.ndarray) -> RatesSet:
+    """
+    Returns a new RatesSet with the shock added to the 'Mid' rates; rates_set is not modified.
+
+    Parameters:
+        rates_set (RatesSet): Object containing the DataFrames for depos, future, and swap.
+        shock (np.ndarray): Shifts of the Mid quotes, in the order of market_quotes (depos, futures, swaps).
+
+    Returns:
+        RatesSet: The shifted RatesSet.
+    """
+    # Positions of the depos, futures and swaps in the shock vector
+    frames = (rates_set.depos, rates_set.future, rates_set.swap)
+    bounds = np.cumsum([0] + [len(frame) for frame in frames])
+    if len(shock) != bounds[-1]:
+        raise ValueError(f"The shock must have {bounds[-1]} entries (depos, futures and swaps quotes).")
+
+    return type(rates_set)(*[
+        frame.assign(Mid=frame["Mid"].to_numpy(dtype=float) + shock[start:end])
+        for frame, start, end in zip(frames, bounds[:-1], bounds[1:])
+    ])
@@ -0,0 +1,25 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Shared fixtures of the tests: market data and bootstrapped curve of the assignment
+"""
+
+import os
+import pytest
+from readExcelData import readExcelData
+from bootstrap import bootstrap
+
+
+@pytest.fixture(scope="session")
+def market():
+    """
+    DatesSet and RatesSet of the workbook next to the tests (parsed, without touching the snapshots).
+    """
+    return readExcelData(os.path.join(os.path.dirname(__file__), "MktData_CurveBootstrap.xls"), use_snapshot=False)
+
+
+@pytest.fixture(scope="session")
+def bootstrapped(market):
+    """
+    Dates and discount factors DataFrames returned by bootstrap.
+    """
+    return bootstrap(*market)
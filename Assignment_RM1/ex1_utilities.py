@@ -7,13 +7,20 @@ from enum import Enum
 import numpy as np
 import pandas as pd
 import datetime as dt
-import calendar
+from calendar import monthrange
+from functools import lru_cache
 from scipy.stats import norm
 
 from bootstrap import bootstrap
 from readExcelData import readExcelData
 from typing import Iterable, Union, List, Tuple
-from yearfrac import yearfrac, mod
+from yearfrac import yearfrac_vec, to_datetime64, mod
+from discount_curve import DiscountCurve, as_discount_curve
+from business_calendar import BusinessCalendar, WEEKENDS, FOLLOWING
+
+
+# Maximum number of schedules kept in memory by payment_schedule
+SCHEDULE_CACHE_SIZE = 1024
 
 
 # Define an enumeration for the two types of swaptions
@@ -108,6 +115,7 @@ def business_date_offset(
     year_offset: int = 0,
     month_offset: int = 0,
     day_offset: int = 0,
+    calendar: BusinessCalendar = WEEKENDS,
 ) -> Union[dt.date, pd.Timestamp]:
     """
     Return the closest following business date to a reference date after applying the specified offset.
@@ -117,6 +125,7 @@ def business_date_offset(
         year_offset (int): Number of years to add.
         month_offset (int): Number of months to add.
         day_offset (int): Number of days to add.
+        calendar (BusinessCalendar): Business-day calendar (weekends only by default).
 
     Returns:
         Union[dt.date, pd.Timestamp]: Adjusted date moved to the closest following business day if needed.
@@ -133,18 +142,97 @@ def business_date_offset(
         adjusted_date = base_date.replace(year=year, month=month, day=day) + dt.timedelta(days=day_offset)
     except ValueError:
         # Determine the last day of the month
-        last_day_of_month = calendar.monthrange(year, month)[1]
+        last_day_of_month = monthrange(year, month)[1]
         adjusted_date = base_date.replace(year=year, month=month, day=last_day_of_month) + dt.timedelta(days=day_offset)
 
-    # If the adjusted date falls on a weekend, shift it to the next business day
-    if adjusted_date.weekday() == 5:  # Saturday
-        adjusted_date += dt.timedelta(days=2)
-    elif adjusted_date.weekday() == 6:  # Sunday
-        adjusted_date += dt.timedelta(days=1)
+    # If the adjusted date is not a business day, shift it to the next one (keeping the type of the date)
+    target = to_datetime64(adjusted_date)
+    adjusted_date += dt.timedelta(days=int((calendar.adjust(target, FOLLOWING) - target).astype(int)))
 
     return adjusted_date
 
 
+def add_months(
+    base_date: Union[dt.date, pd.Timestamp, np.datetime64],
+    month_offsets: Union[int, np.ndarray],
+    roll: str = FOLLOWING,
+    calendar: BusinessCalendar = WEEKENDS,
+) -> np.ndarray:
+    """
+    Vectorized version of business_date_offset for month offsets: adds each offset to the base date,
+    capping the day to the last valid day of the month, and rolls the results on business days.
+
+    Parameters:
+        base_date (Union[dt.date, pd.Timestamp, np.datetime64]): The starting date.
+        month_offsets (Union[int, np.ndarray]): Number(s) of months to add.
+        roll (str): Business-day convention ("following", "preceding", "modifiedfollowing", ...).
+        calendar (BusinessCalendar): Business-day calendar (weekends only by default).
+
+    Returns:
+        np.ndarray: Adjusted dates as datetime64[D].
+    """
+    base_date = to_datetime64(base_date)
+    base_month = base_date.astype("datetime64[M]")
+    day = (base_date - base_month.astype("datetime64[D]")).astype(int)
+
+    # First day of the target months and number of days of each of them
+    month_start = (base_month + np.asarray(month_offsets)).astype("datetime64[D]")
+    days_in_month = ((month_start.astype("datetime64[M]") + 1).astype("datetime64[D]") - month_start).astype(int)
+
+    # If the day is invalid (e.g., Feb 30), use the last valid day of the month
+    adjusted_dates = month_start + np.minimum(day, days_in_month - 1)
+
+    return calendar.adjust(adjusted_dates, roll)
+
+
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def _cached_schedule(
+    t0: np.datetime64, t1: np.datetime64, freq: int, roll: str, calendar: BusinessCalendar
+) -> np.ndarray:
+    """
+    Schedule from t0 to t1, memoized on (t0, t1, freq, roll, calendar). The returned array is read-only since it
+    is shared by all the callers.
+    """
+    if t0 >= t1:
+        dates = np.array([t0], dtype="datetime64[D]")
+    else:
+        # Upper bound on the number of dates strictly before t1
+        n_months = (t1.astype("datetime64[M]") - t0.astype("datetime64[M]")).astype(int) + 1
+        n_dates = n_months * freq // 12 + 2
+        candidates = add_months(t0, np.arange(1, n_dates + 1) * 12 // freq, roll, calendar)
+        # Keep the dates before t1 and make sure the final date is exactly t1
+        dates = np.concatenate(([t0], candidates[candidates < t1], [t1]))
+
+    dates.setflags(write=False)
+    return dates
+
+
+def payment_schedule(
+    t0: Union[dt.date, pd.Timestamp, np.datetime64],
+    t1: Union[dt.date, pd.Timestamp, np.datetime64],
+    freq: int,
+    roll: str = FOLLOWING,
+    calendar: BusinessCalendar = WEEKENDS,
+) -> np.ndarray:
+    """
+    Generate the dates from t0 to t1 inclusive with a specified frequency (number of dates per year) as
+    a datetime64[D] array, as date_series does. Schedules are built with vectorized month arithmetic and
+    kept in a bounded LRU cache keyed by (t0, t1, freq, roll, calendar): repeated calls, e.g. inside a root
+    finder or across scenarios, never rebuild a schedule that is already available.
+
+    Parameters:
+        t0 (Union[dt.date, pd.Timestamp, np.datetime64]): Start date.
+        t1 (Union[dt.date, pd.Timestamp, np.datetime64]): End date.
+        freq (int): Number of dates per year.
+        roll (str): Roll convention of the intermediate dates, "following" as in business_date_offset.
+        calendar (BusinessCalendar): Business-day calendar (weekends only by default).
+
+    Returns:
+        np.ndarray: Read-only array of dates from t0 to t1.
+    """
+    return _cached_schedule(to_datetime64(t0)[()], to_datetime64(t1)[()], int(freq), roll, calendar)
+
+
 def date_series(
     t0: Union[dt.date, pd.Timestamp], t1: Union[dt.date, pd.Timestamp], freq: int
 ) -> Union[List[dt.date], List[pd.Timestamp]]:
@@ -159,19 +247,34 @@ def date_series(
     Returns:
         List of dates from t0 to t1.
     """
-    # Start the series with the initial date
-    dates = [t0]
-    # Continue generating dates using business_date_offset until t1 is reached or exceeded
-    while dates[-1] < t1:
-        dates.append(business_date_offset(t0, month_offset=len(dates) * 12 // freq))
-    # Remove any date that overshoots t1
-    if dates[-1] > t1:
-        dates.pop()
-    # Ensure the final date is exactly t1
-    if dates[-1] != t1:
-        dates.append(t1)
+    dates = payment_schedule(t0, t1, freq)
 
-    return dates
+    # Return the dates with the same type of the inputs
+    if isinstance(t0, pd.Timestamp):
+        return list(pd.DatetimeIndex(dates))
+    if isinstance(t0, dt.datetime):
+        return list(pd.DatetimeIndex(dates).to_pydatetime())
+    return list(dates.astype(object))
+
+
+def accrual_fractions(
+    start_date: Union[dt.date, pd.Timestamp, np.datetime64],
+    payment_dates: Union[List[dt.date], np.ndarray],
+) -> np.ndarray:
+    """
+    Compute the EU 30/360 accruals of a fixed leg: the first period runs from start_date to the
+    first payment date, each following one between consecutive payment dates.
+
+    Parameters:
+        start_date (Union[dt.date, pd.Timestamp, np.datetime64]): Accrual start of the first period.
+        payment_dates (Union[List[dt.date], np.ndarray]): Fixed leg payment dates.
+
+    Returns:
+        np.ndarray: Year fractions of each accrual period.
+    """
+    payment_dates = to_datetime64(payment_dates)
+    period_starts = np.concatenate(([to_datetime64(start_date)], payment_dates[:-1]))
+    return yearfrac_vec(period_starts, payment_dates, mod.EU_30_360)
 
 
 def swaption_price_calculator(
@@ -182,10 +285,11 @@ def swaption_price_calculator(
     underlying_expiry: Union[dt.date, pd.Timestamp],
     sigma_black: float,
     freq: int,
-    discount_factors: pd.Series,
+    discount_factors: Union[pd.Series, DiscountCurve],
     swaption_type: SwapType = SwapType.RECEIVER,
     compute_delta: bool = False,
-) -> Union[float, Tuple[float, float]]:
+    compute_node_sensitivities: bool = False,
+) -> Union[float, Tuple[float, float], Tuple[float, float, np.ndarray, float]]:
     """
     Calculate the price (and optionally the delta) of a swaption using the Black model.
 
@@ -197,15 +301,20 @@ def swaption_price_calculator(
         underlying_expiry (Union[dt.date, pd.Timestamp]): Expiry date of the underlying forward starting swap.
         sigma_black (float): Implied volatility for the swaption.
         freq (int): Frequency of fixed leg payments per year.
-        discount_factors (pd.Series): Series of discount factors indexed by date.
+        discount_factors (Union[pd.Series, DiscountCurve]): Series of discount factors indexed by date or discount curve.
         swaption_type (SwapType): Type of swaption (receiver or payer).
         compute_delta (bool): Flag to compute delta (sensitivity), though only receiver delta is implemented.
+        compute_node_sensitivities (bool): Flag to also return, with an adjoint (reverse-mode) sweep, the
+            sensitivities of the price to the node discount factors of the curve and the vega. The
+            forward swap rate is treated as the par rate of the underlying swap on the same curve.
 
     Returns:
-        Tuple containing the swaption price and its delta.
+        Tuple containing the swaption price and its delta (and the node sensitivities and the vega if requested).
     """
-    # Generate the payment dates for the fixed leg of the underlying swap
-    fixed_leg_schedule = date_series(expiry, underlying_expiry, freq)
+    curve = as_discount_curve(discount_factors)
+
+    # Payment dates for the fixed leg of the underlying swap (cached schedule)
+    fixed_leg_schedule = payment_schedule(expiry, underlying_expiry, freq)
 
     # Calculate the time to expiry from the reference date
     time_to_mat = year_frac_act_x(ref_date, expiry, 365)
@@ -214,40 +323,53 @@ def swaption_price_calculator(
     d1 = 1 / (sigma_black * np.sqrt(time_to_mat)) * np.log(S0 / strike) + 0.5 * sigma_black * np.sqrt(time_to_mat)
     d2 = d1 - sigma_black * np.sqrt(time_to_mat)
 
-    # Interpolate discount factors for each payment date in the fixed leg schedule
-    discounts = [
-        get_discount_factor_by_zero_rates_linear_interp(ref_date, i, discount_factors.index, discount_factors.values)
-        for i in fixed_leg_schedule
-    ]
+    # Interpolate the discount factors of the whole fixed leg schedule in one call
+    discounts = curve.df(fixed_leg_schedule)
     
     # Compute forward discount factors (excluding the first discount factor)
-    fwd_discount = [discounts[i+1] / discounts[0] for i in range(len(discounts)-1)]
+    fwd_discount = discounts[1:] / discounts[0]
 
     # Calculate the year fractions for the fixed leg periods using the EU 30/360 convention
-    yf = [
-        yearfrac(fixed_leg_schedule[i-1], fixed_leg_schedule[i], mod.EU_30_360)
-        for i in range(1, len(fixed_leg_schedule))
-    ]
+    yf = yearfrac_vec(fixed_leg_schedule[:-1], fixed_leg_schedule[1:], mod.EU_30_360)
     # Compute the basis point value (BPV) as the weighted sum of the forward discount factors
-    bpv = sum([yf[i] * fwd_discount[i] for i in range(len(yf))])
+    bpv = np.dot(yf, fwd_discount)
     
     # Calculate the swaption price using the Black formula for swaptions
     swaption_price = discounts[0] * bpv * (S0 * norm.cdf(d1) - strike * norm.cdf(d2))
 
+    swaption_delta = discounts[0] * bpv * norm.cdf(d1)  # Payer delta
+
     # For a receiver swaption, adjust the formula accordingly and compute delta
     if swaption_type == SwapType.RECEIVER:
         swaption_price = discounts[0] * bpv * (strike * norm.cdf(-d2) - S0 * norm.cdf(-d1))
         swaption_delta = discounts[0] * bpv * (norm.cdf(d1) - 1)
     
-    # Note: If compute_delta were enabled for payer, additional logic would be required.
-    return swaption_price, swaption_delta
+    if not compute_node_sensitivities:
+        return swaption_price, swaption_delta
+
+    # Adjoint sweep. The price is A * B(S0) with A = sum(yf_i * P_i) (the discount at expiry cancels
+    # out) and S0 = (P_0 - P_N) / A the forward swap rate
+    annuity = discounts[0] * bpv
+    black = swaption_price / annuity
+    S0_bar = swaption_delta
+    annuity_bar = black - S0_bar * S0 / annuity
+    discounts_bar = np.zeros(len(discounts))
+    discounts_bar[0] += S0_bar / annuity
+    discounts_bar[-1] -= S0_bar / annuity
+    discounts_bar[1:] += annuity_bar * yf
+    node_sensitivities = curve.df_adjoint(fixed_leg_schedule, discounts_bar)
+
+    # Black vega, the same for payer and receiver swaptions
+    swaption_vega = annuity * S0 * norm.pdf(d1) * np.sqrt(time_to_mat)
+
+    return swaption_price, swaption_delta, node_sensitivities, swaption_vega
 
 
 def irs_proxy_duration(
     ref_date: dt.date,
     swap_rate: float,
     fixed_leg_payment_dates: List[dt.date],
-    discount_factors: pd.Series,
+    discount_factors: Union[pd.Series, DiscountCurve],
 ) -> float:
     """
     Compute the duration of an interest rate swap, approximated using a fixed coupon bond.
@@ -256,42 +378,26 @@ def irs_proxy_duration(
         ref_date (dt.date): Valuation date.
         swap_rate (float): Swap rate.
         fixed_leg_payment_dates (List[dt.date]): List of fixed leg payment dates.
-        discount_factors (pd.Series): Series of discount factors indexed by date.
+        discount_factors (Union[pd.Series, DiscountCurve]): Series of discount factors indexed by date or discount curve.
 
     Returns:
         float: Duration (sensitivity to interest rate changes) of the swap.
     """
-    # Calculate the present value of the first coupon payment
-    IB_bond = swap_rate * yearfrac(ref_date, fixed_leg_payment_dates[0], mod.EU_30_360) * \
-              get_discount_factor_by_zero_rates_linear_interp(
-                  discount_factors.index[0], fixed_leg_payment_dates[0], discount_factors.index, discount_factors.values
-              )
-    # Sum up the present values for subsequent coupon payments
-    for i in range(1, len(fixed_leg_payment_dates)):
-        yfrac = yearfrac(fixed_leg_payment_dates[i-1], fixed_leg_payment_dates[i], mod.EU_30_360)
-        IB_bond += yfrac * swap_rate * \
-                   get_discount_factor_by_zero_rates_linear_interp(
-                       discount_factors.index[0], fixed_leg_payment_dates[i], discount_factors.index, discount_factors.values
-                   )
-    # Add the final principal repayment
-    IB_bond += get_discount_factor_by_zero_rates_linear_interp(
-        discount_factors.index[0], fixed_leg_payment_dates[-1], discount_factors.index, discount_factors.values
-    )
+    curve = as_discount_curve(discount_factors)
+
+    # Discount factors of all the fixed leg payment dates
+    payment_dates = to_datetime64(fixed_leg_payment_dates)
+    discounts = curve.df(payment_dates)
+    # Accrual of each coupon: the first one starts at the valuation date
+    yfrac = accrual_fractions(ref_date, payment_dates)
+    # Time (EU 30/360) from the valuation date to each payment date
+    times = yearfrac_vec(ref_date, payment_dates, mod.EU_30_360)
+
+    # Calculate the present value of the coupons plus the final principal repayment
+    IB_bond = swap_rate * np.dot(yfrac, discounts) + discounts[-1]
 
     # Calculate the weighted sum of time factors (duration numerator)
-    sum = swap_rate * yearfrac(ref_date, fixed_leg_payment_dates[0], mod.EU_30_360) * \
-          get_discount_factor_by_zero_rates_linear_interp(
-              discount_factors.index[0], fixed_leg_payment_dates[0], discount_factors.index, discount_factors.values
-          ) * yearfrac(ref_date, fixed_leg_payment_dates[0], mod.EU_30_360)
-    for i in range(1, len(fixed_leg_payment_dates)):
-        yfrac = yearfrac(fixed_leg_payment_dates[i-1], fixed_leg_payment_dates[i], mod.EU_30_360)
-        sum += yfrac * swap_rate * \
-               get_discount_factor_by_zero_rates_linear_interp(
-                   discount_factors.index[0], fixed_leg_payment_dates[i], discount_factors.index, discount_factors.values
-               ) * yearfrac(ref_date, fixed_leg_payment_dates[i], mod.EU_30_360)
-    sum += get_discount_factor_by_zero_rates_linear_interp(
-        discount_factors.index[0], fixed_leg_payment_dates[-1], discount_factors.index, discount_factors.values
-    ) * yearfrac(ref_date, fixed_leg_payment_dates[-1], mod.EU_30_360)
+    sum = swap_rate * np.dot(yfrac * discounts, times) + discounts[-1] * times[-1]
 
     # The duration is the weighted sum divided by the bond price (IB_bond)
     duration = sum / IB_bond
@@ -301,97 +407,89 @@ def irs_proxy_duration(
 
 def swap_par_rate(
     fixed_leg_schedule: List[dt.datetime],
-    discount_factors: pd.Series, 
+    discount_factors: Union[pd.Series, DiscountCurve],
     fwd_start_date: dt.datetime | None = None,
-) -> float:
+    compute_node_sensitivities: bool = False,
+) -> Union[float, Tuple[float, np.ndarray]]:
     """
     Calculate the swap par rate, i.e., the fixed rate that makes the net present value of the swap zero.
     If a forward start date is provided, the function returns a forward swap rate.
 
     Parameters:
         fixed_leg_schedule (List[dt.datetime]): List of fixed leg payment dates.
-        discount_factors (pd.Series): Series of discount factors indexed by date.
+        discount_factors (Union[pd.Series, DiscountCurve]): Series of discount factors indexed by date or discount curve.
         fwd_start_date (dt.datetime | None): Optional forward start date.
+        compute_node_sensitivities (bool): Flag to also return the sensitivities of the par rate to the
+            node discount factors of the curve (adjoint sweep).
 
     Returns:
-        float: The swap par rate.
+        float: The swap par rate (and the node sensitivities if requested).
     """
-    today = discount_factors.index[0]
+    curve = as_discount_curve(discount_factors)
+    today = curve.ref_date
     
     # Calculate the discount factor at the forward start date or use 1 if not provided
-    discount_factor_t0 = get_discount_factor_by_zero_rates_linear_interp(
-        today, fwd_start_date, discount_factors.index, discount_factors.values
-    ) if fwd_start_date is not None else 1
-    
-    # Calculate the discount factor for the final payment date
-    discount_factor_tN = get_discount_factor_by_zero_rates_linear_interp(
-        discount_factors.index[0], fixed_leg_schedule[-1], discount_factors.index, discount_factors.values
-    )
+    discount_factor_t0 = curve.df(fwd_start_date) if fwd_start_date is not None else 1
+
+    # Discount factors of all the fixed leg payment dates, the last one gives the final payment
+    payment_dates = to_datetime64(fixed_leg_schedule)
+    discounts = curve.df(payment_dates)
+    discount_factor_tN = discounts[-1]
     
-    # Calculate the basis point value (BPV) of the swap
-    if fwd_start_date is not None:
-        bpv = yearfrac(fwd_start_date, fixed_leg_schedule[0], mod.EU_30_360) * \
-              get_discount_factor_by_zero_rates_linear_interp(
-                  discount_factors.index[0], fixed_leg_schedule[0], discount_factors.index, discount_factors.values
-              )
-        for i in range(1, len(fixed_leg_schedule)):
-            year_frac_val = yearfrac(fixed_leg_schedule[i - 1], fixed_leg_schedule[i], mod.EU_30_360)
-            discount_factor_i = get_discount_factor_by_zero_rates_linear_interp(
-                discount_factors.index[0], fixed_leg_schedule[i], discount_factors.index, discount_factors.values
-            )
-            bpv += year_frac_val * discount_factor_i
-    else:
-        bpv = yearfrac(today, fixed_leg_schedule[0], mod.EU_30_360) * \
-              get_discount_factor_by_zero_rates_linear_interp(
-                  discount_factors.index[0], fixed_leg_schedule[0], discount_factors.index, discount_factors.values
-              )
-        for i in range(1, len(fixed_leg_schedule)):
-            year_frac_val = yearfrac(fixed_leg_schedule[i - 1], fixed_leg_schedule[i], mod.EU_30_360)
-            discount_factor_i = get_discount_factor_by_zero_rates_linear_interp(
-                discount_factors.index[0], fixed_leg_schedule[i], discount_factors.index, discount_factors.values
-            )
-            bpv += year_frac_val * discount_factor_i
+    # Calculate the basis point value (BPV) of the swap, the first accrual starts at the
+    # forward start date if provided, otherwise at the curve reference date
+    start_date = fwd_start_date if fwd_start_date is not None else today
+    yfrac = accrual_fractions(start_date, payment_dates)
+    bpv = np.dot(yfrac, discounts)
 
     # Return the par rate computed from the difference in discount factors divided by BPV
-    return (discount_factor_t0 - discount_factor_tN) / bpv
+    par_rate = (discount_factor_t0 - discount_factor_tN) / bpv
+    if not compute_node_sensitivities:
+        return par_rate
+
+    # Derivatives of (P_0 - P_N) / BPV with respect to the schedule discount factors
+    discounts_bar = -par_rate * yfrac / bpv
+    discounts_bar[-1] -= 1.0 / bpv
+    node_sensitivities = curve.df_adjoint(payment_dates, discounts_bar)
+    if fwd_start_date is not None:
+        node_sensitivities += curve.df_adjoint(fwd_start_date, 1.0 / bpv)
+
+    return par_rate, node_sensitivities
 
 
 def swap_mtm(
     swap_rate: float,
     fixed_leg_schedule: List[dt.datetime],
-    discount_factors: pd.Series,
+    discount_factors: Union[pd.Series, DiscountCurve],
     swap_type: SwapType = SwapType.PAYER,
-) -> float:
+    compute_node_sensitivities: bool = False,
+) -> Union[float, Tuple[float, np.ndarray]]:
     """
     Compute the mark-to-market (MTM) value of a swap based on the fixed leg cash flows and discount factors.
     
     Parameters:
         swap_rate (float): The fixed swap rate.
         fixed_leg_schedule (List[dt.datetime]): List of fixed leg payment dates.
-        discount_factors (pd.Series): Series of discount factors indexed by date.
+        discount_factors (Union[pd.Series, DiscountCurve]): Series of discount factors indexed by date or discount curve.
         swap_type (SwapType): Swap type (payer or receiver).
+        compute_node_sensitivities (bool): Flag to also return the sensitivities of the MTM to the
+            node discount factors of the curve (adjoint sweep).
 
     Returns:
-        float: The swap mark-to-market value.
+        float: The swap mark-to-market value (and the node sensitivities if requested).
     """
-    today = discount_factors.index[0]
-    # Calculate the basis point value (BPV) for the fixed leg starting with the first payment
-    bpv = yearfrac(today, fixed_leg_schedule[0], mod.EU_30_360) * \
-          get_discount_factor_by_zero_rates_linear_interp(
-              discount_factors.index[0], fixed_leg_schedule[0], discount_factors.index, discount_factors.values
-          )
-    # Sum the BPV for each subsequent fixed leg payment
-    for i in range(1, len(fixed_leg_schedule)):
-        year_frac_val = yearfrac(fixed_leg_schedule[i - 1], fixed_leg_schedule[i], mod.EU_30_360)
-        discount_factor_i = get_discount_factor_by_zero_rates_linear_interp(
-            discount_factors.index[0], fixed_leg_schedule[i], discount_factors.index, discount_factors.values
-        )
-        bpv += year_frac_val * discount_factor_i
+    curve = as_discount_curve(discount_factors)
+    today = curve.ref_date
+
+    # Discount factors of all the fixed leg payment dates
+    payment_dates = to_datetime64(fixed_leg_schedule)
+    discounts = curve.df(payment_dates)
+    # Calculate the basis point value (BPV) for the fixed leg, the first accrual starts today
+    yfrac = accrual_fractions(today, payment_dates)
+    bpv = np.dot(yfrac, discounts)
 
     # Compute the present value of the floating leg as the difference from 1 to the discount factor at the last payment date
-    P_term = get_discount_factor_by_zero_rates_linear_interp(
-        discount_factors.index[0], fixed_leg_schedule[-1], discount_factors.index, discount_factors.values
-    )
+    P_term = discounts[-1]
     float_leg = 1.0 - P_term
     # Compute the value of the fixed leg
     fixed_leg = swap_rate * bpv
@@ -405,4 +503,12 @@ def swap_mtm(
         raise ValueError("Unknown swap type.")
 
     # Return the mark-to-market value, applying the multiplier to adjust for the swap type
-    return multiplier * (fixed_leg - float_leg)
+    mtm = multiplier * (fixed_leg - float_leg)
+    if not compute_node_sensitivities:
+        return mtm
+
+    # Derivatives of swap_rate * BPV - (1 - P_N) with respect to the schedule discount factors
+    discounts_bar = multiplier * swap_rate * yfrac
+    discounts_bar[-1] += multiplier
+
+    return mtm, curve.df_adjoint(payment_dates, discounts_bar)
@@ -0,0 +1,180 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Discount curve rebuilt incrementally when a market quote ticks
+"""
+
+import numpy as np
+from typing import Callable, Optional
+from bootstrap import BootstrapPlan, interp_discounts, market_instruments, market_quote_index, market_quotes
+from discount_curve import DiscountCurve
+
+
+# Groups of quotes, in the order of market_quotes
+GROUPS = ("depos", "future", "swap")
+
+
+class IncrementalCurve:
+    """
+    Bootstrapped curve that keeps the state of the bootstrap (BootstrapPlan, node discount factors,
+    spline-interpolated swap rates on the annual grid and running BPV before every grid node) so that
+    a change of a single quote only recomputes the nodes that depend on it:
+
+    - a depo moves its own node, the futures whose settle is interpolated on a moved node and, if a
+      moved node is used by the grid dates inside the short end, the swap nodes;
+    - a future moves its own node and then the same downstream nodes as a depo;
+    - a swap quote moves the spline on the grid, so the swap nodes from the first grid date it
+      affects; depos and futures are untouched.
+
+    Dates, year fractions, interpolation weights and the spline matrix are never recomputed.
+    Listeners registered with subscribe are called after each change with the curve and the
+    positions of the nodes whose discount factor moved.
+    """
+
+    def __init__(self, dates_set, rates_set, dense: bool = False):
+        """
+        Parameters:
+            dates_set (DatesSet): Dates of the market instruments.
+            rates_set (RatesSet): Market quotes (Mid in percent).
+            dense (bool): Build the curves in dense mode (daily grid of discount factors, recomputed
+                after every change).
+        """
+        self.plan = BootstrapPlan(dates_set.settle, market_instruments(dates_set, rates_set))
+        self.quotes = market_quotes(rates_set).copy()
+
+        # Position in market_quotes of the first quote of each group, and instrument of the plan of
+        # each quote used by the bootstrap
+        sizes = [len(getattr(rates_set, group)) for group in GROUPS]
+        self.group_sizes = dict(zip(GROUPS, sizes))
+        self.group_offsets = dict(zip(GROUPS, np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(int)))
+        self.instrument_of_quote = {int(q): i for i, q in enumerate(market_quote_index(dates_set))}
+        self.rates = self.quotes[market_quote_index(dates_set)] / 100.0
+
+        plan = self.plan
+        self.n_depos = len(plan.depo_idx)
+        self.n_futures = len(plan.future_idx)
+        self.first_swap_node = 1 + self.n_depos + self.n_futures
+        # Short-end nodes used by the grid dates inside the depos/futures part
+        lo, hi, _ = plan.grid_interp
+        self.grid_interp_nodes = set((np.concatenate((lo, hi)) + 1).tolist())
+        # First solved grid date moved by each swap quote (its column of the spline matrix is not zero)
+        self.first_affected = [
+            plan.first_solved + int(np.argmax(column[plan.first_solved:] != 0.0))
+            for column in plan.spline_matrix.T
+        ]
+
+        self.discounts = np.empty(len(plan.dates))
+        self.discounts[0] = 1.0
+        self._bpv_before = np.zeros(len(plan.grid_x))
+        self.dense = dense
+        self._listeners = []
+        self._curve = None
+
+        self.discounts[1:1 + self.n_depos] = 1.0 / (1.0 + plan.depo_tau * self.rates[plan.depo_idx])
+        self._solve_futures(set(), solve_all=True)
+        self._solve_swaps(plan.first_solved, short_end_moved=True)
+
+    @property
+    def curve(self) -> DiscountCurve:
+        """
+        Discount curve of the current quotes, built once per change.
+        """
+        if self._curve is None:
+            self._curve = DiscountCurve(self.plan.dates, self.discounts.copy(), dense=self.dense)
+        return self._curve
+
+    def subscribe(self, listener: Callable[[DiscountCurve, np.ndarray], None]):
+        """
+        Register a function called as listener(curve, moved_nodes) after every change of a quote.
+        """
+        self._listeners.append(listener)
+
+    def update_quote(self, group: str, row: int, mid: float) -> np.ndarray:
+        """
+        Change the Mid quote of an instrument and update the curve.
+
+        Parameters:
+            group (str): Group of the instrument ("depos", "future" or "swap").
+            row (int): Position of the instrument in its group (row of the RatesSet DataFrame).
+            mid (float): New Mid quote, in percent.
+
+        Returns:
+            np.ndarray: Positions of the nodes (in curve.dates) whose discount factor moved.
+        """
+        if group not in GROUPS:
+            raise KeyError(f"Unknown group '{group}', expected one of {GROUPS}.")
+        if not 0 <= row < self.group_sizes[group]:
+            raise IndexError(f"No {group} quote at row {row}.")
+        position = self.group_offsets[group] + row
+        self.quotes[position] = mid
+
+        # Quotes not used by the bootstrap do not move the curve
+        instrument = self.instrument_of_quote.get(position)
+        if instrument is None:
+            return np.zeros(0, dtype=int)
+
+        previous = self.discounts.copy()
+        self.rates[instrument] = mid / 100.0
+        plan = self.plan
+
+        if instrument < self.n_depos:
+            node = 1 + instrument
+            self.discounts[node] = 1.0 / (1.0 + plan.depo_tau[instrument] * self.rates[instrument])
+            moved = self._solve_futures({node})
+            self._solve_swaps(plan.first_solved, short_end_moved=bool(moved & self.grid_interp_nodes))
+        elif instrument < self.n_depos + self.n_futures:
+            moved = self._solve_futures(set(), ticked=instrument - self.n_depos)
+            self._solve_swaps(plan.first_solved, short_end_moved=bool(moved & self.grid_interp_nodes))
+        else:
+            self._solve_swaps(self.first_affected[instrument - self.n_depos - self.n_futures], short_end_moved=False)
+
+        moved_nodes = np.flatnonzero(self.discounts != previous)
+        self._curve = None
+        if len(moved_nodes) > 0:
+            for listener in self._listeners:
+                listener(self.curve, moved_nodes)
+        return moved_nodes
+
+    def _solve_futures(self, moved: set, ticked: Optional[int] = None, solve_all: bool = False) -> set:
+        """
+        Solve the ticked future node (all of them if solve_all) and the future nodes whose settle is
+        interpolated on a moved node, in order. Returns the set of moved short-end nodes.
+        """
+        plan = self.plan
+        node_times = plan.times[1:]
+        first = 0 if ticked is None else ticked
+        for j in range(first, self.n_futures):
+            node = 1 + self.n_depos + j
+            lo, hi, w = plan.future_interp[j]
+            if not solve_all and j != ticked and not ({int(lo[0]) + 1, int(hi[0]) + 1} & moved):
+                continue
+            start_disc = interp_discounts(self.discounts[None, 1:], node_times, lo, hi, w, plan.future_start_t[j])
+            value = start_disc[0, 0] / (1.0 + plan.future_tau[j] * self.rates[plan.future_idx[j]])
+            if solve_all or value != self.discounts[node]:
+                moved.add(node)
+            self.discounts[node] = value
+        return moved
+
+    def _solve_swaps(self, start: int, short_end_moved: bool):
+        """
+        Solve the swap nodes from the start-th grid date, as in BootstrapPlan.solve. The BPV of the grid
+        dates inside the short end is recomputed only if one of the nodes they use moved.
+        """
+        plan = self.plan
+        if len(plan.swap_idx) == 0:
+            return
+
+        interpolated_rates = self.rates[plan.swap_idx] @ plan.spline_matrix.T
+        if short_end_moved:
+            lo, hi, w = plan.grid_interp
+            grid_t = plan.grid_t[:plan.first_solved]
+            grid_discounts = interp_discounts(self.discounts[None, 1:], plan.times[1:], lo, hi, w, grid_t)[0]
+            self._bpv_start = grid_discounts @ plan.grid_tau[:plan.first_solved]
+            start = plan.first_solved
+
+        bpv = self._bpv_start if start == plan.first_solved else self._bpv_before[start]
+        for i in range(start, len(plan.grid_x)):
+            self._bpv_before[i] = bpv
+            swap_rate = interpolated_rates[i]
+            discount = (1 - swap_rate * bpv) / (1 + plan.grid_tau[i] * swap_rate)
+            self.discounts[self.first_swap_node + i - plan.first_solved] = discount
+            bpv += plan.grid_tau[i] * discount
@@ -1,6 +1,9 @@
 import numpy as np
+from abc import ABC, abstractmethod
 from datetime import date
+from scipy.interpolate import CubicSpline, PPoly
 from yearfrac import yearfrac, mod
+from bootstrap import interp_weights
 
 def interpolation(start_date: date, end_date: date, start_B: float, end_B: float, 
                   target_date: date, fwd: float, today: date) -> float:
@@ -41,3 +44,272 @@ def interpolation(start_date: date, end_date: date, start_B: float, end_B: float
     # Calcola il fattore di sconto interpolato e applica l'aggiustamento forward
     discount = np.exp(-y * y_frac_target) * fwd
     return discount
+
+
+class InterpolationKernel(ABC):
+    """
+    Interpolation of a discount curve on its nodes (ACT/365 year fractions from the reference date,
+    strictly positive and increasing, and the corresponding discount factors).
+
+    The coefficients of the kernel are computed once in the constructor; discount() then evaluates any
+    array of year fractions with vectorized NumPy operations. All the kernels extrapolate with a flat
+    zero rate after the last node; before the first node the zero rate is flat as well, except for the
+    monotone convex kernel, whose first interval starts at the reference date.
+
+    discount_jacobian and discount_adjoint give the sensitivities of the interpolated discount factors
+    to the node discount factors: in closed form for the kernels linear in the node zero rates or in
+    their logarithms, by bumping the nodes otherwise.
+    """
+
+    def __init__(self, times, discounts):
+        self.times = np.ascontiguousarray(times, dtype=float)
+        self.discounts = np.ascontiguousarray(discounts, dtype=float)
+        if self.times.shape != self.discounts.shape or len(self.times) == 0:
+            raise ValueError("Times and discount factors must be non-empty and of the same length.")
+        if self.times[0] <= 0.0 or np.any(np.diff(self.times) <= 0.0):
+            raise ValueError("Node times must be strictly positive and increasing.")
+        self.zero_rates = -np.log(self.discounts) / self.times
+
+    @abstractmethod
+    def zero_rate(self, t) -> np.ndarray:
+        """
+        Zero rates (continuously compounded) at the year fractions t.
+        """
+
+    def discount(self, t) -> np.ndarray:
+        """
+        Discount factors at the year fractions t.
+        """
+        t = np.asarray(t, dtype=float)
+        return np.exp(-t * self.zero_rate(t))
+
+    def discount_jacobian(self, t) -> np.ndarray:
+        """
+        Derivatives of the discount factors at the year fractions t with respect to the node discount
+        factors, a (n_t, n_nodes) matrix. This version rebuilds the kernel with each node bumped up and
+        down (central differences, relative bump 1e-8: larger bumps can cross the case boundaries of
+        the monotone convex kernel); the other kernels override it in closed form.
+        """
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        jacobian = np.empty((len(t), len(self.times)))
+        for k in range(len(self.times)):
+            bump = 1e-8 * self.discounts[k]
+            up, down = self.discounts.copy(), self.discounts.copy()
+            up[k] += bump
+            down[k] -= bump
+            jacobian[:, k] = (type(self)(self.times, up).discount(t) - type(self)(self.times, down).discount(t)) / (2 * bump)
+        return jacobian
+
+    def discount_adjoint(self, t, discount_bar) -> np.ndarray:
+        """
+        Reverse-mode step of discount: discount_jacobian(t).T @ discount_bar, shape (n_nodes,).
+        """
+        return self.discount_jacobian(t).T @ np.atleast_1d(np.asarray(discount_bar, dtype=float))
+
+
+class _LocalKernel(InterpolationKernel):
+    """
+    Kernel where -log(DF) at each time depends only on the two adjacent nodes: the sensitivities are
+    scattered on them without building the Jacobian.
+    """
+
+    @abstractmethod
+    def _node_weights(self, t):
+        """
+        Adjacent nodes (lo, hi) of each time and the derivatives of -log(DF(t)) with respect to -log(DF)
+        of the two nodes.
+        """
+
+    def _node_derivatives(self, t):
+        """
+        Adjacent nodes of each time and d DF(t) / d DF(node) = DF(t) * weight / DF(node) for both of them.
+        """
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        lo, hi, weight_lo, weight_hi = self._node_weights(t)
+        discounts = self.discount(t)
+        return lo, hi, discounts * weight_lo / self.discounts[lo], discounts * weight_hi / self.discounts[hi]
+
+    def discount_jacobian(self, t) -> np.ndarray:
+        lo, hi, coeff_lo, coeff_hi = self._node_derivatives(t)
+        jacobian = np.zeros((len(lo), len(self.times)))
+        rows = np.arange(len(lo))
+        np.add.at(jacobian, (rows, lo), coeff_lo)
+        np.add.at(jacobian, (rows, hi), coeff_hi)
+        return jacobian
+
+    def discount_adjoint(self, t, discount_bar) -> np.ndarray:
+        lo, hi, coeff_lo, coeff_hi = self._node_derivatives(t)
+        discount_bar = np.atleast_1d(np.asarray(discount_bar, dtype=float))
+        node_bar = np.zeros(len(self.times))
+        np.add.at(node_bar, lo, coeff_lo * discount_bar)
+        np.add.at(node_bar, hi, coeff_hi * discount_bar)
+        return node_bar
+
+
+class LinearZeroKernel(_LocalKernel):
+    """
+    Linear interpolation of the zero rates, as in interpolation and get_discount_factor_by_zero_rates_linear_interp.
+    """
+
+    def zero_rate(self, t) -> np.ndarray:
+        return np.interp(t, self.times, self.zero_rates)
+
+    def _node_weights(self, t):
+        # -log(DF(t)) = t * ((1 - w) * z_lo + w * z_hi), with z = -log(DF) / T on the nodes
+        lo, hi, w = interp_weights(self.times, t)
+        return lo, hi, t * (1.0 - w) / self.times[lo], t * w / self.times[hi]
+
+
+class LogLinearDiscountKernel(_LocalKernel):
+    """
+    Linear interpolation of the logarithm of the discount factors (piecewise flat forward rates).
+    """
+
+    def __init__(self, times, discounts):
+        super().__init__(times, discounts)
+        # -log(DF) on the nodes, from the reference date (where it is 0)
+        self._knots = np.concatenate(([0.0], self.times))
+        self._log_discounts = np.concatenate(([0.0], self.zero_rates * self.times))
+
+    def zero_rate(self, t) -> np.ndarray:
+        t = np.asarray(t, dtype=float)
+        inside = np.interp(t, self._knots, self._log_discounts) / np.where(t > 0.0, t, 1.0)
+        # Before the first node the log-linear interpolation from the reference date is a flat zero rate
+        return np.where(t > self.times[-1], self.zero_rates[-1], np.where(t > 0.0, inside, self.zero_rates[0]))
+
+    def _node_weights(self, t):
+        # Linear in -log(DF) between the nodes, flat zero rate (lo = hi) before the first and after the last
+        lo, hi, w = interp_weights(self.times, t)
+        flat = lo == hi
+        weight_lo = np.where(flat, t * (1.0 - w) / self.times[lo], 1.0 - w)
+        weight_hi = np.where(flat, t * w / self.times[hi], w)
+        return lo, hi, weight_lo, weight_hi
+
+
+class NaturalCubicKernel(InterpolationKernel):
+    """
+    Natural cubic spline of the zero rates (second derivative zero on the first and last node).
+    """
+
+    def __init__(self, times, discounts):
+        super().__init__(times, discounts)
+        if len(self.times) > 1:
+            # Piecewise polynomial coefficients, fitted once; the spline is linear in the zero rates, so the
+            # spline of the canonical basis gives the weight of every node
+            self._spline = CubicSpline(self.times, self.zero_rates, bc_type="natural")
+            self._basis = CubicSpline(self.times, np.eye(len(self.times)), bc_type="natural")
+
+    def zero_rate(self, t) -> np.ndarray:
+        if len(self.times) == 1:
+            return np.full(np.shape(t), self.zero_rates[0])
+        clipped = np.clip(np.asarray(t, dtype=float), self.times[0], self.times[-1])
+        return self._spline(clipped)
+
+    def discount_jacobian(self, t) -> np.ndarray:
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        if len(self.times) == 1:
+            weights = np.ones((len(t), 1))
+        else:
+            weights = self._basis(np.clip(t, self.times[0], self.times[-1]))
+        # d DF(t) / d DF(node) = DF(t) * t * weight / (T_node * DF(node))
+        return self.discount(t)[:, None] * t[:, None] * weights / (self.times * self.discounts)
+
+
+class MonotoneConvexKernel(InterpolationKernel):
+    """
+    Monotone convex interpolation of Hagan and West (2006), without the positivity constraint.
+
+    The instantaneous forward on each interval is the discrete forward plus a quadratic correction g(x),
+    x in [0, 1], with zero integral, chosen according to the forwards at the two ends so that the curve
+    is continuous and does not overshoot. On each interval -log(DF) is then a cubic in the maturity,
+    with a breakpoint where g changes formula: the constructor converts it once to a piecewise
+    polynomial, so that a lookup costs a binary search and a cubic evaluation as for the other kernels.
+    """
+
+    def __init__(self, times, discounts):
+        super().__init__(times, discounts)
+        knots = np.concatenate(([0.0], self.times))
+        log_discounts = np.concatenate(([0.0], self.zero_rates * self.times))
+        widths = np.diff(knots)
+        discrete = np.diff(log_discounts) / widths
+
+        # Instantaneous forwards on the nodes
+        n = len(discrete)
+        forwards = np.empty(n + 1)
+        if n > 1:
+            forwards[1:-1] = (widths[:-1] * discrete[1:] + widths[1:] * discrete[:-1]) / (widths[:-1] + widths[1:])
+            forwards[0] = discrete[0] - 0.5 * (forwards[1] - discrete[0])
+            forwards[-1] = discrete[-1] - 0.5 * (forwards[-2] - discrete[-1])
+        else:
+            forwards[:] = discrete[0]
+
+        g0, g1 = forwards[:-1] - discrete, forwards[1:] - discrete
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Case 1: quadratic; 2 and 3: flat then quadratic and quadratic then flat; 4: two quadratics
+            case = np.full(n, 4)
+            case[((g0 < 0) & (-0.5 * g0 <= g1) & (g1 <= -2 * g0)) | ((g0 > 0) & (-0.5 * g0 >= g1) & (g1 >= -2 * g0))] = 1
+            case[((g0 < 0) & (g1 > -2 * g0)) | ((g0 > 0) & (g1 < -2 * g0))] = 2
+            case[((g0 > 0) & (0 > g1) & (g1 > -0.5 * g0)) | ((g0 < 0) & (0 < g1) & (g1 < -0.5 * g0))] = 3
+            case[(g0 == 0) & (g1 == 0)] = 0
+            eta = np.select(
+                [case == 2, case == 3, case == 4],
+                [(g1 + 2 * g0) / (g1 - g0), 3 * g1 / (g1 - g0), g1 / (g1 + g0)],
+                default=0.5,
+            )
+            level = np.where(case == 4, -g0 * g1 / (g0 + g1), 0.0)
+
+        self._knots, self._log_discounts, self._widths, self._discrete = knots, log_discounts, widths, discrete
+        self._g0, self._g1, self._case, self._eta, self._level = g0, g1, case, eta, level
+        self._initial_forward = forwards[0]
+
+        # Pieces of the intervals: [knot, knot + eta * width] and [knot + eta * width, next knot]; a
+        # breakpoint within rounding of a knot would leave a degenerate piece, its interval is kept whole
+        inner = (eta > 1e-9) & (eta < 1.0 - 1e-9)
+        breaks = np.unique(np.concatenate((knots, knots[:-1][inner] + eta[inner] * widths[inner])))
+        starts, ends = breaks[:-1], breaks[1:]
+        # Exact cubic on each piece from four of its points (the intervals are those of the midpoints)
+        nodes = np.array([0.0, 1.0 / 3.0, 2.0 / 3.0, 1.0])
+        samples = starts[:, None] + (ends - starts)[:, None] * nodes
+        interval = np.clip(np.searchsorted(knots, 0.5 * (starts + ends), side="right") - 1, 0, n - 1)
+        values = self._log_discount(np.repeat(interval, 4).reshape(-1, 4), samples)
+        local = samples - starts[:, None]
+        vandermonde = local[:, :, None] ** np.array([3, 2, 1, 0])
+        coefficients = np.linalg.solve(vandermonde, values[:, :, None])[:, :, 0]
+        self._ppoly = PPoly(coefficients.T, breaks, extrapolate=False)
+
+    def _log_discount(self, i, t) -> np.ndarray:
+        """
+        -log(DF) at the times t inside the intervals i, in closed form.
+        """
+        x = np.clip((t - self._knots[i]) / self._widths[i], 0.0, 1.0)
+        return self._log_discounts[i] + self._discrete[i] * self._widths[i] * x + self._widths[i] * self._g_integral(i, x)
+
+    def _g_integral(self, i, x) -> np.ndarray:
+        """
+        Integral of the correction g of the intervals i from 0 to x.
+        """
+        g0, g1, case, eta, A = self._g0[i], self._g1[i], self._case[i], self._eta[i], self._level[i]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            before = np.minimum(x, eta)
+            after = np.maximum(x - eta, 0.0)
+            # Integral of ((eta - s) / eta)^2 from 0 to min(x, eta), and of ((s - eta) / (1 - eta))^2 from eta to x
+            head = eta / 3.0 * (1.0 - ((eta - before) / eta) ** 3)
+            tail = after ** 3 / (3.0 * (1.0 - eta) ** 2)
+            integral = np.select(
+                [case == 1, case == 2, case == 3, case == 4],
+                [
+                    g0 * (x - 2 * x ** 2 + x ** 3) + g1 * (x ** 3 - x ** 2),
+                    g0 * x + (g1 - g0) * tail,
+                    g1 * x + (g0 - g1) * head,
+                    A * x + (g0 - A) * head + (g1 - A) * tail,
+                ],
+                default=0.0,
+            )
+        return integral
+
+    def zero_rate(self, t) -> np.ndarray:
+        t = np.asarray(t, dtype=float)
+        clipped = np.clip(t, 0.0, self.times[-1])
+        inside = self._ppoly(clipped) / np.where(t > 0.0, t, 1.0)
+        # At the reference date the zero rate is the instantaneous forward
+        return np.where(t > self.times[-1], self.zero_rates[-1], np.where(t > 0.0, inside, self._initial_forward))
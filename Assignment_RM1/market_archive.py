@@ -0,0 +1,226 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - On-disk archive of daily market data with memory-mapped time series
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+import datetime as dt
+from typing import Iterator, Tuple, Union
+from yearfrac import to_datetime64
+from readExcelData import DatesSet, RatesSet
+from bootstrap import bootstrap_instruments, market_instruments
+from discount_curve import DiscountCurve
+
+
+# Groups of instruments, in the order of market_quotes, and columns of the DataFrames
+GROUPS = ("depos", "future", "swap")
+DATE_COLUMNS = {"depos": ["Settle Dates"], "future": ["Settle", "Expiry"], "swap": ["Swap Dates"]}
+QUOTE_COLUMNS = ["Bid", "Ask", "Mid"]
+
+
+class MarketArchive:
+    """
+    Append-only archive of daily curve quotes stored in a folder as raw binary files:
+
+    - days.bin: settlement dates (datetime64[D]), strictly increasing;
+    - quotes.bin: Bid/Ask/Mid of all the instruments, an array (days, instruments, 3) of float64
+      with the instruments in the order of market_quotes (depos, futures, swaps);
+    - dates.bin: dates of the instruments (datetime64[D]), an array (days, date cells);
+    - layout.json: number of instruments and of dates of each group.
+
+    Appending a day only writes at the end of the files. Reading memory-maps them, so the views of a
+    day (RatesSet, DatesSet) and the time series of the quotes are slices of the files: scanning years
+    of curves never loads the whole history in memory.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Open an existing archive.
+
+        Parameters:
+            directory (str): Folder of the archive.
+        """
+        self.directory = directory
+        with open(self._path("layout.json")) as f:
+            layout = json.load(f)
+
+        self.n_quotes = {group: layout["quotes"][group] for group in GROUPS}
+        self.n_dates = {group: layout["dates"][group] for group in GROUPS}
+        # Position of each group in the flat rows of quotes and dates
+        self.quote_slices = _group_slices([self.n_quotes[group] for group in GROUPS])
+        self.date_slices = _group_slices([self.n_dates[group] * len(DATE_COLUMNS[group]) for group in GROUPS])
+        self.n_instruments = sum(self.n_quotes.values())
+        self.n_date_cells = sum(n * len(DATE_COLUMNS[group]) for group, n in self.n_dates.items())
+
+        self._load()
+
+    @classmethod
+    def create(cls, directory: str, dates_set, rates_set) -> "MarketArchive":
+        """
+        Create an empty archive with the layout (number of depos, futures and swaps) of the given day.
+
+        Parameters:
+            directory (str): Folder of the archive, created if needed; it must not contain an archive.
+            dates_set (DatesSet): Dates of a sample day.
+            rates_set (RatesSet): Rates of a sample day.
+
+        Returns:
+            MarketArchive: The empty archive.
+        """
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, "layout.json")):
+            raise FileExistsError(f"Error: an archive already exists in '{directory}'!")
+
+        layout = {
+            "quotes": {group: len(getattr(rates_set, group)) for group in GROUPS},
+            "dates": {group: len(getattr(dates_set, group)) for group in GROUPS},
+        }
+        for name in ("days.bin", "quotes.bin", "dates.bin"):
+            open(os.path.join(directory, name), "wb").close()
+        with open(os.path.join(directory, "layout.json"), "w") as f:
+            json.dump(layout, f, indent=2)
+
+        return cls(directory)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        """
+        Memory-map the files (read-only) with the number of days currently stored.
+        """
+        n_days = os.path.getsize(self._path("days.bin")) // 8
+        self.days = _memmap(self._path("days.bin"), "datetime64[D]", (n_days,))
+        self.quotes = _memmap(self._path("quotes.bin"), np.float64, (n_days, self.n_instruments, 3))
+        self.dates = _memmap(self._path("dates.bin"), "datetime64[D]", (n_days, self.n_date_cells))
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def append(self, dates_set, rates_set):
+        """
+        Append a day at the end of the archive.
+
+        Parameters:
+            dates_set (DatesSet): Dates of the day, with the layout of the archive.
+            rates_set (RatesSet): Rates of the day, with the layout of the archive.
+        """
+        day = to_datetime64(dates_set.settle)
+        if len(self) > 0 and day <= self.days[-1]:
+            raise ValueError("Days must be appended in strictly increasing order.")
+        for group in GROUPS:
+            if len(getattr(rates_set, group)) != self.n_quotes[group] or len(getattr(dates_set, group)) != self.n_dates[group]:
+                raise ValueError(f"The {group} of the day do not match the layout of the archive.")
+
+        quotes = np.concatenate([getattr(rates_set, group)[QUOTE_COLUMNS].to_numpy(dtype=float) for group in GROUPS])
+        dates = np.concatenate(
+            [to_datetime64(getattr(dates_set, group)[DATE_COLUMNS[group]].to_numpy()).ravel() for group in GROUPS]
+        )
+
+        # Drop what an interrupted append may have left after the last complete day
+        os.truncate(self._path("quotes.bin"), len(self) * self.n_instruments * 3 * 8)
+        os.truncate(self._path("dates.bin"), len(self) * self.n_date_cells * 8)
+
+        # Quotes and dates first: a day is visible only once its settlement date is written
+        with open(self._path("quotes.bin"), "ab") as f:
+            f.write(quotes.tobytes())
+        with open(self._path("dates.bin"), "ab") as f:
+            f.write(dates.astype("datetime64[D]").tobytes())
+        with open(self._path("days.bin"), "ab") as f:
+            f.write(np.array([day], dtype="datetime64[D]").tobytes())
+
+        self._load()
+
+    def index(self, day: Union[dt.date, pd.Timestamp, np.datetime64]) -> int:
+        """
+        Position of a day in the archive (binary search on the date index).
+
+        Parameters:
+            day (Union[dt.date, pd.Timestamp, np.datetime64]): Settlement date.
+
+        Returns:
+            int: Position of the day.
+        """
+        day = to_datetime64(day)
+        i = int(np.searchsorted(self.days, day))
+        if i == len(self) or self.days[i] != day:
+            raise KeyError(f"Day {day} is not in the archive.")
+        return i
+
+    def mid(self, start=None, end=None) -> np.ndarray:
+        """
+        Time series of the Mid quotes (in percent) between two days (included), as a zero-copy view
+        (days, instruments) with the columns in the order of market_quotes.
+        """
+        return self.quotes[self._day_range(start, end), :, 2]
+
+    def _day_range(self, start, end) -> slice:
+        """
+        Positions of the days between start and end (included), all the days if None.
+        """
+        first = 0 if start is None else int(np.searchsorted(self.days, to_datetime64(start), side="left"))
+        last = len(self) if end is None else int(np.searchsorted(self.days, to_datetime64(end), side="right"))
+        return slice(first, last)
+
+    def rates_set(self, i: int):
+        """
+        RatesSet of the i-th day, whose DataFrames are views on the memory-mapped quotes.
+        """
+        row = self.quotes[i]
+        return RatesSet(
+            **{
+                group: pd.DataFrame(row[self.quote_slices[k]], columns=QUOTE_COLUMNS, copy=False)
+                for k, group in enumerate(GROUPS)
+            }
+        )
+
+    def dates_set(self, i: int):
+        """
+        DatesSet of the i-th day, whose DataFrames are views on the memory-mapped dates.
+        """
+        row = self.dates[i]
+        frames = {}
+        for k, group in enumerate(GROUPS):
+            columns = DATE_COLUMNS[group]
+            values = row[self.date_slices[k]].reshape(self.n_dates[group], len(columns))
+            frames[group] = pd.DataFrame(values, columns=columns, copy=False)
+        return DatesSet(settle=self.days[i].astype("datetime64[us]").item(), **frames)
+
+    def __getitem__(self, i: int) -> Tuple:
+        """
+        DatesSet and RatesSet of the i-th day, as returned by readExcelData.
+        """
+        return self.dates_set(i), self.rates_set(i)
+
+    def curves(self, start=None, end=None) -> Iterator[Tuple[np.datetime64, DiscountCurve]]:
+        """
+        Bootstrap the curves of the days between start and end (included) one at a time: only the
+        quotes of the current day are read from the files.
+
+        Yields:
+            Tuple[np.datetime64, DiscountCurve]: Settlement date and discount curve of each day.
+        """
+        for i in range(*self._day_range(start, end).indices(len(self))):
+            dates_set, rates_set = self[i]
+            dates, discounts = bootstrap_instruments(dates_set.settle, market_instruments(dates_set, rates_set))
+            yield self.days[i], DiscountCurve(dates, discounts)
+
+
+def _group_slices(sizes) -> list:
+    """
+    Consecutive slices of the given sizes.
+    """
+    bounds = np.concatenate(([0], np.cumsum(sizes)))
+    return [slice(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _memmap(path: str, dtype, shape: tuple) -> np.ndarray:
+    """
+    Read-only memory map of a binary file (np.memmap does not support empty files).
+    """
+    if shape[0] == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
@@ -1,13 +1,13 @@
 # Importing the libraries
 ### !!! IMPORT USEFUL LIBRARIES HERE !!! ###
-import pandas as pd
-import copy
+import numpy as np
 import math
-import warnings
-from bootstrap import bootstrap
-from bucket_rates import shift_rates_set
+from bootstrap import bootstrap, bootstrap_many, market_quotes
+from discount_curve import DiscountCurve
+from bucket_rates import bucket_shock_matrix
 from readExcelData import readExcelData
-from Q7_scenario_rates_adj import Q7_scenario_rates_adj
+from Q7_scenario_rates_adj import Q7_SCENARIO
+from stress_scenarios import compile_scenarios
 from ex1_utilities import (
     business_date_offset,
     swaption_price_calculator,
@@ -40,14 +40,8 @@ irs_notional = 600_000_000        # Notional amount for the IRS
 # Bootstrap to calculate discount factors based on market data.
 dates, discount_factors_appo = bootstrap(datesSet, ratesSet)
 
-# Ensure that the 'Date' column is in datetime format.
-dates["Date"] = pd.to_datetime(dates["Date"])
-
-# Create a Series using the 'Discount Factor' column as data and the 'Date' column as the index.
-discount_factors = pd.Series(
-    data=discount_factors_appo["Discount Factor"].values,
-    index=dates["Date"].values
-)
+# Build the discount curve once: all the pricers below interpolate on it.
+discount_factors = DiscountCurve.from_bootstrap(dates, discount_factors_appo)
 
 # Set the current date as the settlement date from the datesSet.
 today = datesSet.settle
@@ -130,25 +124,13 @@ print(f"Portfolio MtM: €{ptf_mtm:,.2f}")
 print('\n\n##############################################')
 print('###############     Q2      ##################\n')
 
-# Create a deep copy of the ratesSet to apply a parallel shift (increase all rates by 1 basis point).
-ratesSet_up = copy.deepcopy(ratesSet)
+# Apply a 0.01 (1 basis point) upward shift to all 'Mid' rates: a single scenario row of the
+# shock matrix, bootstrapped without copying the ratesSet.
+parallel_shock = np.full(len(market_quotes(ratesSet)), 0.01)
+dates_up, discounts_up = bootstrap_many(datesSet, ratesSet, parallel_shock)
 
-# Apply a 0.01 (1 basis point) upward shift to all 'Mid' rates.
-ratesSet_up.depos["Mid"] += 0.01
-ratesSet_up.future["Mid"] += 0.01
-ratesSet_up.swap["Mid"] += 0.01 
-
-# Re-bootstrap discount factors using the shifted rates.
-dates, discount_factors_appo = bootstrap(datesSet, ratesSet_up)
-
-# Ensure that the 'Date' column is in datetime format.
-dates["Date"] = pd.to_datetime(dates["Date"])
-
-# Create a Series for the new discount factors.
-discount_factors_up = pd.Series(
-    data=discount_factors_appo["Discount Factor"].values,
-    index=dates["Date"].values
-)
+# Build the discount curve for the shifted scenario.
+discount_factors_up = DiscountCurve(dates_up, discounts_up[0])
 
 # Recalculate the forward swap rate with the shifted discount factors.
 fwd_swap_rate_up = swap_par_rate(
@@ -204,6 +186,29 @@ ptf_proxy_dv01 = (
     swaption_notional * swaption_delta + irs_notional * irs_duration
 ) * 1e-4
 print(f"Portfolio proxy DV01: €{ptf_proxy_dv01:,.2f}")
+print(' ')
+
+# Key-rate DV01 ladder from the analytic curve Jacobian: the node sensitivities of each trade
+# times d(discount factors)/d(Mid quotes), one matrix product instead of re-bootstrapping.
+_, _, curve_jacobian = bootstrap(datesSet, ratesSet, compute_jacobian=True)
+_, _, swaption_node_sens, _ = swaption_price_calculator(
+    fwd_swap_rate,
+    strike,
+    today,
+    swaption_expiry,
+    underlying_expiry,
+    sigma_black,
+    swaption_fixed_leg_freq,
+    discount_factors,
+    swaption_type,
+    compute_node_sensitivities=True,
+)
+_, irs_node_sens = swap_mtm(
+    irs_rate, irs_fixed_leg_payment_dates, discount_factors, compute_node_sensitivities=True
+)
+ptf_node_sens = swaption_notional * swaption_node_sens + irs_notional * irs_node_sens
+key_rate_dv01 = ptf_node_sens @ curve_jacobian * 0.01
+print(f"Portfolio DV01-parallel from the curve Jacobian: €{key_rate_dv01.sum():,.2f}")
 
 # --------------------- Q4: DELTA HEDGING OF THE SWAPTION (CHANGING IRS NOTIONAL) -------------------------
 print('\n\n##############################################')
@@ -240,22 +245,17 @@ print(f'Net IRS Notional: €{irs_notional + delta_hedge_swap_notional_proxy:,.0
 # --------------------- Q5: COARSE-GRAINED BUCKET DV01 -------------------------
 print('\n\n##############################################')
 print('###############     Q5      ##################\n')
-warnings.simplefilter("ignore")  # Suppress warnings for cleaner output
 
-# Shift the ratesSet using bucket years of 10 and 15 years.
-ratesSet_bucket = shift_rates_set(ratesSet, datesSet, [10, 15])
-DV01_ptf = 0  # Initialize total portfolio DV01 accumulator
+# Key-rate shifts of the Mid quotes for the buckets of 10 and 15 years, one row per bucket.
+bucket_shocks = bucket_shock_matrix(datesSet, [10, 15])
 
-# Iterate over each shifted rates set (bucket)
-for i, rate_set in enumerate(ratesSet_bucket, start=1):
+# Bootstrap all the bucket scenarios together in one batched solve.
+bucket_dates, bucket_discounts = bootstrap_many(datesSet, ratesSet, bucket_shocks)
+discount_factors_buckets = [DiscountCurve(bucket_dates, discounts) for discounts in bucket_discounts]
+DV01_ptf = 0  # Initialize total portfolio DV01 accumulator
 
-    # Re-bootstrap discount factors using the current bucket's rates.
-    dates, discount_factors_appo = bootstrap(datesSet, rate_set)
-    dates["Date"] = pd.to_datetime(dates["Date"])
-    discount_factors_bucket = pd.Series(
-        data=discount_factors_appo["Discount Factor"].values,
-        index=dates["Date"].values
-    )
+# Iterate over each shifted curve (bucket)
+for i, discount_factors_bucket in enumerate(discount_factors_buckets, start=1):
 
     # Recalculate the forward swap rate for the bucket.
     fwd_swap_bucket = swap_par_rate(
@@ -298,7 +298,6 @@ for i, rate_set in enumerate(ratesSet_bucket, start=1):
 
 print('---')
 print(f'Portfolio Total DV01-parallel: €{DV01_ptf:,.2f}')
-warnings.simplefilter("default")  # Reset warnings filter
 
 # --------------------- Q6: DELTA HEDGING WITH TWO IRS -------------------------
 print('\n\n##############################################')
@@ -339,14 +338,7 @@ DV01_ptf_hedged_computed = (
 
 # Compute the hedged DV01 using the bucket approach.
 DV01_ptf_hedged = 0
-for i, rate_set in enumerate(ratesSet_bucket, start=1):
-
-    dates, discount_factors_appo = bootstrap(datesSet, rate_set)
-    dates["Date"] = pd.to_datetime(dates["Date"])
-    discount_factors_bucket = pd.Series(
-        data=discount_factors_appo["Discount Factor"].values,
-        index=dates["Date"].values
-    )
+for i, discount_factors_bucket in enumerate(discount_factors_buckets, start=1):
 
     # Compute swaption price under bucket conditions.
     swaption_price_bucket, swaption_delta_bucket = swaption_price_calculator(
@@ -384,18 +376,12 @@ print(f'Portfolio Total DV01-parallel bucket: €{DV01_ptf_hedged:,.2f}')
 print('\n\n##############################################')
 print('###############     Q7      ##################\n')
 
-# Apply a curve steepener scenario adjustment on the rates.
-warnings.simplefilter("ignore")
-shifted_rates = Q7_scenario_rates_adj(ratesSet, datesSet)
-warnings.simplefilter("default")
+# Compile the curve steepener scenario into a shock of the Mid quotes (ratesSet is not modified).
+q7_shock = compile_scenarios(datesSet, [Q7_SCENARIO])
 
 # Re-bootstrap discount factors using the shifted rates.
-dates, discount_factors_appo = bootstrap(datesSet, shifted_rates)
-dates["Date"] = pd.to_datetime(dates["Date"])
-discount_factors_q7 = pd.Series(
-    data=discount_factors_appo["Discount Factor"].values,
-    index=dates["Date"].values
-)
+dates_q7, discounts_q7 = bootstrap_many(datesSet, ratesSet, q7_shock)
+discount_factors_q7 = DiscountCurve(dates_q7, discounts_q7[0])
 
 # Base portfolio MtM remains the same.
 ptf_mtm = swaption_notional * swaption_price
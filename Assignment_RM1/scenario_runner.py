@@ -0,0 +1,174 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Full revaluation of a swaption/IRS portfolio over many rate scenarios
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+from bootstrap import BootstrapPlan, market_instruments, market_quote_index, market_quotes
+from discount_curve import DiscountCurve
+from ex1_utilities import SwapType
+from swap_portfolio import SwapPortfolio
+from swaption_book import SwaptionBook
+
+
+@dataclass
+class HedgePortfolio:
+    """
+    Portfolio of swaptions (priced with the Black model on a SwaptionBook) and swaps (a SwapPortfolio).
+
+    The trades are ordered as the swaptions of the book followed by the swaps: values and P&L are
+    returned in this order. Strikes, volatilities and notionals are per swaption (or a single value
+    for all of them); strikes and volatilities are required with the swaptions, so that every scenario
+    reprices the same trades. The notionals of the swaps are those of the SwapPortfolio.
+    """
+    swaptions: Optional[SwaptionBook] = None
+    swaption_strikes: Union[float, np.ndarray, None] = None
+    swaption_vols: Union[float, np.ndarray, None] = None
+    swaption_notionals: Union[float, np.ndarray] = 1.0
+    swaption_types: Union[SwapType, List[SwapType]] = SwapType.RECEIVER
+    swaps: Optional[SwapPortfolio] = None
+
+    def __post_init__(self):
+        if self.swaptions is not None and (self.swaption_strikes is None or self.swaption_vols is None):
+            raise ValueError("swaption_strikes and swaption_vols must be given for the swaptions of the portfolio.")
+        if self.swaps is not None and np.any(np.isnan(self.swaps.swap_rates)):
+            raise ValueError("swap_rates must be given for all the swaps of the portfolio.")
+
+    def __len__(self) -> int:
+        return (0 if self.swaptions is None else len(self.swaptions)) + (0 if self.swaps is None else len(self.swaps))
+
+    def values(self, curve: DiscountCurve) -> np.ndarray:
+        """
+        Value of every trade (scaled by its notional) on a discount curve.
+        """
+        values = []
+        if self.swaptions is not None:
+            prices = self.swaptions.price(curve, self.swaption_vols, self.swaption_strikes, self.swaption_types)[0]
+            values.append(np.asarray(self.swaption_notionals, dtype=float) * prices)
+        if self.swaps is not None:
+            values.append(self.swaps.mtm(curve))
+        return np.concatenate(values) if values else np.zeros(0)
+
+
+@dataclass
+class ScenarioResult:
+    """
+    Values of the trades of a portfolio in the base scenario (n_trades,) and in each shocked
+    scenario (n_scenarios, n_trades).
+    """
+    base_values: np.ndarray
+    values: np.ndarray
+
+    @property
+    def pnl(self) -> np.ndarray:
+        """
+        P&L of every trade in every scenario, a (n_scenarios, n_trades) matrix.
+        """
+        return self.values - self.base_values
+
+    @property
+    def portfolio_pnl(self) -> np.ndarray:
+        """
+        P&L of the whole portfolio in every scenario.
+        """
+        return self.pnl.sum(axis=1)
+
+
+class _ScenarioContext:
+    """
+    Data shared by all the scenarios: the portfolio and the bootstrap plan of the market dates, built
+    once (once per worker process when the scenarios run in a pool).
+    """
+
+    def __init__(self, portfolio: HedgePortfolio, dates_set, base_rates):
+        self.portfolio = portfolio
+        self.plan = BootstrapPlan(dates_set.settle, market_instruments(dates_set, base_rates))
+        self.quote_index = market_quote_index(dates_set)
+        self.base_quotes = market_quotes(base_rates)
+
+    def revalue(self, shocks: np.ndarray) -> np.ndarray:
+        """
+        Bootstrap the curves of a block of scenarios together, then value all the trades on each curve.
+        """
+        rates = (self.base_quotes + shocks)[:, self.quote_index] / 100.0
+        discounts = self.plan.solve(rates)
+        return np.array([self.portfolio.values(DiscountCurve(self.plan.dates, row)) for row in discounts])
+
+
+# Context of the worker processes, set once by _init_worker
+_worker_context = None
+
+
+def _init_worker(portfolio: HedgePortfolio, dates_set, base_rates):
+    global _worker_context
+    _worker_context = _ScenarioContext(portfolio, dates_set, base_rates)
+
+
+def _revalue_block(shocks: np.ndarray) -> np.ndarray:
+    return _worker_context.revalue(shocks)
+
+
+def scenario_shocks(base_rates, scenarios: Sequence) -> np.ndarray:
+    """
+    Shock matrix (n_scenarios, n_quotes) of a list of RatesSet, as differences of their Mid quotes from
+    the base ones (columns in the order of market_quotes).
+    """
+    base = market_quotes(base_rates)
+    return np.array([market_quotes(rates_set) - base for rates_set in scenarios]).reshape(-1, len(base))
+
+
+def run_scenarios(
+    portfolio: HedgePortfolio,
+    dates_set,
+    base_rates,
+    scenarios: Union[np.ndarray, Sequence],
+    max_workers: Optional[int] = None,
+) -> ScenarioResult:
+    """
+    Full revaluation of a portfolio over many rate scenarios.
+
+    The scenarios are split in blocks sent to a pool of processes: each worker builds the bootstrap plan
+    and receives the portfolio once, then for each block solves all the curves together and reprices
+    every trade on each of them (forward swap rates included). With max_workers=1 everything runs in
+    this process. On Windows the pool re-imports the calling script, which must then be protected by
+    if __name__ == "__main__".
+
+    Parameters:
+        portfolio (HedgePortfolio): Trades to revalue.
+        dates_set (DatesSet): Dates of the market instruments.
+        base_rates (RatesSet): Base market quotes.
+        scenarios (Union[np.ndarray, Sequence]): Shock matrix (n_scenarios, n_quotes) to add to the Mid
+            quotes, in the units and column order of market_quotes (0.01 = 1 bp), or a list of RatesSet.
+        max_workers (int): Number of processes (default: number of CPUs).
+
+    Returns:
+        ScenarioResult: Base and scenario values of every trade, with the P&L matrix.
+    """
+    if isinstance(scenarios, np.ndarray):
+        shocks = np.atleast_2d(np.asarray(scenarios, dtype=float))
+    else:
+        shocks = scenario_shocks(base_rates, scenarios)
+    n_quotes = len(market_quotes(base_rates))
+    if shocks.shape[1] != n_quotes:
+        raise ValueError(f"Shocks must have {n_quotes} columns (depos, futures and swaps quotes).")
+
+    context = _ScenarioContext(portfolio, dates_set, base_rates)
+    base_values = context.revalue(np.zeros((1, n_quotes)))[0]
+
+    max_workers = min(max_workers or os.cpu_count() or 1, max(len(shocks), 1))
+    if max_workers == 1 or len(shocks) == 0:
+        values = context.revalue(shocks) if len(shocks) > 0 else np.zeros((0, len(portfolio)))
+        return ScenarioResult(base_values, values)
+
+    # A few blocks per worker: large enough for the batched bootstrap, small enough to balance the load
+    blocks = np.array_split(shocks, min(len(shocks), 4 * max_workers))
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(portfolio, dates_set, base_rates)
+    ) as executor:
+        values = np.concatenate(list(executor.map(_revalue_block, blocks)))
+
+    return ScenarioResult(base_values, values)
@@ -0,0 +1,174 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Declarative stress scenarios compiled into shocks of the market quotes
+"""
+
+import numpy as np
+import pandas as pd
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from dateutil.relativedelta import relativedelta
+from typing import Optional, Sequence, Tuple
+from yearfrac import yearfrac_vec, to_datetime64, mod
+from bootstrap import InstrumentType, market_instrument_dates
+from bucket_rates import bucket_shock_matrix
+
+
+@dataclass
+class MarketGrid:
+    """
+    Type, maturity (depo settle date, future expiry, swap date) and ACT/365 year fraction from the
+    settle date of every market quote, in the order of market_quotes. Built once per DatesSet and
+    shared by all the scenarios compiled on it.
+    """
+    dates_set: object
+    kinds: np.ndarray
+    maturities: np.ndarray
+    times: np.ndarray
+
+    @classmethod
+    def from_dates_set(cls, dates_set) -> "MarketGrid":
+        kinds, _, maturities = market_instrument_dates(dates_set)
+        maturities = to_datetime64(maturities)
+        settle = to_datetime64(pd.to_datetime(dates_set.settle).date())
+        return cls(
+            dates_set=dates_set,
+            kinds=np.array([kind.value for kind in kinds]),
+            maturities=maturities,
+            times=yearfrac_vec(settle, maturities, mod.ACT_365),
+        )
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+
+class Shock(ABC):
+    """
+    Building block of a scenario: a shift of the Mid quotes (0.01 = 1 bp) as a function of the
+    maturity, restricted to some instrument types (all of them if kinds is None).
+    """
+    kinds: Optional[Tuple[InstrumentType, ...]] = None
+
+    @abstractmethod
+    def profile(self, grid: MarketGrid) -> np.ndarray:
+        """
+        Shift of every quote of the grid, before the restriction to kinds.
+        """
+
+    def compile(self, grid: MarketGrid) -> np.ndarray:
+        """
+        Shift of every quote of the grid.
+        """
+        shifts = np.broadcast_to(self.profile(grid), (len(grid),)).astype(float)
+        if self.kinds is not None:
+            shifts = shifts * np.isin(grid.kinds, [kind.value for kind in self.kinds])
+        return shifts
+
+
+@dataclass(frozen=True)
+class Parallel(Shock):
+    """
+    Same shift for all the maturities.
+    """
+    shift: float
+    kinds: Optional[Tuple[InstrumentType, ...]] = None
+
+    def profile(self, grid: MarketGrid) -> np.ndarray:
+        return np.full(len(grid), self.shift)
+
+
+@dataclass(frozen=True)
+class Twist(Shock):
+    """
+    short_shift up to short_years, long_shift from long_years, linear in the maturity in between
+    (a steepener if long_shift > short_shift, a flattener otherwise).
+    """
+    short_shift: float
+    long_shift: float
+    short_years: float = 2.0
+    long_years: float = 30.0
+    kinds: Optional[Tuple[InstrumentType, ...]] = None
+
+    def profile(self, grid: MarketGrid) -> np.ndarray:
+        return np.interp(grid.times, [self.short_years, self.long_years], [self.short_shift, self.long_shift])
+
+
+@dataclass(frozen=True)
+class Butterfly(Shock):
+    """
+    wing_shift up to short_years and from long_years, belly_shift at belly_years, linear in the
+    maturity in between.
+    """
+    wing_shift: float
+    belly_shift: float
+    short_years: float = 2.0
+    belly_years: float = 10.0
+    long_years: float = 30.0
+    kinds: Optional[Tuple[InstrumentType, ...]] = None
+
+    def profile(self, grid: MarketGrid) -> np.ndarray:
+        return np.interp(
+            grid.times,
+            [self.short_years, self.belly_years, self.long_years],
+            [self.wing_shift, self.belly_shift, self.wing_shift],
+        )
+
+
+@dataclass(frozen=True)
+class KeyRate(Shock):
+    """
+    Shifts on key-rate pillars (years from the settle date), spread on the maturities with the
+    triangular weights of bucket_shock_matrix.
+    """
+    pillars: Tuple[float, ...]
+    shifts: Tuple[float, ...]
+    kinds: Optional[Tuple[InstrumentType, ...]] = None
+
+    def profile(self, grid: MarketGrid) -> np.ndarray:
+        if len(self.pillars) != len(self.shifts):
+            raise ValueError("Key-rate pillars and shifts must have the same length.")
+        return np.asarray(self.shifts, dtype=float) @ bucket_shock_matrix(grid.dates_set, list(self.pillars), 1.0)
+
+
+@dataclass(frozen=True)
+class PointShock(Shock):
+    """
+    Shift of the quotes whose maturity is exactly settle + years (as in the scenario of Q7).
+    """
+    years: int
+    shift: float
+    kinds: Optional[Tuple[InstrumentType, ...]] = None
+
+    def profile(self, grid: MarketGrid) -> np.ndarray:
+        settle = pd.to_datetime(grid.dates_set.settle)
+        target = to_datetime64((settle + relativedelta(years=self.years)).date())
+        return np.where(grid.maturities == target, self.shift, 0.0)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Named stress scenario: the sum of its shocks.
+    """
+    name: str
+    shocks: Tuple[Shock, ...]
+
+    def compile(self, grid: MarketGrid) -> np.ndarray:
+        return sum((shock.compile(grid) for shock in self.shocks), np.zeros(len(grid)))
+
+
+def compile_scenarios(dates_set, scenarios: Sequence[Scenario]) -> np.ndarray:
+    """
+    Compile the scenarios into a matrix (n_scenarios, n_quotes) of shifts of the Mid quotes, with the
+    columns in the order of market_quotes: the input of bootstrap_many and run_scenarios. Neither the
+    DatesSet nor any RatesSet is copied or modified.
+
+    Parameters:
+        dates_set (DatesSet): Dates of the market instruments.
+        scenarios (Sequence[Scenario]): Scenarios to compile.
+
+    Returns:
+        np.ndarray: The shock matrix, one row per scenario.
+    """
+    grid = MarketGrid.from_dates_set(dates_set)
+    return np.array([scenario.compile(grid) for scenario in scenarios]).reshape(-1, len(grid))
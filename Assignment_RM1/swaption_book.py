@@ -0,0 +1,194 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Black pricer for books of swaptions over expiry/tenor/strike grids
+"""
+
+import numpy as np
+import pandas as pd
+import datetime as dt
+from scipy.stats import norm
+from typing import Iterable, List, Tuple, Union
+from yearfrac import yearfrac_vec, mod
+from discount_curve import DiscountCurve, as_discount_curve
+from ex1_utilities import SwapType, business_date_offset, payment_schedule
+
+
+class SwaptionBook:
+    """
+    Swaptions on a set of (expiry, underlying expiry) pairs priced with the Black model in a single
+    vectorized pass.
+
+    The fixed leg schedule of the underlying swap is generated once per distinct pair and stored in
+    ragged-array form (concatenated payment dates and accruals, offset of each pair). For each curve
+    the annuities and forward swap rates of all the pairs are obtained with one interpolation and a
+    segmented sum, and cached until a different curve is passed: repricing the book for new strikes or
+    volatilities (e.g. a whole vol cube) only evaluates the Black formula on arrays.
+    """
+
+    def __init__(
+        self,
+        ref_date: Union[dt.date, pd.Timestamp],
+        expiries: Iterable[Union[dt.date, pd.Timestamp]],
+        underlying_expiries: Iterable[Union[dt.date, pd.Timestamp]],
+        freq: int,
+    ):
+        """
+        Parameters:
+            ref_date (Union[dt.date, pd.Timestamp]): Valuation date.
+            expiries (Iterable[Union[dt.date, pd.Timestamp]]): Expiry date of each swaption.
+            underlying_expiries (Iterable[Union[dt.date, pd.Timestamp]]): Expiry date of the underlying
+                forward starting swap of each swaption.
+            freq (int): Frequency of fixed leg payments per year.
+        """
+        expiries = list(expiries)
+        underlying_expiries = list(underlying_expiries)
+        if len(expiries) != len(underlying_expiries) or len(expiries) == 0:
+            raise ValueError("Expiries and underlying expiries must be non-empty and of the same length.")
+
+        self.ref_date = ref_date
+        self.freq = freq
+
+        # One schedule per distinct (expiry, underlying expiry) pair, shared by all the swaptions on it
+        pairs = {}
+        self.pair_index = np.array(
+            [pairs.setdefault((expiry, end), len(pairs)) for expiry, end in zip(expiries, underlying_expiries)],
+            dtype=int,
+        )
+        schedules = [payment_schedule(expiry, end, freq) for expiry, end in pairs]
+
+        self.expiries = np.array([schedule[0] for schedule in schedules])
+        self.payment_dates = np.concatenate([schedule[1:] for schedule in schedules])
+        self.accruals = np.concatenate(
+            [yearfrac_vec(schedule[:-1], schedule[1:], mod.EU_30_360) for schedule in schedules]
+        )
+        lengths = np.array([len(schedule) - 1 for schedule in schedules], dtype=int)
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        self.last_payments = self.offsets + lengths - 1
+
+        # Time to expiry (ACT/365) of every swaption
+        self.time_to_mat = yearfrac_vec(ref_date, self.expiries, mod.ACT_365)[self.pair_index]
+
+        self._cached_curve = None
+        self._cached_legs = None
+
+    @classmethod
+    def from_grid(
+        cls,
+        ref_date: Union[dt.date, pd.Timestamp],
+        expiry_months: Iterable[int],
+        tenor_years: Iterable[int],
+        freq: int,
+    ) -> "SwaptionBook":
+        """
+        Build the book on the full expiry x tenor grid, expiry-major: the swaption on expiry i and tenor
+        j is the entry i * len(tenor_years) + j, so results can be reshaped to (n_expiries, n_tenors, ...).
+        Dates are generated as in the swaption of Exercise 1 (business_date_offset from ref_date).
+
+        Parameters:
+            ref_date (Union[dt.date, pd.Timestamp]): Valuation date.
+            expiry_months (Iterable[int]): Swaption expiries in months.
+            tenor_years (Iterable[int]): Tenors of the underlying swaps in years.
+            freq (int): Frequency of fixed leg payments per year.
+
+        Returns:
+            SwaptionBook: The swaption book.
+        """
+        expiry_months = list(expiry_months)
+        tenor_years = list(tenor_years)
+        expiries = [business_date_offset(ref_date, month_offset=m) for m in expiry_months for _ in tenor_years]
+        underlying_expiries = [
+            business_date_offset(ref_date, year_offset=y, month_offset=m) for m in expiry_months for y in tenor_years
+        ]
+        return cls(ref_date, expiries, underlying_expiries, freq)
+
+    def __len__(self) -> int:
+        return len(self.pair_index)
+
+    def forward_rates(
+        self, discount_factors: Union[pd.Series, DiscountCurve]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Annuities (sum of the accruals times the discount factors of the fixed leg) and forward swap rates
+        of every swaption. They are computed once per curve and reused until another curve is passed.
+
+        Parameters:
+            discount_factors (Union[pd.Series, DiscountCurve]): Series of discount factors indexed by date or discount curve.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Annuities and forward swap rates.
+        """
+        curve = as_discount_curve(discount_factors)
+        if curve is not self._cached_curve:
+            # A single interpolation on the payment dates followed by the expiries
+            discounts = curve.df(np.concatenate((self.payment_dates, self.expiries)))
+            payment_discounts = discounts[: len(self.payment_dates)]
+            expiry_discounts = discounts[len(self.payment_dates):]
+
+            annuities = np.add.reduceat(self.accruals * payment_discounts, self.offsets)
+            fwd_rates = (expiry_discounts - payment_discounts[self.last_payments]) / annuities
+
+            self._cached_curve = curve
+            self._cached_legs = (annuities[self.pair_index], fwd_rates[self.pair_index])
+
+        return self._cached_legs
+
+    def price(
+        self,
+        discount_factors: Union[pd.Series, DiscountCurve],
+        sigma_black: Union[float, np.ndarray],
+        strikes: Union[float, np.ndarray, None] = None,
+        swaption_type: Union[SwapType, List[SwapType]] = SwapType.RECEIVER,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Black prices and greeks of every swaption.
+
+        The strikes and the volatilities are broadcast against the swaptions along the first axis, so a
+        (n_swaptions, n_strikes) array prices a whole smile for every expiry/tenor pair at once.
+
+        Parameters:
+            discount_factors (Union[pd.Series, DiscountCurve]): Series of discount factors indexed by date or discount curve.
+            sigma_black (Union[float, np.ndarray]): Black volatilities.
+            strikes (Union[float, np.ndarray, None]): Strikes, at the money (forward swap rates) if None.
+            swaption_type (Union[SwapType, List[SwapType]]): Type of each swaption (receiver or payer).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Prices, deltas (with respect to the
+                forward swap rate), vegas and gammas (with respect to the forward swap rate), in this order,
+                per unit notional.
+        """
+        annuities, fwd_rates = self.forward_rates(discount_factors)
+
+        sigma_black = np.asarray(sigma_black, dtype=float)
+        strikes = fwd_rates if strikes is None else np.asarray(strikes, dtype=float)
+
+        # Swaption data along the first axis, strikes and volatilities along the trailing ones
+        ndim = max(sigma_black.ndim, strikes.ndim, 1)
+
+        def expand(x):
+            return x.reshape(x.shape + (1,) * (ndim - x.ndim))
+
+        annuities, S0, time_to_mat = expand(annuities), expand(fwd_rates), expand(self.time_to_mat)
+        strikes, sigma_black = expand(strikes), expand(sigma_black)
+
+        if isinstance(swaption_type, SwapType):
+            swaption_type = [swaption_type] * len(self)
+        if not all(isinstance(t, SwapType) for t in swaption_type):
+            raise ValueError("Unknown swaption type.")
+        is_payer = expand(np.array([t is SwapType.PAYER for t in swaption_type]))
+
+        # Black formula, as in swaption_price_calculator
+        sqrt_t = np.sqrt(time_to_mat)
+        d1 = np.log(S0 / strikes) / (sigma_black * sqrt_t) + 0.5 * sigma_black * sqrt_t
+        d2 = d1 - sigma_black * sqrt_t
+
+        payer_price = annuities * (S0 * norm.cdf(d1) - strikes * norm.cdf(d2))
+        receiver_price = annuities * (strikes * norm.cdf(-d2) - S0 * norm.cdf(-d1))
+        prices = np.where(is_payer, payer_price, receiver_price)
+        deltas = annuities * np.where(is_payer, norm.cdf(d1), norm.cdf(d1) - 1)
+
+        # Gamma and vega are the same for payer and receiver swaptions
+        pdf_d1 = norm.pdf(d1)
+        gammas = annuities * pdf_d1 / (S0 * sigma_black * sqrt_t)
+        vegas = annuities * S0 * pdf_d1 * sqrt_t
+
+        return prices, deltas, vegas, gammas
@@ -0,0 +1,30 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Tests of the analytic curve Jacobian of the bootstrap
+"""
+
+import numpy as np
+from bootstrap import bootstrap, bootstrap_many, market_quotes
+
+
+def test_bootstrap_many_matches_bootstrap(market, bootstrapped):
+    dates_set, rates_set = market
+    _, discounts = bootstrapped
+    _, curves = bootstrap_many(dates_set, rates_set, np.zeros(len(market_quotes(rates_set))))
+    np.testing.assert_array_equal(curves[0], discounts["Discount Factor"].values)
+
+
+def test_jacobian_matches_finite_differences(market):
+    dates_set, rates_set = market
+    _, discounts, jacobian = bootstrap(dates_set, rates_set, compute_jacobian=True)
+    n_quotes = len(market_quotes(rates_set))
+    assert jacobian.shape == (len(discounts), n_quotes)
+
+    # Central differences on every Mid quote (bump in percent), all the curves bootstrapped together
+    bump = 1e-4
+    shocks = bump * np.eye(n_quotes)
+    _, up = bootstrap_many(dates_set, rates_set, shocks)
+    _, down = bootstrap_many(dates_set, rates_set, -shocks)
+    finite_differences = (up - down).T / (2 * bump)
+
+    np.testing.assert_allclose(jacobian, finite_differences, rtol=0, atol=1e-10)
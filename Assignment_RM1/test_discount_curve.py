@@ -0,0 +1,42 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Tests of the dense daily grid of the discount curve
+"""
+
+import numpy as np
+import pytest
+from discount_curve import DiscountCurve
+from incremental_curve import IncrementalCurve
+from interpolation import LinearZeroKernel, LogLinearDiscountKernel, MonotoneConvexKernel, NaturalCubicKernel
+
+
+@pytest.mark.parametrize("kernel", [LinearZeroKernel, LogLinearDiscountKernel, NaturalCubicKernel, MonotoneConvexKernel])
+def test_dense_grid_equals_kernel(bootstrapped, kernel):
+    curve = DiscountCurve.from_bootstrap(*bootstrapped, kernel)
+    dense = DiscountCurve.from_bootstrap(*bootstrapped, kernel, dense=True)
+
+    n_days = int((curve.dates[-1] - curve.ref_date).astype(np.int64)) + 1
+    assert len(dense.daily_discounts) == n_days
+    assert not dense.daily_discounts.flags.writeable
+
+    # Every day of the grid, a single date, and dates outside the grid (kernel fallback)
+    every_day = curve.ref_date + np.arange(n_days)
+    np.testing.assert_array_equal(dense.df(every_day), curve.df(every_day))
+    assert dense.df(every_day[1234]) == curve.df(every_day[1234])
+    outside = np.array([curve.ref_date - 3, curve.dates[-1] + 10])
+    np.testing.assert_array_equal(dense.df(outside), curve.df(outside))
+
+
+def test_dense_grid_rebuilt_with_the_curve(market):
+    incremental = IncrementalCurve(*market, dense=True)
+    before = incremental.curve
+    grid = before.daily_discounts
+
+    incremental.update_quote("swap", 5, incremental.quotes[incremental.group_offsets["swap"] + 5] + 0.01)
+    after = incremental.curve
+
+    assert after is not before and after.dense
+    assert after.daily_discounts is not grid
+    every_day = after.ref_date + np.arange(len(grid))
+    np.testing.assert_array_equal(after.daily_discounts, DiscountCurve(after.dates, after.discount_factors).df(every_day))
+    assert np.any(after.daily_discounts != grid)
@@ -0,0 +1,26 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Tests of the incremental curve rebuild against the full bootstrap
+"""
+
+import numpy as np
+from bootstrap import bootstrap_many, market_quotes
+from incremental_curve import GROUPS, IncrementalCurve
+
+
+def test_incremental_curve_matches_full_bootstrap(market, bootstrapped):
+    dates_set, rates_set = market
+    incremental = IncrementalCurve(dates_set, rates_set)
+    np.testing.assert_allclose(incremental.curve.discount_factors, bootstrapped[1]["Discount Factor"].values, rtol=0, atol=1e-15)
+
+    base_quotes = market_quotes(rates_set)
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        group = GROUPS[rng.integers(len(GROUPS))]
+        row = int(rng.integers(incremental.group_sizes[group]))
+        position = incremental.group_offsets[group] + row
+        incremental.update_quote(group, row, incremental.quotes[position] + rng.normal(0.0, 0.05))
+
+        # The same quotes bootstrapped from scratch
+        _, full = bootstrap_many(dates_set, rates_set, incremental.quotes - base_quotes)
+        np.testing.assert_allclose(incremental.curve.discount_factors, full[0], rtol=0, atol=1e-14)
@@ -0,0 +1,38 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Tests of the interpolation kernels of the discount curve
+"""
+
+import numpy as np
+import pytest
+from discount_curve import DiscountCurve
+from interpolation import LinearZeroKernel, LogLinearDiscountKernel, MonotoneConvexKernel, NaturalCubicKernel
+
+KERNELS = [LinearZeroKernel, LogLinearDiscountKernel, NaturalCubicKernel, MonotoneConvexKernel]
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_kernel_reproduces_nodes(bootstrapped, kernel):
+    curve = DiscountCurve.from_bootstrap(*bootstrapped, kernel)
+    np.testing.assert_allclose(curve.df(curve.dates), curve.discount_factors, rtol=0, atol=1e-15)
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_node_sensitivities_match_finite_differences(bootstrapped, kernel):
+    curve = DiscountCurve.from_bootstrap(*bootstrapped, kernel)
+    # Dates before the reference date, between the nodes and after the last one
+    dates = curve.ref_date + np.arange(-5, 19000, 97)
+
+    bump = 1e-9
+    expected = np.zeros((len(dates), len(curve.dates)))
+    for node in range(1, len(curve.dates)):
+        up, down = curve.discount_factors.copy(), curve.discount_factors.copy()
+        up[node] += bump
+        down[node] -= bump
+        expected[:, node] = (DiscountCurve(curve.dates, up, kernel).df(dates) - DiscountCurve(curve.dates, down, kernel).df(dates)) / (2 * bump)
+
+    jacobian = curve.df_jacobian(dates)
+    np.testing.assert_allclose(jacobian, expected, rtol=0, atol=1e-6)
+
+    df_bar = np.linspace(1.0, 2.0, len(dates))
+    np.testing.assert_allclose(curve.df_adjoint(dates, df_bar), jacobian.T @ df_bar, rtol=0, atol=1e-12)
@@ -0,0 +1,59 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Tests of the adjoint node sensitivities of the swap and swaption pricers
+"""
+
+import numpy as np
+import pytest
+from discount_curve import DiscountCurve
+from ex1_utilities import SwapType, business_date_offset, date_series, swap_mtm, swap_par_rate, swaption_price_calculator
+
+
+@pytest.fixture(scope="module")
+def curve(bootstrapped):
+    return DiscountCurve.from_bootstrap(*bootstrapped)
+
+
+def bumped_gradient(curve, price, bump=1e-7):
+    """
+    Central differences of price(curve) on every node discount factor but the reference one.
+    """
+    gradient = np.zeros(len(curve.dates))
+    for node in range(1, len(curve.dates)):
+        up, down = curve.discount_factors.copy(), curve.discount_factors.copy()
+        up[node] += bump
+        down[node] -= bump
+        gradient[node] = (price(DiscountCurve(curve.dates, up)) - price(DiscountCurve(curve.dates, down))) / (2 * bump)
+    return gradient
+
+
+def test_swap_sensitivities(curve):
+    today = curve.ref_date.item()
+    schedule = date_series(today, business_date_offset(today, year_offset=10), 1)[1:]
+
+    _, par_rate_sensitivities = swap_par_rate(schedule, curve, compute_node_sensitivities=True)
+    expected = bumped_gradient(curve, lambda c: swap_par_rate(schedule, c))
+    np.testing.assert_allclose(par_rate_sensitivities, expected, rtol=0, atol=1e-8)
+
+    _, mtm_sensitivities = swap_mtm(0.03, schedule, curve, SwapType.PAYER, compute_node_sensitivities=True)
+    expected = bumped_gradient(curve, lambda c: swap_mtm(0.03, schedule, c, SwapType.PAYER))
+    np.testing.assert_allclose(mtm_sensitivities, expected, rtol=0, atol=1e-8)
+
+
+def test_swaption_sensitivities(curve):
+    today = curve.ref_date.item()
+    expiry = business_date_offset(today, year_offset=2)
+    underlying_expiry = business_date_offset(today, year_offset=7)
+    schedule = date_series(expiry, underlying_expiry, 1)
+
+    def price(c, compute_node_sensitivities=False):
+        # The forward swap rate moves with the curve, as in the adjoint sweep
+        forward = swap_par_rate(schedule[1:], c, schedule[0])
+        return swaption_price_calculator(
+            forward, 0.03, today, expiry, underlying_expiry, 0.2, 1, c, SwapType.RECEIVER,
+            compute_node_sensitivities=compute_node_sensitivities,
+        )
+
+    _, _, node_sensitivities, _ = price(curve, compute_node_sensitivities=True)
+    expected = bumped_gradient(curve, lambda c: price(c)[0])
+    np.testing.assert_allclose(node_sensitivities, expected, rtol=0, atol=1e-8)
@@ -0,0 +1,79 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Tests of the full revaluation of a swaption/IRS portfolio over rate scenarios
+"""
+
+import numpy as np
+import pytest
+from bootstrap import market_quotes
+from bucket_rates import apply_shock
+from discount_curve import DiscountCurve
+from ex1_utilities import SwapType, business_date_offset, date_series, swap_par_rate
+from scenario_runner import HedgePortfolio, run_scenarios
+from swap_portfolio import SwapPortfolio
+from swaption_book import SwaptionBook
+
+
+@pytest.fixture(scope="module")
+def portfolio(bootstrapped):
+    """
+    A 2y x 10y receiver swaption struck at the base forward and a 10y payer swap at the base par rate.
+    """
+    curve = DiscountCurve.from_bootstrap(*bootstrapped)
+    today = curve.ref_date.item()
+    swaptions = SwaptionBook.from_grid(today, [24], [10], 1)
+    _, forwards = swaptions.forward_rates(curve)
+
+    schedule = date_series(today, business_date_offset(today, year_offset=10), 1)[1:]
+    swaps = SwapPortfolio([schedule], today, swap_par_rate(schedule, curve), swap_types=SwapType.PAYER)
+
+    return HedgePortfolio(
+        swaptions=swaptions,
+        swaption_strikes=forwards,
+        swaption_vols=0.2,
+        swaption_types=SwapType.RECEIVER,
+        swaps=swaps,
+    )
+
+
+@pytest.fixture(scope="module")
+def shocks(market):
+    # Parallel shifts of +1 bp and +100 bp of all the Mid quotes
+    n_quotes = len(market_quotes(market[1]))
+    return np.array([[0.01], [1.0]]) * np.ones(n_quotes)
+
+
+def test_up_shocks_move_receiver_and_payer_in_opposite_directions(market, portfolio, shocks):
+    result = run_scenarios(portfolio, *market, shocks, max_workers=1)
+    assert result.pnl.shape == (2, 2)
+    np.testing.assert_allclose(result.base_values[1], 0.0, atol=1e-12)
+
+    swaption_pnl, swap_pnl = result.pnl.T
+    assert np.all(swaption_pnl < 0.0)
+    assert np.all(swap_pnl > 0.0)
+    # A larger shock moves both trades further
+    assert swaption_pnl[1] < swaption_pnl[0] and swap_pnl[1] > swap_pnl[0]
+
+
+def test_process_pool_matches_single_process(market, portfolio, shocks):
+    many_shocks = np.linspace(-1.0, 1.0, 8)[:, None] * shocks[1]
+    single = run_scenarios(portfolio, *market, many_shocks, max_workers=1)
+    pooled = run_scenarios(portfolio, *market, many_shocks, max_workers=2)
+    np.testing.assert_array_equal(pooled.base_values, single.base_values)
+    np.testing.assert_array_equal(pooled.values, single.values)
+
+
+def test_rates_sets_match_shock_matrix(market, portfolio, shocks):
+    dates_set, rates_set = market
+    from_matrix = run_scenarios(portfolio, dates_set, rates_set, shocks, max_workers=1)
+    from_rates = run_scenarios(
+        portfolio, dates_set, rates_set, [apply_shock(rates_set, shock) for shock in shocks], max_workers=1
+    )
+    np.testing.assert_allclose(from_rates.values, from_matrix.values, rtol=0, atol=1e-12)
+
+
+def test_incomplete_trades_are_rejected(portfolio):
+    with pytest.raises(ValueError):
+        HedgePortfolio(swaptions=portfolio.swaptions, swaption_vols=0.2)
+    with pytest.raises(ValueError):
+        HedgePortfolio(swaps=SwapPortfolio([portfolio.swaps.payment_dates], portfolio.swaps.start_dates[0]))
@@ -1,5 +1,7 @@
 from datetime import date
 from enum import Enum
+import numpy as np
+import pandas as pd
 
 # Define an enumeration for different day count conventions
 class mod(Enum):
@@ -7,6 +9,23 @@ class mod(Enum):
     ACT_365 = 3    # Actual/365 day count convention
     EU_30_360 = 6  # European 30/360 day count convention
 
+def to_datetime64(dates) -> np.ndarray:
+    """
+    Converts dates (datetime.date, datetime.datetime, pd.Timestamp, lists/arrays of them,
+    pd.DatetimeIndex or datetime64 arrays) into a datetime64[D] array with the same shape.
+
+    :param dates: A single date or a collection of dates.
+
+    :return: A NumPy array of dtype datetime64[D] (0-dimensional for a single date).
+    """
+    arr = np.asarray(dates)
+    # Already a datetime64 array: only truncate to daily resolution
+    if arr.dtype.kind == "M":
+        return arr.astype("datetime64[D]")
+    # Generic objects (date, datetime, Timestamp): let pandas parse them
+    parsed = pd.to_datetime(arr.ravel()).values.astype("datetime64[D]")
+    return parsed.reshape(arr.shape)
+
 def yearfrac(start_date: date, end_date: date, convention: mod) -> float:
     """
     Computes the fraction of a year between two dates using different day count conventions.
@@ -50,3 +69,51 @@ def yearfrac(start_date: date, end_date: date, convention: mod) -> float:
     # If the provided convention is not supported, raise an error
     else:
         raise ValueError("Unsupported convention")
+
+def yearfrac_vec(start_dates, end_dates, convention: mod) -> np.ndarray:
+    """
+    Vectorized version of yearfrac: computes the year fractions between arrays of dates.
+    Start and end dates are converted to datetime64[D] and broadcast against each other, so a
+    single date can be paired with an array of dates (e.g. settlement date vs. payment dates).
+
+    :param start_dates: The starting date(s), any format accepted by to_datetime64.
+    :param end_dates: The ending date(s), any format accepted by to_datetime64.
+    :param convention: The day count convention to use (must be a value from the Conv Enum).
+
+    :return: A NumPy array with the year fractions (same results as yearfrac element by element).
+
+    :raises ValueError: If an unsupported convention is provided.
+    """
+    start = to_datetime64(start_dates)
+    end = to_datetime64(end_dates)
+
+    # Actual/360 and Actual/365: day differences divided by the year basis
+    if convention == mod.ACT_360:
+        return (end - start).astype(float) / 360.0
+
+    elif convention == mod.ACT_365:
+        return (end - start).astype(float) / 365.0
+
+    # European 30/360: day, month and year components extracted directly from datetime64
+    elif convention == mod.EU_30_360:
+        y1, m1, d1 = _split_dates(start)
+        y2, m2, d2 = _split_dates(end)
+
+        # Days of the first date are capped at 30, days of the second date as well
+        # (which also covers the d1 == 30 and d2 == 31 case of the scalar version)
+        d1 = np.minimum(d1, 30)
+        d2 = np.minimum(d2, 30)
+
+        return ((y2 - y1) * 360 + (m2 - m1) * 30 + (d2 - d1)) / 360.0
+
+    # If the provided convention is not supported, raise an error
+    else:
+        raise ValueError("Unsupported convention")
+
+def _split_dates(dates: np.ndarray):
+    """Splits a datetime64[D] array into integer year, month and day arrays."""
+    months = dates.astype("datetime64[M]")
+    years = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (dates - months).astype(np.int64) + 1
+    return years, month, day
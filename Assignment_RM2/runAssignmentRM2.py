@@ -7,15 +7,12 @@ import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'utilities'))
 
-from utilities.bootstrap import bootstrap
-from utilities.readExcelData import readExcelData
-from scipy.optimize import fsolve
-from utilities.ex1_utilities import business_date_offset, year_frac_act_x
-from utilities.ex2_utilities import (
-    defaultable_bond_dirty_price_from_intensity,
-    defaultable_bond_dirty_price_from_z_spread,
-    defaultable_bond_dirty_price_from_intensity_and_previous_lambda
-)
+from bootstrap import bootstrap
+from discount_curve import DiscountCurve
+from readExcelData import readExcelData
+from ex1_utilities import business_date_offset, year_frac_act_x
+from ex2_utilities import BondBook, DefaultableBond
+from hazard_curve import HazardCurve
 
 # Se il sistema operativo è Windows usa 'cls', altrimenti usa 'clear'
 os.system('cls' if os.name == 'nt' else 'clear')
@@ -26,14 +23,8 @@ os.system('cls' if os.name == 'nt' else 'clear')
 # Bootstrap to calculate discount factors based on market data.
 dates, discount_factors_appo = bootstrap(datesSet, ratesSet)
 
-# Ensure that the 'Date' column is in datetime format.
-dates["Date"] = pd.to_datetime(dates["Date"])
-
-# Create a Series using the 'Discount Factor' column as data and the 'Date' column as the index.
-discount_factors = pd.Series(
-    data=discount_factors_appo["Discount Factor"].values,
-    index=dates["Date"].values
-)
+# Build the discount curve once: all the pricers below interpolate on it.
+discount_factors = DiscountCurve.from_bootstrap(dates, discount_factors_appo)
 
 # Set the current date as the settlement date from the datesSet.
 today = datesSet.settle
@@ -62,35 +53,18 @@ print('###############     Q1      ##################\n')
 
 recovery_rate = 0.3
 
-h_1y = fsolve(
-    lambda intensity: defaultable_bond_dirty_price_from_intensity(
-        today,
-        expiry1,
-        coupon_rate1,
-        coupon_freq1,
-        recovery_rate,
-        intensity[0],
-        discount_factors,
-        100,
-    )
-    - dirty_price1,
-    x0=0.02,
-)[0]
-
-h_2y = fsolve(
-    lambda intensity: defaultable_bond_dirty_price_from_intensity(
-        today,
-        expiry2,
-        coupon_rate2,
-        coupon_freq2,
-        recovery_rate,
-        intensity[0],
-        discount_factors,
-        100,
-    )
-    - dirty_price2,
-    x0=0.02,
-)[0]
+# Cash flows and discount factors of the two bonds are computed once and reused by all the calibrations
+bond1 = DefaultableBond(today, expiry1, coupon_rate1, coupon_freq1, recovery_rate, discount_factors, 100)
+bond2 = DefaultableBond(today, expiry2, coupon_rate2, coupon_freq2, recovery_rate, discount_factors, 100)
+
+# Average intensities and Z-spreads of both bonds are calibrated together
+bond_book = BondBook(
+    today, [expiry1, expiry2], [coupon_rate1, coupon_rate2], [coupon_freq1, coupon_freq2],
+    recovery_rate, discount_factors, 100,
+)
+dirty_prices = [dirty_price1, dirty_price2]
+
+h_1y, h_2y = bond_book.calibrate_intensity(dirty_prices).values
 
 print(f"Average intensity over {maturity1}y: {h_1y:.5%}")
 print(f"Average intensity over {maturity2}y: {h_2y:.5%}")
@@ -119,33 +93,7 @@ print(f"{maturity2}y default probability: {default_prob_2y:.5%}")
 print('\n\n##############################################')
 print('###############     Q3      ##################\n')
 
-z_spread_1y = fsolve(
-    lambda z_spread: defaultable_bond_dirty_price_from_z_spread(
-        today,
-        expiry1,
-        coupon_rate1,
-        coupon_freq1,
-        z_spread[0],
-        discount_factors,
-        100,
-    )
-    - dirty_price1,
-    x0=0.02,
-)[0]
-
-z_spread_2y = fsolve(
-    lambda z_spread: defaultable_bond_dirty_price_from_z_spread(
-        today,
-        expiry2,
-        coupon_rate2,
-        coupon_freq2,
-        z_spread[0],
-        discount_factors,
-        100,
-    )
-    - dirty_price2,
-    x0=0.02,
-)[0]
+z_spread_1y, z_spread_2y = bond_book.calibrate_z_spread(dirty_prices).values
 
 print(f"Z-spread over {maturity1}y: {z_spread_1y:.5%}")
 print(f"Z-spread over {maturity2}y: {z_spread_2y:.5%}")
@@ -156,30 +104,12 @@ print(f"Z-spread over {maturity2}y: {z_spread_2y:.5%}")
 print('\n\n##############################################')
 print('###############     Q4      ##################\n')
 
-h_1y2y = fsolve(
-    lambda intensity: defaultable_bond_dirty_price_from_intensity_and_previous_lambda(
-        today,
-        expiry2,
-        coupon_rate2,
-        coupon_freq2,
-        recovery_rate,
-        intensity[0],
-        discount_factors,
-        h_1y,
-        expiry1,
-        100,
-    )
-    - dirty_price2,
-    x0=0.02,
-)[0]
-
-
-deltas_1y = year_frac_act_x(today, expiry1, 365)
-deltas_2y = year_frac_act_x(expiry1, expiry2, 365)
+# Sequential bootstrap of the piecewise constant intensity from the two bonds
+hazard_curve = HazardCurve.bootstrap([bond1, bond2], [dirty_price1, dirty_price2])
+h_1y2y = hazard_curve.intensities[1]
 
 # Survival probabilities
-surv_prob_1y = math.exp(- h_1y * deltas_1y)
-surv_prob_2y = math.exp(- h_1y2y * deltas_2y - h_1y * deltas_1y)
+surv_prob_1y, surv_prob_2y = hazard_curve.survival([expiry1, expiry2])
 
 # Defaul probabilities
 default_prob_1y = 1 - surv_prob_1y
@@ -225,27 +155,10 @@ print('###############     Q6      ##################\n')
 dirty_price1_shock = dirty_price1
 dirty_price2_shock = 97.0
 
-h_1y_shock = h_1y
-h_1y2y_shock = fsolve(
-    lambda intensity: defaultable_bond_dirty_price_from_intensity_and_previous_lambda(
-        today,
-        expiry2,
-        coupon_rate2,
-        coupon_freq2,
-        recovery_rate,
-        intensity[0],
-        discount_factors,
-        h_1y_shock,
-        expiry1,
-        100,
-    )
-    - dirty_price2_shock,
-    x0=0.02,
-)[0]
+hazard_curve_shock = HazardCurve.bootstrap([bond1, bond2], [dirty_price1_shock, dirty_price2_shock])
 
 # Survival probabilities
-surv_prob_1y_shock = math.exp(- h_1y_shock * deltas_1y)
-surv_prob_2y_shock = math.exp(- h_1y2y_shock * deltas_2y - h_1y_shock * deltas_1y)
+surv_prob_1y_shock, surv_prob_2y_shock = hazard_curve_shock.survival([expiry1, expiry2])
 
 # Defaul probabilities
 default_prob_1y_shock = 1 - surv_prob_1y_shock
@@ -263,41 +176,10 @@ print('###############     Q7      ##################\n')
 dirty_price1_shock2 = 101.0
 dirty_price2_shock2 = 103.0
 
-h_1y_shock2 = fsolve(
-    lambda intensity: defaultable_bond_dirty_price_from_intensity(
-        today,
-        expiry1,
-        coupon_rate1,
-        coupon_freq1,
-        recovery_rate,
-        intensity[0],
-        discount_factors,
-        100,
-    )
-    - dirty_price1_shock2,
-    x0=0.02,
-)[0]
-
-h_1y2y_shock2 = fsolve(
-    lambda intensity: defaultable_bond_dirty_price_from_intensity_and_previous_lambda(
-        today,
-        expiry2,
-        coupon_rate2,
-        coupon_freq2,
-        recovery_rate,
-        intensity[0],
-        discount_factors,
-        h_1y_shock2,
-        expiry1,
-        100,
-    )
-    - dirty_price2_shock2,
-    x0=0.02,
-)[0]
+hazard_curve_shock2 = HazardCurve.bootstrap([bond1, bond2], [dirty_price1_shock2, dirty_price2_shock2])
 
 # Survival probabilities
-surv_prob_1y_shock2 = math.exp(- h_1y_shock2 * deltas_1y)
-surv_prob_2y_shock2 = math.exp(- h_1y2y_shock2 * deltas_2y - h_1y_shock2 * deltas_1y)
+surv_prob_1y_shock2, surv_prob_2y_shock2 = hazard_curve_shock2.survival([expiry1, expiry2])
 
 # Defaul probabilities
 default_prob_1y_shock2 = 1 - surv_prob_1y_shock2
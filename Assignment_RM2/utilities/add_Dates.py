@@ -1,25 +1,24 @@
 import pandas as pd
-from datetime import date, timedelta
+from datetime import date
 from enum import Enum
+from business_calendar import BusinessCalendar, WEEKENDS, FOLLOWING, PRECEDING
 
 class mod(Enum):
     Normal = "normal"
     Modified = "modified"
 
-def is_business_day(date_obj: date) -> bool:
-    """Check if a date is a business day (Monday to Friday)."""
-    return date_obj.weekday() < 5
+# Business-day convention of each mod: Normal moves to the previous business day, Modified to the next one
+ROLL = {mod.Normal: PRECEDING, mod.Modified: FOLLOWING}
 
-def adjust_to_business_day(date_obj: date, mod: mod) -> date:
-    """Adjust the date to the nearest business day based on the mod type."""
-    while not is_business_day(date_obj):
-        if mod == mod.Normal:
-            date_obj -= timedelta(days=1)  # Move to the previous business day
-        elif mod == mod.Modified:
-            date_obj += timedelta(days=1)  # Move to the next business day
-    return date_obj
+def is_business_day(date_obj: date, calendar: BusinessCalendar = WEEKENDS) -> bool:
+    """Check if a date is a business day of the calendar (Monday to Friday by default)."""
+    return bool(calendar.is_business_day(date_obj))
 
-def add_Dates(start_date: date, years: int, mod: mod) -> pd.DataFrame:
+def adjust_to_business_day(date_obj: date, mod: mod, calendar: BusinessCalendar = WEEKENDS) -> date:
+    """Adjust the date to the nearest business day of the calendar based on the mod type."""
+    return calendar.adjust(date_obj, ROLL[mod]).item()
+
+def add_Dates(start_date: date, years: int, mod: mod, calendar: BusinessCalendar = WEEKENDS) -> pd.DataFrame:
     """
     Generates a pandas DataFrame with annual dates from the start_date up to n years,
     adjusting them to business days based on the given modification rule.
@@ -27,10 +26,11 @@ def add_Dates(start_date: date, years: int, mod: mod) -> pd.DataFrame:
     :param start_date: The initial date (included in the output).
     :param years: The number of years to generate annual dates.
     :param mod: The modification rule (normal or modified) for adjusting to business days.
+    :param calendar: The business-day calendar (weekends only by default).
     :return: A pandas DataFrame containing the generated dates.
     """
     dates = [start_date.replace(year=start_date.year + i) for i in range(years + 1)]
-    adjusted_dates = [adjust_to_business_day(d, mod) for d in dates]
+    adjusted_dates = calendar.adjust(dates, ROLL[mod]).astype(object)
     df = pd.DataFrame(adjusted_dates, columns=["Business Adjusted Dates"])
     return df
 
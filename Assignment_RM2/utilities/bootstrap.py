@@ -1,11 +1,13 @@
 import numpy as np
 import pandas as pd
+from dataclasses import dataclass
 from datetime import date, datetime
+from enum import Enum
+from typing import List, Tuple
 from scipy.interpolate import CubicSpline
 
 # Importa le funzioni già definite nei rispettivi file
-from yearfrac import yearfrac, mod            # mod contiene ACT_360, ACT_365, EU_30_360
-from interpolation import interpolation
+from yearfrac import yearfrac_vec, to_datetime64, mod  # mod contiene ACT_360, ACT_365, EU_30_360
 from add_Dates import add_Dates, mod as mod_adjust  # mod_adjust per l'aggiustamento delle date business
 
 def to_date(x):
@@ -19,7 +21,383 @@ def to_date(x):
         return x.date()
     return x
 
-def bootstrap(datesSet, ratesSet):
+
+class InstrumentType(Enum):
+    """
+    Tipi di strumenti usati nel bootstrap.
+    """
+    DEPO = "depo"      # Depositi: DF = 1 / (1 + δ L), δ ACT/360 dal settlement alla scadenza
+    FUTURE = "future"  # Futures: DF(expiry) = DF(settle) / (1 + δ f), δ ACT/360 tra settle ed expiry
+    SWAP = "swap"      # Swap a gamba fissa annuale (EU 30/360), quotati al par
+
+
+@dataclass
+class Instrument:
+    """
+    Strumento di mercato per il bootstrap.
+
+    start è la data di inizio del periodo di maturazione (settle del future; per depos e swaps
+    coincide con il settlement della curva), end la scadenza. rate è il tasso in decimali.
+    """
+    kind: InstrumentType
+    start: date
+    end: date
+    rate: float
+
+
+def interp_weights(node_times: np.ndarray, target_times) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Precalcola gli indici e i pesi dell'interpolazione lineare sui tassi zero: per ogni tempo
+    target restituisce i nodi adiacenti (lo, hi) e il peso w del nodo hi. Fuori dai nodi si
+    usa l'estrapolazione piatta (lo = hi), come in interpolation.interpolation.
+
+    Parametri:
+    - node_times: frazioni d'anno (ACT/365) dei nodi, ordinate e strettamente positive.
+    - target_times: frazioni d'anno dei punti da interpolare.
+    """
+    target_times = np.atleast_1d(np.asarray(target_times, dtype=float))
+    if len(target_times) == 0 or len(node_times) < 2:
+        # Nessun target, oppure un solo nodo: estrapolazione piatta su quel nodo
+        idx = np.zeros(len(target_times), dtype=int)
+        return idx, idx.copy(), np.zeros(len(target_times))
+    hi = np.clip(np.searchsorted(node_times, target_times), 1, len(node_times) - 1)
+    lo = hi - 1
+    w = (target_times - node_times[lo]) / (node_times[hi] - node_times[lo])
+    # Estrapolazione piatta prima del primo e dopo l'ultimo nodo
+    below, above = w <= 0.0, w >= 1.0
+    hi[below], w[below] = lo[below], 0.0
+    lo[above], w[above] = hi[above], 1.0
+    return lo, hi, w
+
+
+def interp_discounts(
+    discounts: np.ndarray, node_times: np.ndarray, lo: np.ndarray, hi: np.ndarray, w: np.ndarray, target_times
+) -> np.ndarray:
+    """
+    Discount factors ai tempi target (lineare sui tassi zero) dati gli indici e i pesi di
+    interp_weights. discounts ha shape (K, n_nodi): le K curve sono interpolate insieme.
+    """
+    zero_lo = -np.log(discounts[:, lo]) / node_times[lo]
+    zero_hi = -np.log(discounts[:, hi]) / node_times[hi]
+    return np.exp(-((1.0 - w) * zero_lo + w * zero_hi) * target_times)
+
+
+def interp_jacobian(
+    interp_disc: np.ndarray, discounts: np.ndarray, node_jac: np.ndarray, node_times: np.ndarray,
+    lo: np.ndarray, hi: np.ndarray, w: np.ndarray, target_times
+) -> np.ndarray:
+    """
+    Derivate dei discount factors interpolati (interp_discounts) rispetto ai tassi degli strumenti,
+    dalla regola della catena sulle derivate dei nodi adiacenti node_jac (K, n_nodi, n_strumenti).
+    """
+    # d DF(t) / d DF(nodo) = DF(t) * t * peso / (t_nodo * DF(nodo))
+    coeff_lo = interp_disc * target_times * (1.0 - w) / (node_times[lo] * discounts[:, lo])
+    coeff_hi = interp_disc * target_times * w / (node_times[hi] * discounts[:, hi])
+    return coeff_lo[:, :, None] * node_jac[:, lo] + coeff_hi[:, :, None] * node_jac[:, hi]
+
+
+class BootstrapPlan:
+    """
+    Parte del bootstrap che dipende solo dalle date degli strumenti.
+
+    Tutte le frazioni d'anno (ACT/360 per depos e futures, EU 30/360 sulla griglia annuale degli
+    swaps, ACT/365 per l'interpolazione) sono calcolate una sola volta con yearfrac_vec e salvate
+    in array ordinati. solve() risolve poi i nodi in un'unica passata per un vettore di tassi.
+
+    Gli strumenti devono essere ordinati: prima i depos, poi i futures, poi gli swaps, ciascun
+    gruppo per scadenza crescente, e le scadenze dei nodi devono essere crescenti.
+    """
+
+    def __init__(self, settle, instruments: List[Instrument]):
+        self.settle = to_datetime64(to_date(settle))
+        self.instruments = list(instruments)
+
+        kinds = [instr.kind for instr in self.instruments]
+        order = [InstrumentType.DEPO, InstrumentType.FUTURE, InstrumentType.SWAP]
+        if [order.index(k) for k in kinds] != sorted(order.index(k) for k in kinds):
+            raise ValueError("Instruments must be ordered as depos, futures and swaps.")
+
+        # Posizioni dei tre gruppi di strumenti nel vettore dei tassi
+        self.depo_idx = np.array([i for i, k in enumerate(kinds) if k == InstrumentType.DEPO], dtype=int)
+        self.future_idx = np.array([i for i, k in enumerate(kinds) if k == InstrumentType.FUTURE], dtype=int)
+        self.swap_idx = np.array([i for i, k in enumerate(kinds) if k == InstrumentType.SWAP], dtype=int)
+
+        starts = to_datetime64([to_date(instr.start) for instr in self.instruments])
+        ends = to_datetime64([to_date(instr.end) for instr in self.instruments])
+
+        # --- 1. Depos: un nodo per scadenza ---
+        self.depo_tau = yearfrac_vec(self.settle, ends[self.depo_idx], mod.ACT_360)
+
+        # --- 2. Futures: nodo all'expiry, DF al settle interpolato sui nodi precedenti ---
+        self.future_tau = yearfrac_vec(starts[self.future_idx], ends[self.future_idx], mod.ACT_360)
+        self.future_start_t = yearfrac_vec(self.settle, starts[self.future_idx], mod.ACT_365)
+
+        short_dates = np.concatenate((ends[self.depo_idx], ends[self.future_idx]))
+
+        # --- 3. Swaps: griglia annuale dal settlement fino all'ultima scadenza quotata ---
+        if len(self.swap_idx) > 0:
+            swap_dates = ends[self.swap_idx]
+            settle_date = self.settle.item()
+            years = swap_dates[-1].item().year - settle_date.year
+            grid = to_datetime64(
+                add_Dates(settle_date, years, mod_adjust.Modified)["Business Adjusted Dates"]
+            )
+            self.grid_x = grid[1:].astype(np.int64)
+            # La spline cubica è lineare nei tassi: la si valuta una volta sui vettori della base
+            # canonica e si ottiene la matrice (n_griglia, n_swaps) che mappa le quotazioni sui
+            # tassi della griglia, condivisa da tutti gli scenari
+            n_swaps = len(self.swap_idx)
+            self.spline_matrix = CubicSpline(swap_dates.astype(np.int64), np.eye(n_swaps))(self.grid_x)
+            # Frazioni d'anno (EU_30_360) tra le date successive della griglia
+            self.grid_tau = yearfrac_vec(grid[:-1], grid[1:], mod.EU_30_360)
+            self.grid_t = yearfrac_vec(self.settle, grid[1:], mod.ACT_365)
+            # Le date della griglia già coperte da depos e futures sono interpolate,
+            # le successive sono risolte con le equazioni di par degli swaps
+            last_short = short_dates.max() if len(short_dates) > 0 else self.settle
+            self.first_solved = int(np.searchsorted(grid[1:], last_short, side="right"))
+            swap_nodes = grid[1:][self.first_solved:]
+        else:
+            self.grid_x = np.zeros(0, dtype=np.int64)
+            self.spline_matrix = np.zeros((0, 0))
+            self.grid_tau = self.grid_t = np.zeros(0)
+            self.first_solved = 0
+            swap_nodes = np.array([], dtype="datetime64[D]")
+
+        # --- 4. Nodi della curva: settlement, depos, futures e griglia swaps ---
+        self.dates = np.concatenate(([self.settle], short_dates, swap_nodes))
+        if np.any(np.diff(self.dates) <= np.timedelta64(0, "D")):
+            raise ValueError("Instrument maturities must be strictly increasing after the settlement date.")
+        self.times = yearfrac_vec(self.settle, self.dates, mod.ACT_365)
+
+        # Pesi di interpolazione dei settle dei futures (sui soli nodi che li precedono)
+        # e delle date della griglia swaps interne alla parte breve
+        n_depos = len(self.depo_idx)
+        self.future_interp = [
+            interp_weights(self.times[1:1 + n_depos + j], self.future_start_t[j])
+            for j in range(len(self.future_idx))
+        ]
+        first_node = 1 + n_depos + len(self.future_idx)
+        self.grid_interp = interp_weights(self.times[1:first_node], self.grid_t[:self.first_solved])
+
+    def solve(self, rates, compute_jacobian: bool = False):
+        """
+        Risolve i discount factors dei nodi per un vettore di tassi (in decimali), ordinato come
+        gli strumenti del piano. rates può anche essere una matrice (K, n_strumenti): le K curve
+        (ad es. scenari con tassi shiftati) sono risolte insieme.
+
+        Con compute_jacobian=True propaga anche, nodo per nodo, le derivate analitiche dei
+        discount factors rispetto ai tassi degli strumenti.
+
+        Restituisce:
+          discounts: array NumPy dei discount factors ai nodi self.dates, di shape (n_nodi,)
+                     oppure (K, n_nodi)
+          jacobian (solo se compute_jacobian): d discounts / d rates, di shape
+                     (n_nodi, n_strumenti) oppure (K, n_nodi, n_strumenti)
+        """
+        rates = np.asarray(rates, dtype=float)
+        batch = np.atleast_2d(rates)
+        n_curves = batch.shape[0]
+        discounts = np.empty((n_curves, len(self.dates)))
+        discounts[:, 0] = 1.0
+        node_times = self.times[1:]
+        # Le derivate dei nodi sono sempre calcolate sulle righe di jac (nodo 0 escluso),
+        # con un array vuoto se non richieste
+        n_instr = batch.shape[1] if compute_jacobian else 0
+        jac = np.zeros((n_curves, len(self.dates), n_instr))
+
+        # --- 1. Depos ---
+        n_depos = len(self.depo_idx)
+        depo_nodes = np.arange(1, 1 + n_depos)
+        discounts[:, depo_nodes] = 1.0 / (1.0 + self.depo_tau * batch[:, self.depo_idx])
+        if compute_jacobian:
+            jac[:, depo_nodes, self.depo_idx] = -self.depo_tau * discounts[:, depo_nodes] ** 2
+
+        # --- 2. Futures ---
+        fwd_disc = 1.0 / (1.0 + self.future_tau * batch[:, self.future_idx])
+        for j, (lo, hi, w) in enumerate(self.future_interp):
+            node = 1 + n_depos + j
+            # DF al settle del future interpolato sui nodi già risolti
+            start_disc = interp_discounts(discounts[:, 1:], node_times, lo, hi, w, self.future_start_t[j])
+            discounts[:, node] = start_disc[:, 0] * fwd_disc[:, j]
+            if compute_jacobian:
+                start_jac = interp_jacobian(
+                    start_disc, discounts[:, 1:], jac[:, 1:], node_times, lo, hi, w, self.future_start_t[j]
+                )[:, 0]
+                jac[:, node] = fwd_disc[:, j, None] * start_jac
+                jac[:, node, self.future_idx[j]] -= start_disc[:, 0] * self.future_tau[j] * fwd_disc[:, j] ** 2
+
+        # --- 3. Swaps ---
+        if len(self.swap_idx) > 0:
+            first_node = 1 + n_depos + len(self.future_idx)
+            # Interpolazione spline dei tassi swap sulla griglia annuale (tutte le curve insieme)
+            interpolated_rates = batch[:, self.swap_idx] @ self.spline_matrix.T
+
+            # Date della griglia interne alla parte breve: interpolazione sui nodi
+            lo, hi, w = self.grid_interp
+            grid_t = self.grid_t[:self.first_solved]
+            grid_tau = self.grid_tau[:self.first_solved]
+            grid_discounts = interp_discounts(discounts[:, 1:], node_times, lo, hi, w, grid_t)
+            # BPV accumulato sulla griglia: aggiornato nodo per nodo invece di
+            # ricalcolare il prodotto scalare con tutti i nodi precedenti
+            bpv = grid_discounts @ grid_tau
+            if compute_jacobian:
+                grid_jac = interp_jacobian(grid_discounts, discounts[:, 1:], jac[:, 1:], node_times, lo, hi, w, grid_t)
+                bpv_jac = np.einsum("g,kgn->kn", grid_tau, grid_jac)
+                rate_jac = np.zeros((len(self.grid_x), n_instr))
+                rate_jac[:, self.swap_idx] = self.spline_matrix
+
+            # Calcolo iterativo
+            for i in range(self.first_solved, len(self.grid_x)):
+                swap_rate = interpolated_rates[:, i]
+                denominator = 1 + self.grid_tau[i] * swap_rate
+                discounts_i = (1 - swap_rate * bpv) / denominator
+                node = first_node + i - self.first_solved
+                if compute_jacobian:
+                    # Derivata di (1 - S A) / (1 + tau S) rispetto a S (tramite la spline) e ad A
+                    jac[:, node] = -(
+                        (bpv + self.grid_tau[i] * discounts_i)[:, None] * rate_jac[i]
+                        + swap_rate[:, None] * bpv_jac
+                    ) / denominator[:, None]
+                    bpv_jac += self.grid_tau[i] * jac[:, node]
+                bpv += self.grid_tau[i] * discounts_i
+                discounts[:, node] = discounts_i
+
+        if rates.ndim == 1:
+            discounts, jac = discounts[0], jac[0]
+        return (discounts, jac) if compute_jacobian else discounts
+
+
+def bootstrap_instruments(settle, instruments: List[Instrument]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Esegue il bootstrap a partire da una lista ordinata di strumenti (depos, futures e swaps
+    in qualsiasi numero e scadenza).
+
+    Restituisce:
+      dates: array datetime64[D] delle date dei nodi (la prima è il settlement)
+      discounts: array NumPy dei discount factors corrispondenti
+    """
+    plan = BootstrapPlan(settle, instruments)
+    return plan.dates, plan.solve([instr.rate for instr in instruments])
+
+
+def market_quotes(ratesSet) -> np.ndarray:
+    """
+    Concatena i tassi Mid (in percentuale) di depos, futures e swaps, nell'ordine delle righe
+    del RatesSet. È l'ordine delle colonne delle matrici di shock di bootstrap_many.
+    """
+    return np.concatenate((
+        ratesSet.depos["Mid"].values,
+        ratesSet.future["Mid"].values,
+        ratesSet.swap["Mid"].values,
+    )).astype(float)
+
+
+def market_instrument_dates(datesSet) -> Tuple[List[InstrumentType], List[date], List[date]]:
+    """
+    Tipo, data di inizio e scadenza di tutte le quotazioni del DatesSet, nello stesso ordine
+    di market_quotes.
+    """
+    today = to_date(datesSet.settle)
+    depos_dates = [to_date(d) for d in datesSet.depos["Settle Dates"]]
+    futures_settle = [to_date(d) for d in datesSet.future["Settle"]]
+    futures_expiry = [to_date(d) for d in datesSet.future["Expiry"]]
+    swap_dates = [to_date(d) for d in datesSet.swap["Swap Dates"]]
+
+    kinds = (
+        [InstrumentType.DEPO] * len(depos_dates) +
+        [InstrumentType.FUTURE] * len(futures_expiry) +
+        [InstrumentType.SWAP] * len(swap_dates)
+    )
+    starts = [today] * len(depos_dates) + futures_settle + [today] * len(swap_dates)
+    ends = depos_dates + futures_expiry + swap_dates
+    return kinds, starts, ends
+
+
+def market_quote_index(datesSet) -> np.ndarray:
+    """
+    Posizioni (nell'ordine di market_quotes) delle quotazioni usate nel bootstrap:
+      - depos fino al primo che scade dopo il settle del primo future (incluso);
+      - futures che scadono prima del primo swap;
+      - tutti gli swaps.
+    Gli strumenti che scadono entro la data di settlement sono scartati.
+    """
+    today = to_date(datesSet.settle)
+    kinds, starts, ends = market_instrument_dates(datesSet)
+    positions = {kind: [i for i, k in enumerate(kinds) if k == kind] for kind in InstrumentType}
+
+    swaps = positions[InstrumentType.SWAP]
+    first_swap = ends[swaps[0]] if swaps else date.max
+    futures = [i for i in positions[InstrumentType.FUTURE] if ends[i] <= first_swap]
+
+    # I depos coprono la curva fino al settle del primo future (o al primo swap)
+    depo_limit = starts[futures[0]] if futures else first_swap
+    depos = []
+    for i in positions[InstrumentType.DEPO]:
+        if ends[i] <= today:
+            continue
+        depos.append(i)
+        if ends[i] >= depo_limit:
+            break
+
+    return np.array(depos + futures + swaps, dtype=int)
+
+
+def market_instruments(datesSet, ratesSet) -> List[Instrument]:
+    """
+    Seleziona dai dati di mercato gli strumenti usati nel bootstrap (tassi Mid, in decimali),
+    secondo la regola di market_quote_index.
+    """
+    kinds, starts, ends = market_instrument_dates(datesSet)
+    # Dividi per 100 per passare da "1.904" (1.904%) a 0.01904
+    rates = market_quotes(ratesSet) / 100.0
+    return [
+        Instrument(kinds[i], starts[i], ends[i], rates[i])
+        for i in market_quote_index(datesSet)
+    ]
+
+
+def bootstrap_many(datesSet, base_rates, shocks) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bootstrap di molti scenari sulle stesse date: date, frazioni d'anno, pesi di interpolazione
+    e matrice della spline degli swaps sono calcolati una sola volta, poi tutti gli scenari sono
+    risolti insieme.
+
+    Parametri:
+    - datesSet: DatesSet con le date di mercato.
+    - base_rates: RatesSet di partenza (tassi Mid in percentuale).
+    - shocks: matrice (n_scenari, n_quotazioni) di shift da sommare ai tassi Mid, nelle stesse
+      unità (0.01 = 1 bp) e con le colonne nell'ordine di market_quotes (depos, futures, swaps).
+      Un vettore è trattato come un unico scenario.
+
+    Restituisce:
+      dates: array datetime64[D] delle date dei nodi
+      discounts: array NumPy (n_scenari, n_nodi) dei discount factors
+    """
+    shocks = np.atleast_2d(np.asarray(shocks, dtype=float))
+    base = market_quotes(base_rates)
+    if shocks.shape[1] != len(base):
+        raise ValueError(f"Shocks must have {len(base)} columns (depos, futures and swaps quotes).")
+
+    plan = BootstrapPlan(datesSet.settle, market_instruments(datesSet, base_rates))
+    rates = (base + shocks)[:, market_quote_index(datesSet)] / 100.0
+    return plan.dates, plan.solve(rates)
+
+
+def bootstrap_batch(datesSet, ratesSets: List) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Esegue il bootstrap di più RatesSet sulle stesse date (ad es. scenari di bump) in un'unica
+    risoluzione vettoriale, tramite bootstrap_many con gli shift rispetto al primo RatesSet.
+
+    Restituisce:
+      dates: array datetime64[D] delle date dei nodi
+      discounts: array NumPy (K, n_nodi) dei discount factors, uno per RatesSet
+    """
+    base = market_quotes(ratesSets[0])
+    shocks = np.array([market_quotes(rates_set) - base for rates_set in ratesSets])
+    return bootstrap_many(datesSet, ratesSets[0], shocks)
+
+
+def bootstrap(datesSet, ratesSet, compute_jacobian: bool = False):
     """
     Esegue il bootstrapping per calcolare i discount factors a partire dai tassi di Depos, Futures e Swaps.
     
@@ -35,134 +413,39 @@ def bootstrap(datesSet, ratesSet):
           • swap: DataFrame con colonne "Bid", "Ask", "Mid" (Swaps)
 
     Nota: i tassi sono in percentuale (es. 1.90 per 1.90%). Li convertiamo in decimali (es. 0.019).
+    Gli strumenti sono selezionati con market_instruments e risolti con un BootstrapPlan,
+    quindi il numero di depos, futures e swaps non è fissato.
     
     Restituisce:
-      dates: lista ordinata di date
-      discounts: array NumPy dei discount factors corrispondenti
+      dates: DataFrame con la colonna "Date" (date ordinate)
+      discounts: DataFrame con la colonna "Discount Factor" (discount factors corrispondenti)
+      jacobian (solo se compute_jacobian): array NumPy (n_nodi, n_quotazioni) con le derivate
+          analitiche dei discount factors rispetto ai tassi Mid (in percentuale), colonne
+          nell'ordine di market_quotes; le quotazioni non usate hanno derivata nulla.
+          Moltiplicato per 0.01 dà la variazione per un bump di 1 bp di ciascuna quotazione.
     """
-    # Converte la data di settlement in datetime.date
-    today = to_date(datesSet.settle)
-    
-    # --- 1. Depos ---
-    # Dividi per 100 per passare da "1.904" (1.904%) a 0.01904
-    L_depos = ratesSet.depos["Mid"].values / 100.0
-    
-    # Converte le date dei Depos in datetime.date
-    depos_dates = datesSet.depos["Settle Dates"].apply(to_date)
-    
-    # Frazione d'anno (ACT/360)
-    y_frac_depos = np.array([yearfrac(today, d, mod.ACT_360) for d in depos_dates])
-    
-    # Calcolo discount factors Depos
-    discounts_depos = 1.0 / (1.0 + y_frac_depos * L_depos)
-    
-    # --- 2. Futures ---
-    futures = datesSet.future.copy()
-    # Converte in date standard
-    futures["Settle"] = futures["Settle"].apply(to_date)
-    futures["Expiry"] = futures["Expiry"].apply(to_date)
-    
-    # Dividi i tassi Future per 100
-    mid_rates_futures = ratesSet.future["Mid"].values / 100.0
-    
-    # Frazione d'anno (ACT/360)
-    y_frac_futurs = futures.apply(
-        lambda row: yearfrac(row["Settle"], row["Expiry"], mod.ACT_360), axis=1
-    ).values
-    
-    # Calcolo dei fattori forward
-    fwd_disc = 1.0 / (1.0 + y_frac_futurs * mid_rates_futures)
-    
-    discounts_futures = np.zeros(7)
-    # Interpolazione su alcuni punti (MATLAB 1-based → Python 0-based)
-    discounts_futures[0] = interpolation(
-        depos_dates.iloc[2], depos_dates.iloc[3],
-        discounts_depos[2], discounts_depos[3],
-        futures.iloc[0]["Settle"], fwd_disc[0], today
-    )
-    discounts_futures[1] = interpolation(
-        depos_dates.iloc[3], futures.iloc[0]["Expiry"],
-        discounts_depos[3], discounts_futures[0],
-        futures.iloc[1]["Settle"], fwd_disc[1], today
-    )
-    discounts_futures[2] = interpolation(
-        futures.iloc[0]["Expiry"], futures.iloc[1]["Expiry"],
-        discounts_futures[0], discounts_futures[1],
-        futures.iloc[2]["Settle"], fwd_disc[2], today
-    )
-    discounts_futures[3] = discounts_futures[2] * fwd_disc[3]
-    discounts_futures[4] = discounts_futures[3] * fwd_disc[4]
-    discounts_futures[5] = interpolation(
-        futures.iloc[3]["Expiry"], futures.iloc[4]["Expiry"],
-        discounts_futures[3], discounts_futures[4],
-        futures.iloc[5]["Settle"], fwd_disc[5], today
-    )
-    discounts_futures[6] = interpolation(
-        futures.iloc[4]["Expiry"], futures.iloc[5]["Expiry"],
-        discounts_futures[4], discounts_futures[5],
-        futures.iloc[6]["Settle"], fwd_disc[6], today
-    )
-    
-    # --- 3. Swaps ---
-    # Genera date aggiuntive (50 anni) con add_Dates
-    dt = date(2023, 2, 2)
-    datesSet_add = add_Dates(dt, 50, mod_adjust.Modified)
-    swap_dates = datesSet_add["Business Adjusted Dates"].apply(to_date).tolist()
-    
-    # Dividi i tassi Swap per 100
-    mid_rates_swaps = ratesSet.swap["Mid"].values / 100.0
-    
-    # Frazione d'anno (EU_30_360) tra le date successive
-    y_frac_swaps = np.array([
-        yearfrac(swap_dates[i], swap_dates[i+1], mod.EU_30_360)
-        for i in range(len(swap_dates) - 1)
-    ])
-    
-    # Interpolazione spline sui nodi Swap
-    swaps_numeric = np.array([to_date(x).toordinal() for x in datesSet.swap["Swap Dates"]])
-    swap_dates_numeric = np.array([d.toordinal() for d in swap_dates])
-    
-    cs = CubicSpline(swaps_numeric, mid_rates_swaps)
-    interpolated_rates = cs(swap_dates_numeric)
-    
-    discounts_swaps = np.zeros(len(swap_dates) - 1)
-    # Interpolazione iniziale
-    discounts_swaps[0] = interpolation(
-        futures.iloc[2]["Expiry"], futures.iloc[3]["Expiry"],
-        discounts_futures[2], discounts_futures[3],
-        swap_dates[1], 1.0, today
-    )
-    
-    # Calcolo iterativo
-    for i in range(1, len(discounts_swaps)):
-        x = np.dot(y_frac_swaps[:i], discounts_swaps[:i])
-        discounts_swaps[i] = (1 - interpolated_rates[i+1] * x) / (1 + y_frac_swaps[i] * interpolated_rates[i+1])
-    
-    
-    # --- 4. Aggregazione e ordinamento ---
-    aggregated_dates = ([today] +
-                        list(depos_dates.iloc[:4]) +
-                        list(futures["Expiry"].iloc[:7]) +
-                        swap_dates[2:])
-    aggregated_discounts = np.concatenate((
-        np.array([1.0]),
-        discounts_depos[:4],
-        discounts_futures,
-        discounts_swaps[1:]
-    ))
-    
-    combined = list(zip(aggregated_dates, aggregated_discounts))
-    combined_sorted = sorted(combined, key=lambda x: x[0])
-    dates_sorted, discounts_sorted = zip(*combined_sorted)
+    instruments = market_instruments(datesSet, ratesSet)
+    plan = BootstrapPlan(datesSet.settle, instruments)
+    rates = [instr.rate for instr in instruments]
 
     # Trasforma separatamente i vettori in DataFrame pandas
-    dates = pd.DataFrame({"Date": dates_sorted})
+    dates = pd.DataFrame({"Date": plan.dates.astype(object)})
+
+    if not compute_jacobian:
+        discounts = pd.DataFrame({"Discount Factor": plan.solve(rates)})
+        return dates, discounts
+
+    discounts_sorted, plan_jacobian = plan.solve(rates, compute_jacobian=True)
     discounts = pd.DataFrame({"Discount Factor": discounts_sorted})
+    # Da derivate rispetto ai tassi decimali degli strumenti a derivate rispetto alle quotazioni Mid
+    jacobian = np.zeros((len(plan.dates), len(market_quotes(ratesSet))))
+    jacobian[:, market_quote_index(datesSet)] = plan_jacobian / 100.0
 
-    return dates, discounts
+    return dates, discounts, jacobian
     
 
 
+
 # Esempio d'uso
 if __name__ == '__main__':
     # Esempio di come potresti creare e popolare datesSet e ratesSet
@@ -0,0 +1,122 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Business-day calendars with vectorized date adjustments
+"""
+
+import numpy as np
+from typing import Iterable
+from yearfrac import to_datetime64
+
+
+# Business-day conventions, named as the roll argument of np.busday_offset
+FOLLOWING = "following"
+MODIFIED_FOLLOWING = "modifiedfollowing"
+PRECEDING = "preceding"
+MODIFIED_PRECEDING = "modifiedpreceding"
+
+
+class BusinessCalendar:
+    """
+    Calendar of business days: a weekmask and a table of holidays, compiled once into a
+    np.busdaycalendar. All the operations take whole datetime64 arrays (or single dates) and run in
+    NumPy's business-day routines, without Python loops over the dates.
+    """
+
+    def __init__(self, name: str, holidays: Iterable = (), weekmask: str = "1111100"):
+        """
+        Parameters:
+            name (str): Name of the calendar.
+            holidays (Iterable): Closing days (besides the weekend).
+            weekmask (str): Business days of the week, from Monday (default Monday to Friday).
+        """
+        self.name = name
+        holidays = to_datetime64(np.asarray(holidays)).astype("datetime64[D]").ravel()
+        self.busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=holidays)
+
+    @property
+    def holidays(self) -> np.ndarray:
+        return self.busdaycal.holidays
+
+    def __repr__(self) -> str:
+        return f"BusinessCalendar({self.name!r}, {len(self.holidays)} holidays)"
+
+    def is_business_day(self, dates) -> np.ndarray:
+        """
+        Whether each date is a business day.
+        """
+        return np.is_busday(to_datetime64(dates), busdaycal=self.busdaycal)
+
+    def adjust(self, dates, convention: str = FOLLOWING) -> np.ndarray:
+        """
+        Move each date to a business day with a business-day convention (FOLLOWING, MODIFIED_FOLLOWING,
+        PRECEDING or MODIFIED_PRECEDING); business days are unchanged.
+
+        Returns:
+            np.ndarray: Adjusted dates as datetime64[D], with the shape of the input.
+        """
+        return np.busday_offset(to_datetime64(dates), 0, roll=convention, busdaycal=self.busdaycal)
+
+    def offset(self, dates, business_days, convention: str = FOLLOWING) -> np.ndarray:
+        """
+        Move each date by a number of business days, after adjusting it with the convention.
+
+        Returns:
+            np.ndarray: Shifted dates as datetime64[D], broadcast over dates and business_days.
+        """
+        return np.busday_offset(
+            to_datetime64(dates), np.asarray(business_days), roll=convention, busdaycal=self.busdaycal
+        )
+
+    def count(self, start_dates, end_dates) -> np.ndarray:
+        """
+        Number of business days in [start, end) for each pair of dates.
+        """
+        return np.busday_count(to_datetime64(start_dates), to_datetime64(end_dates), busdaycal=self.busdaycal)
+
+
+def easter_sunday(years) -> np.ndarray:
+    """
+    Easter Sunday of the given years (Gregorian calendar, anonymous algorithm), as datetime64[D].
+    """
+    y = np.asarray(years, dtype=np.int64)
+    a, b, c = y % 19, y // 100, y % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    day = (h + l - 7 * m + 33 * month + 19) % 32
+    return _ymd(y, month, day)
+
+
+def target_holidays(first_year: int = 1999, last_year: int = 2100) -> np.ndarray:
+    """
+    TARGET closing days: New Year's Day, Good Friday, Easter Monday, Labour Day (1 May), Christmas and
+    26 December (the closing days in force since 2002, used for all the years).
+    """
+    years = np.arange(first_year, last_year + 1)
+    easter = easter_sunday(years)
+    ones = np.ones_like(years)
+    return np.sort(np.concatenate((
+        _ymd(years, ones, ones),
+        easter - np.timedelta64(2, "D"),
+        easter + np.timedelta64(1, "D"),
+        _ymd(years, 5 * ones, ones),
+        _ymd(years, 12 * ones, 25 * ones),
+        _ymd(years, 12 * ones, 26 * ones),
+    )))
+
+
+def _ymd(years, months, days) -> np.ndarray:
+    """
+    Dates from arrays of years, months and days.
+    """
+    first_day = (np.asarray(years) - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (np.asarray(months) - 1)
+    return first_day.astype("datetime64[D]") + (np.asarray(days) - 1)
+
+
+# Weekends only (the convention of the assignment) and TARGET
+WEEKENDS = BusinessCalendar("WEEKENDS")
+TARGET = BusinessCalendar("TARGET", target_holidays())
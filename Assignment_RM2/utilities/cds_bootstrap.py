@@ -0,0 +1,110 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Bootstrap of survival probabilities and intensities from CDS spreads
+"""
+
+import numpy as np
+import pandas as pd
+import datetime as dt
+from enum import Enum
+from typing import Iterable, Tuple, Union
+from yearfrac import yearfrac_vec, to_datetime64, mod
+from discount_curve import DiscountCurve, as_discount_curve
+
+
+class CDSBootstrapMethod(Enum):
+    """
+    Bootstrap methods of bootstrapCDS (the values are the flags of the MATLAB function).
+    """
+    APPROX = 1  # Premium leg without the accrual on default
+    EXACT = 2   # Premium leg with the accrual on default (half period)
+    JT = 3      # Jarrow-Turnbull: flat intensity spread / (1 - recovery) for each maturity
+
+
+def bootstrap_cds(
+    discount_factors: Union[pd.Series, DiscountCurve],
+    dates_cds: Iterable[Union[dt.date, pd.Timestamp]],
+    spreads_cds: Union[Iterable[float], np.ndarray],
+    method: Union[CDSBootstrapMethod, int] = CDSBootstrapMethod.APPROX,
+    recovery: Union[float, Iterable[float]] = 0.4,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bootstrap of survival probabilities and default intensities from a strip of CDS spreads, for one or
+    many reference entities at once (port of bootstrapCDS and of its approx/exact/JT methods).
+
+    The CDS maturing at dates_cds[i] pays the premium on the grid dates_cds[1:i+1] (EU 30/360 accruals),
+    so the grid can be annual, as in the MATLAB assignment, or quarterly with one spread per date. The
+    sums of the premium and protection legs over the previous dates are carried as running totals and
+    each step is vectorized across the entities, so the cost is O(n_dates) array operations.
+
+    Parameters:
+        discount_factors (Union[pd.Series, DiscountCurve]): Discount factors indexed by date or discount curve.
+        dates_cds (Iterable[Union[dt.date, pd.Timestamp]]): Settlement date followed by the CDS maturities.
+        spreads_cds (Union[Iterable[float], np.ndarray]): CDS spreads in basis points, one per maturity,
+            with shape (n_maturities,) or (n_entities, n_maturities).
+        method (Union[CDSBootstrapMethod, int]): Bootstrap method (or the MATLAB flag 1, 2, 3).
+        recovery (Union[float, Iterable[float]]): Recovery rate, a single one or one per entity.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: CDS dates, survival probabilities and intensities
+            at the maturities, with the same shape as spreads_cds.
+    """
+    try:
+        method = CDSBootstrapMethod(method)
+    except ValueError:
+        raise ValueError("Invalid method. Please use 1 (Approximate), 2 (Exact), or 3 (JT).") from None
+
+    dates_cds = to_datetime64(list(dates_cds))
+    # Convert spreads from basis points (bps) to decimal, one row per entity
+    spreads = np.atleast_2d(np.asarray(spreads_cds, dtype=float)) * 1e-4
+    n_entities, n_maturities = spreads.shape
+    if n_maturities != len(dates_cds) - 1:
+        raise ValueError("A spread is needed for each CDS maturity.")
+    lgd = 1.0 - np.broadcast_to(np.asarray(recovery, dtype=float), (n_entities,))
+
+    if method == CDSBootstrapMethod.JT:
+        # Flat intensity for each maturity, survival from the settlement date
+        intensities = spreads / lgd[:, None]
+        yfrac_365 = yearfrac_vec(dates_cds[0], dates_cds[1:], mod.ACT_365)
+        surv_probs = np.exp(-intensities * yfrac_365)
+    else:
+        curve = as_discount_curve(discount_factors)
+        discounts = curve.df(dates_cds[1:])
+
+        # Year fractions of the CDS periods with both conventions
+        deltas = yearfrac_vec(dates_cds[:-1], dates_cds[1:], mod.EU_30_360)
+        deltas_365 = yearfrac_vec(dates_cds[:-1], dates_cds[1:], mod.ACT_365)
+
+        # Half of the premium of the period is paid on default with the accrual
+        accrual = 0.5 if method == CDSBootstrapMethod.EXACT else 0.0
+
+        surv_probs = np.empty((n_entities, n_maturities))
+        prev_surv = np.ones(n_entities)  # The probability of survival at t=0 is 1
+        protection_sum = np.zeros(n_entities)  # sum_j P_j * (S_{j-1} - S_j)
+        premium_sum = np.zeros(n_entities)     # sum_j delta_j * P_j * S_j
+        accrual_sum = np.zeros(n_entities)     # accrual * sum_j delta_j * P_j * (S_{j-1} - S_j)
+
+        for i in range(n_maturities):
+            s, P, delta = spreads[:, i], discounts[i], deltas[i]
+
+            # Protection leg = premium leg for the CDS maturing at date i, solved for S_i
+            N = lgd * (protection_sum + P * prev_surv) - s * (
+                premium_sum + accrual_sum + accrual * delta * P * prev_surv
+            )
+            D = lgd * P + s * delta * P * (1.0 - accrual)
+            surv = N / D
+            surv_probs[:, i] = surv
+
+            # Update the running sums with the period just bootstrapped
+            protection_sum += P * (prev_surv - surv)
+            premium_sum += delta * P * surv
+            accrual_sum += accrual * delta * P * (prev_surv - surv)
+            prev_surv = surv
+
+        # Piecewise constant intensities from the survival probabilities
+        surv_with_start = np.hstack((np.ones((n_entities, 1)), surv_probs))
+        intensities = -np.log(surv_with_start[:, 1:] / surv_with_start[:, :-1]) / deltas_365
+
+    if np.ndim(spreads_cds) == 1:
+        return dates_cds, surv_probs[0], intensities[0]
+    return dates_cds, surv_probs, intensities
@@ -0,0 +1,188 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Discount curve object built once from the bootstrap output
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Type, Union
+from yearfrac import yearfrac_vec, to_datetime64, mod
+from interpolation import InterpolationKernel, LinearZeroKernel
+
+
+class DiscountCurve:
+    """
+    Discount curve obtained from the bootstrap.
+
+    Node dates, ACT/365 year fractions and zero rates are stored as contiguous NumPy arrays, so the
+    discount factors of any number of dates are obtained with a single vectorized interpolation.
+    The interpolation kernel (see interpolation.InterpolationKernel) is built once with the curve;
+    the default is linear on zero rates with flat extrapolation, as in
+    get_discount_factor_by_zero_rates_linear_interp.
+    The first node is the reference (settlement) date of the curve, with discount factor 1.
+
+    In dense mode the discount factor of every calendar day from the reference date to the last node is
+    computed once, on the first lookup, into a flat array: df of dates in this range is then an index by
+    day offset. The array belongs to the curve, so a rebuilt curve always starts from a new one.
+    """
+
+    def __init__(
+        self, dates, discount_factors, kernel: Type[InterpolationKernel] = LinearZeroKernel, dense: bool = False
+    ):
+        """
+        Parameters:
+            dates: Node dates, sorted, starting from the reference date.
+            discount_factors: Discount factors corresponding to the node dates.
+            kernel (Type[InterpolationKernel]): Interpolation kernel, e.g. LinearZeroKernel,
+                LogLinearDiscountKernel, MonotoneConvexKernel or NaturalCubicKernel.
+            dense (bool): Look up discount factors on the daily grid (see daily_discounts).
+        """
+        self.dates = to_datetime64(dates)
+        self.discount_factors = np.ascontiguousarray(discount_factors, dtype=float)
+
+        # Ensure dates and discount factors are the same length
+        if self.dates.shape != self.discount_factors.shape:
+            raise ValueError("Dates and discount factors must have the same length.")
+
+        self.ref_date = self.dates[0]
+        # Year fractions (ACT/365) and zero rates of the nodes, excluding the reference date
+        self.year_fractions = self.year_frac(self.dates[1:])
+        self.kernel = kernel(self.year_fractions, self.discount_factors[1:])
+        self.zero_rates = self.kernel.zero_rates
+        self.dense = dense
+        self._daily_discounts = None
+
+    @classmethod
+    def from_bootstrap(
+        cls,
+        dates: pd.DataFrame,
+        discounts: pd.DataFrame,
+        kernel: Type[InterpolationKernel] = LinearZeroKernel,
+        dense: bool = False,
+    ) -> "DiscountCurve":
+        """
+        Build the curve from the two DataFrames returned by bootstrap.
+
+        Parameters:
+            dates (pd.DataFrame): DataFrame with the 'Date' column.
+            discounts (pd.DataFrame): DataFrame with the 'Discount Factor' column.
+            kernel (Type[InterpolationKernel]): Interpolation kernel.
+            dense (bool): Look up discount factors on the daily grid.
+
+        Returns:
+            DiscountCurve: The discount curve.
+        """
+        return cls(dates["Date"].values, discounts["Discount Factor"].values, kernel, dense)
+
+    @classmethod
+    def from_series(
+        cls, discount_factors: pd.Series, kernel: Type[InterpolationKernel] = LinearZeroKernel, dense: bool = False
+    ) -> "DiscountCurve":
+        """
+        Build the curve from a Series of discount factors indexed by date.
+
+        Parameters:
+            discount_factors (pd.Series): Series of discount factors indexed by date.
+            kernel (Type[InterpolationKernel]): Interpolation kernel.
+            dense (bool): Look up discount factors on the daily grid.
+
+        Returns:
+            DiscountCurve: The discount curve.
+        """
+        return cls(discount_factors.index, discount_factors.values, kernel, dense)
+
+    def year_frac(self, dates) -> Union[float, np.ndarray]:
+        """
+        Year fractions (ACT/365) between the reference date and the given dates.
+        """
+        return yearfrac_vec(self.ref_date, dates, mod.ACT_365)
+
+    @property
+    def daily_discounts(self) -> np.ndarray:
+        """
+        Discount factors of every calendar day from the reference date to the last node (read-only),
+        computed with the kernel on the first access: daily_discounts[n] is the discount factor of
+        ref_date + n days.
+        """
+        if self._daily_discounts is None:
+            n_days = int((self.dates[-1] - self.ref_date).astype(np.int64)) + 1
+            discounts = np.ones(n_days)
+            discounts[1:] = self.kernel.discount(np.arange(1, n_days) / 365.0)
+            discounts.setflags(write=False)
+            self._daily_discounts = discounts
+        return self._daily_discounts
+
+    def df(self, dates) -> Union[float, np.ndarray]:
+        """
+        Discount factors at the given dates. In dense mode, dates between the reference date and the
+        last node are read from daily_discounts; otherwise (or for any date outside) the kernel is used.
+
+        Parameters:
+            dates: A single date or an array-like of dates.
+
+        Returns:
+            Union[float, np.ndarray]: Discount factor(s), with the same shape as the input.
+        """
+        if self.dense:
+            days = (to_datetime64(dates) - self.ref_date).astype(np.int64)
+            daily_discounts = self.daily_discounts
+            if days.size > 0 and days.min() >= 0 and days.max() < len(daily_discounts):
+                discounts = daily_discounts[days]
+                return float(discounts) if discounts.ndim == 0 else discounts
+        discounts = self.kernel.discount(self.year_frac(dates))
+        return float(discounts) if discounts.ndim == 0 else discounts
+
+    def df_jacobian(self, dates) -> np.ndarray:
+        """
+        Sensitivities of the interpolated discount factors to the node discount factors.
+
+        Parameters:
+            dates: A single date or an array-like of dates.
+
+        Returns:
+            np.ndarray: Matrix (n_dates, n_nodes) with d df(date) / d discount_factors[node]; the
+                column of the reference date is zero since its discount factor is fixed to 1.
+        """
+        yf = np.atleast_1d(self.year_frac(dates))
+        jacobian = np.zeros((len(yf), len(self.dates)))
+        jacobian[:, 1:] = self.kernel.discount_jacobian(yf)
+        return jacobian
+
+    def df_adjoint(self, dates, df_bar) -> np.ndarray:
+        """
+        Reverse-mode (adjoint) step of df: propagates the sensitivities of a price to the discount
+        factors of the given dates back to the node discount factors, i.e. df_jacobian(dates).T @ df_bar;
+        with the local kernels (linear zero, log-linear) each date is scattered on its two adjacent nodes
+        without building the Jacobian.
+
+        Parameters:
+            dates: A single date or an array-like of dates.
+            df_bar: Sensitivities of the price to df(dates), same length as dates.
+
+        Returns:
+            np.ndarray: Sensitivities of the price to the node discount factors (n_nodes,).
+        """
+        node_bar = np.zeros(len(self.dates))
+        node_bar[1:] = self.kernel.discount_adjoint(np.atleast_1d(self.year_frac(dates)), df_bar)
+        return node_bar
+
+    def to_series(self) -> pd.Series:
+        """
+        Series of the node discount factors indexed by date.
+        """
+        return pd.Series(data=self.discount_factors, index=pd.DatetimeIndex(self.dates))
+
+
+def as_discount_curve(discount_factors: Union[pd.Series, DiscountCurve]) -> DiscountCurve:
+    """
+    Return a DiscountCurve, building it from a Series of discount factors if needed.
+
+    Parameters:
+        discount_factors (Union[pd.Series, DiscountCurve]): Discount factors indexed by date or a curve.
+
+    Returns:
+        DiscountCurve: The discount curve.
+    """
+    if isinstance(discount_factors, pd.Series):
+        return DiscountCurve.from_series(discount_factors)
+    return discount_factors
@@ -3,17 +3,15 @@ Mathematical Engineering - Financial Engineering, FY 2024-2025
 Risk Management - Exercise 2: Corporate Bond Portfolio
 """
 
-from typing import Union
+from dataclasses import dataclass
+from typing import Callable, Iterable, Tuple, Union
 import numpy as np
 import pandas as pd
 import datetime as dt
-import math
-from yearfrac import yearfrac, mod
-from ex1_utilities import (
-    year_frac_act_x,
-    get_discount_factor_by_zero_rates_linear_interp,
-    date_series
-)
+from yearfrac import yearfrac_vec, mod
+from ex1_utilities import payment_schedule
+from discount_curve import DiscountCurve, as_discount_curve
+from hazard_curve import HazardCurve
 
 
 def bond_cash_flows(
@@ -37,18 +35,16 @@ def bond_cash_flows(
         pd.Series: Bond cash flows.
     """
 
-    # Payment dates
-    cash_flows_dates = date_series(ref_date, expiry, coupon_freq)
+    # Payment dates (cached schedule, not rebuilt by the root finders calling the pricers)
+    schedule = payment_schedule(ref_date, expiry, coupon_freq)
     
-    yfrac = [
-        yearfrac(d1, d2, mod.EU_30_360) 
-        for d1, d2 in zip(cash_flows_dates[:-1], cash_flows_dates[1:])
-    ]
+    # Accruals of the coupon periods, computed on the whole schedule at once
+    yfrac = yearfrac_vec(schedule[:-1], schedule[1:], mod.EU_30_360)
 
     # Coupon payments
     cash_flows = pd.Series(
-        data= notional * coupon_rate * np.array(yfrac),
-        index=cash_flows_dates[1:],
+        data= notional * coupon_rate * yfrac,
+        index=pd.DatetimeIndex(schedule[1:]),
     )
 
     # Notional payment
@@ -57,6 +53,241 @@ def bond_cash_flows(
     return cash_flows
 
 
+def _newton(func: Callable[[float], Tuple[float, float]], x0: float, tol: float = 1e-12, max_iter: int = 50) -> float:
+    """
+    Newton-Raphson iteration on a function returning its value and its exact derivative.
+
+    Parameters:
+        func (Callable[[float], Tuple[float, float]]): Function returning (f(x), f'(x)).
+        x0 (float): Initial guess.
+        tol (float): Absolute tolerance on the Newton step.
+        max_iter (int): Maximum number of iterations.
+
+    Returns:
+        float: Root of the function.
+
+    Raises:
+        RuntimeError: If the derivative vanishes or is not finite, or the iteration does not converge.
+    """
+    x = x0
+    for _ in range(max_iter):
+        value, derivative = func(x)
+        if derivative == 0 or not np.isfinite(derivative):
+            raise RuntimeError(f"Newton iteration stopped: derivative {derivative} at x = {x}.")
+        step = value / derivative
+        x -= step
+        if abs(step) < tol:
+            return x
+
+    raise RuntimeError("Newton iteration did not converge.")
+
+
+class DefaultableBond:
+    """
+    Defaultable fixed coupon bond with cash flows, payment times and discount factors computed once.
+
+    Neglecting the recovery of the coupons, the dirty price
+    sum_i CF_i * P(t_i) * S(t_i) + R * N * P(t_i) * (S(t_{i-1}) - S(t_i))
+    is linear in the survival probabilities S(t_i): the weights of the linear form are precomputed, so
+    price and derivative with respect to the intensity (or Z-spread) cost two dot products and the
+    calibration runs Newton steps with the exact derivative.
+    """
+
+    def __init__(
+        self,
+        ref_date: Union[dt.date, pd.Timestamp],
+        expiry: Union[dt.date, pd.Timestamp],
+        coupon_rate: float,
+        coupon_freq: int,
+        recovery_rate: float,
+        discount_factors: Union[pd.Series, DiscountCurve],
+        notional: float = 1.0,
+    ):
+        """
+        Parameters:
+        ref_date (Union[dt.date, pd.Timestamp]): Reference date.
+        expiry (Union[dt.date, pd.Timestamp]): Bond's expiry date.
+        coupon_rate (float): Coupon rate.
+        coupon_freq (int): Coupon frequency in payments a years.
+        recovery_rate (float): Recovery rate.
+        discount_factors (Union[pd.Series, DiscountCurve]): Discount factors indexed by date or discount curve.
+        notional (float): Notional amount.
+        """
+        self.ref_date = ref_date
+        self.expiry = expiry
+        self.recovery_rate = recovery_rate
+        self.notional = notional
+
+        self.cash_flows = bond_cash_flows(ref_date, expiry, coupon_rate, coupon_freq, notional)
+        self.curve = as_discount_curve(discount_factors)
+
+        # Payment times (ACT/365) and discount factors of the cash flows
+        self.times = yearfrac_vec(ref_date, self.cash_flows.index, mod.ACT_365)
+        self.discounts = self.curve.df(self.cash_flows.index)
+
+        cf = self.cash_flows.values
+        rn = recovery_rate * notional
+        # S(t_i) enters the coupon term, its own default leg and the default leg of the next period;
+        # S(t_0) = 1 only enters the default leg of the first period
+        self.survival_weights = (cf - rn) * self.discounts + rn * np.append(self.discounts[1:], 0.0)
+        self.recovery_first_period = rn * self.discounts[0]
+        # Without recovery (Z-spread pricing) the weights are the discounted cash flows
+        self.discounted_cash_flows = cf * self.discounts
+
+    def survival_probabilities(
+        self,
+        intensity: float,
+        prev_intensity: float = 0.0,
+        prev_expiry: Union[dt.date, pd.Timestamp, None] = None,
+        hazard_curve: Union[HazardCurve, None] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Survival probabilities at the payment dates for an intensity that is prev_intensity up to
+        prev_expiry and intensity afterwards (flat intensity if prev_expiry is None). If a hazard curve
+        is given, it provides the intensities up to its last node and intensity holds afterwards.
+
+        Parameters:
+        intensity (float): Intensity (after prev_expiry or after the last node of hazard_curve).
+        prev_intensity (float): Intensity up to prev_expiry.
+        prev_expiry (Union[dt.date, pd.Timestamp, None]): End of the first intensity period.
+        hazard_curve (Union[HazardCurve, None]): Intensities of the previous periods.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Survival probabilities and their derivatives with respect to intensity.
+        """
+        if hazard_curve is not None:
+            yfrac_prev_expiry = hazard_curve.times[-1]
+        elif prev_expiry is not None:
+            yfrac_prev_expiry = yearfrac_vec(self.ref_date, prev_expiry, mod.ACT_365)
+        else:
+            yfrac_prev_expiry = 0.0
+
+        # Time spent before and after the end of the previous intensity periods
+        times_before = np.minimum(self.times, yfrac_prev_expiry)
+        times_after = self.times - times_before
+
+        if hazard_curve is not None:
+            hazard_before = hazard_curve.cumulative_hazard_from_times(times_before)
+        else:
+            hazard_before = prev_intensity * times_before
+
+        prob = np.exp(-(hazard_before + intensity * times_after))
+        return prob, -times_after * prob
+
+    def price_from_intensity(
+        self,
+        intensity: float,
+        prev_intensity: float = 0.0,
+        prev_expiry: Union[dt.date, pd.Timestamp, None] = None,
+        hazard_curve: Union[HazardCurve, None] = None,
+    ) -> Tuple[float, float]:
+        """
+        Dirty price and its derivative with respect to the intensity (after prev_expiry or after the
+        last node of hazard_curve, if given).
+
+        Parameters:
+        intensity (float): Intensity (after prev_expiry or after the last node of hazard_curve).
+        prev_intensity (float): Intensity up to prev_expiry.
+        prev_expiry (Union[dt.date, pd.Timestamp, None]): End of the first intensity period.
+        hazard_curve (Union[HazardCurve, None]): Intensities of the previous periods.
+
+        Returns:
+            Tuple[float, float]: Dirty price and d price / d intensity.
+        """
+        prob, dprob = self.survival_probabilities(intensity, prev_intensity, prev_expiry, hazard_curve)
+        price = self.recovery_first_period + np.dot(self.survival_weights, prob)
+        return float(price), float(np.dot(self.survival_weights, dprob))
+
+    def price_from_hazard_curve(self, hazard_curve: HazardCurve) -> float:
+        """
+        Dirty price for a piecewise constant intensity, from the cumulative hazard of the curve.
+
+        Parameters:
+        hazard_curve (HazardCurve): Hazard curve with the same reference date of the bond.
+
+        Returns:
+            float: Dirty price of the bond.
+        """
+        prob = np.exp(-hazard_curve.cumulative_hazard_from_times(self.times))
+        return float(self.recovery_first_period + np.dot(self.survival_weights, prob))
+
+    def price_from_z_spread(self, z_spread: float) -> Tuple[float, float]:
+        """
+        Dirty price from the Z-spread and its derivative with respect to the Z-spread.
+
+        Parameters:
+        z_spread (float): Z-spread.
+
+        Returns:
+            Tuple[float, float]: Dirty price and d price / d z_spread.
+        """
+        spread_discounts = np.exp(-z_spread * self.times)
+        price = np.dot(self.discounted_cash_flows, spread_discounts)
+        return float(price), float(-np.dot(self.discounted_cash_flows, self.times * spread_discounts))
+
+    def node_sensitivities(self, prob: np.ndarray, with_recovery: bool = True) -> np.ndarray:
+        """
+        Adjoint sweep of the price to the node discount factors of the curve, for given survival probabilities.
+
+        Parameters:
+        prob (np.ndarray): Survival probabilities (or spread discount factors) at the payment dates.
+        with_recovery (bool): Whether the recovery leg enters the price (False for Z-spread pricing).
+
+        Returns:
+            np.ndarray: Sensitivities of the price to the node discount factors.
+        """
+        discounts_bar = self.cash_flows.values * prob
+        if with_recovery:
+            prob_prev = np.concatenate(([1.0], prob[:-1]))
+            discounts_bar = discounts_bar + self.recovery_rate * self.notional * (prob_prev - prob)
+        return self.curve.df_adjoint(self.cash_flows.index, discounts_bar)
+
+    def calibrate_intensity(
+        self,
+        dirty_price: float,
+        prev_intensity: float = 0.0,
+        prev_expiry: Union[dt.date, pd.Timestamp, None] = None,
+        x0: float = 0.02,
+        hazard_curve: Union[HazardCurve, None] = None,
+    ) -> float:
+        """
+        Intensity (after prev_expiry or after the last node of hazard_curve, if given) matching the dirty
+        price, by Newton iteration.
+
+        Parameters:
+        dirty_price (float): Market dirty price.
+        prev_intensity (float): Intensity up to prev_expiry.
+        prev_expiry (Union[dt.date, pd.Timestamp, None]): End of the first intensity period.
+        x0 (float): Initial guess.
+        hazard_curve (Union[HazardCurve, None]): Intensities of the previous periods.
+
+        Returns:
+            float: Calibrated intensity.
+        """
+        def residual(intensity):
+            price, price_intensity = self.price_from_intensity(intensity, prev_intensity, prev_expiry, hazard_curve)
+            return price - dirty_price, price_intensity
+
+        return _newton(residual, x0)
+
+    def calibrate_z_spread(self, dirty_price: float, x0: float = 0.02) -> float:
+        """
+        Z-spread matching the dirty price, by Newton iteration.
+
+        Parameters:
+        dirty_price (float): Market dirty price.
+        x0 (float): Initial guess.
+
+        Returns:
+            float: Calibrated Z-spread.
+        """
+        def residual(z_spread):
+            price, price_z_spread = self.price_from_z_spread(z_spread)
+            return price - dirty_price, price_z_spread
+
+        return _newton(residual, x0)
+
+
 def defaultable_bond_dirty_price_from_intensity(
     ref_date: Union[dt.date, pd.Timestamp],
     expiry: Union[dt.date, pd.Timestamp],
@@ -64,9 +295,10 @@ def defaultable_bond_dirty_price_from_intensity(
     coupon_freq: int,
     recovery_rate: float,
     intensity: Union[float, pd.Series],
-    discount_factors: pd.Series,
+    discount_factors: Union[pd.Series, DiscountCurve],
     notional: float = 1.0,
-) -> float:
+    compute_node_sensitivities: bool = False,
+) -> Union[float, Tuple[float, np.ndarray, float]]:
     """
     Calculate the dirty price of a defaultable bond neglecting the recovery of the coupon payments.
 
@@ -78,38 +310,24 @@ def defaultable_bond_dirty_price_from_intensity(
     recovery_rate (float): Recovery rate.
     intensity (Union[float, pd.Series]): Intensity, can be the average intensity (float) or a
         piecewise constant function of time (pd.Series).
-    discount_factors (pd.Series): Discount factors.
+    discount_factors (Union[pd.Series, DiscountCurve]): Discount factors indexed by date or discount curve.
     notional (float): Notional amount.
+    compute_node_sensitivities (bool): Flag to also return, with an adjoint (reverse-mode) sweep, the
+        sensitivities of the price to the node discount factors of the curve and to the intensity.
 
     Returns:
         float: Dirty price of the bond.
+        If compute_node_sensitivities, the tuple (price, node sensitivities, d price / d intensity).
     """
 
-    cash_flow = bond_cash_flows(ref_date, expiry, coupon_rate, coupon_freq, notional)
+    bond = DefaultableBond(ref_date, expiry, coupon_rate, coupon_freq, recovery_rate, discount_factors, notional)
+    price, price_intensity = bond.price_from_intensity(intensity)
 
-    yfrac = [
-        year_frac_act_x(ref_date, d, 365)
-        for d in cash_flow.index
-    ]
-    
-    discounts = [
-        get_discount_factor_by_zero_rates_linear_interp(
-            ref_date,
-            d,
-            discount_factors.index,
-            discount_factors.values
-        )
-        for d in cash_flow.index
-    ]
-
-    prob = [1.0] + [math.exp(-intensity * yf) for yf in yfrac]
-
-    price = sum(
-        cash_flow.values[i] * discounts[i] * prob[i+1] + recovery_rate * discounts[i] * (prob[i] - prob[i+1]) * notional
-        for i in range(len(discounts))
-    )
+    if not compute_node_sensitivities:
+        return price
 
-    return price
+    prob, _ = bond.survival_probabilities(intensity)
+    return price, bond.node_sensitivities(prob), price_intensity
 
 
 def defaultable_bond_dirty_price_from_z_spread(
@@ -118,9 +336,10 @@ def defaultable_bond_dirty_price_from_z_spread(
     coupon_rate: float,
     coupon_freq: int,
     z_spread: float,
-    discount_factors: pd.Series,
+    discount_factors: Union[pd.Series, DiscountCurve],
     notional: float = 1.0,
-) -> float:
+    compute_node_sensitivities: bool = False,
+) -> Union[float, Tuple[float, np.ndarray, float]]:
     """
     Calculate the dirty price of a defaultable bond from the Z-spread.
 
@@ -130,39 +349,24 @@ def defaultable_bond_dirty_price_from_z_spread(
     coupon_rate (float): Coupon rate.
     coupon_freq (int): Coupon frequency in payments a years.
     z_spread (float): Z-spread.
-    discount_factors (pd.Series): Discount factors.
+    discount_factors (Union[pd.Series, DiscountCurve]): Discount factors indexed by date or discount curve.
     notional (float): Notional amount.
+    compute_node_sensitivities (bool): Flag to also return, with an adjoint (reverse-mode) sweep, the
+        sensitivities of the price to the node discount factors of the curve and to the Z-spread.
 
     Returns:
         float: Dirty price of the bond.
+        If compute_node_sensitivities, the tuple (price, node sensitivities, d price / d z_spread).
     """
 
-    cash_flow = bond_cash_flows(ref_date, expiry, coupon_rate, coupon_freq, notional)
-
-    yfrac = [
-        year_frac_act_x(ref_date, d, 365)
-        for d in cash_flow.index
-    ]
-    
-    discounts = [
-        get_discount_factor_by_zero_rates_linear_interp(
-            ref_date,
-            d,
-            discount_factors.index,
-            discount_factors.values
-        )
-        for d in cash_flow.index
-    ]
-
-    prob = [1.0] + [math.exp(-z_spread * yf) for yf in yfrac]
-
-    price = sum(
-        cash_flow.values[i] * discounts[i] * prob[i+1]
-        for i in range(len(discounts))
-    )
+    bond = DefaultableBond(ref_date, expiry, coupon_rate, coupon_freq, 0.0, discount_factors, notional)
+    price, price_z_spread = bond.price_from_z_spread(z_spread)
 
-    return price
+    if not compute_node_sensitivities:
+        return price
 
+    spread_discounts = np.exp(-z_spread * bond.times)
+    return price, bond.node_sensitivities(spread_discounts, with_recovery=False), price_z_spread
 
 
 def defaultable_bond_dirty_price_from_intensity_and_previous_lambda(
@@ -172,11 +376,12 @@ def defaultable_bond_dirty_price_from_intensity_and_previous_lambda(
     coupon_freq: int,
     recovery_rate: float,
     intensity: Union[float, pd.Series],
-    discount_factors: pd.Series,
+    discount_factors: Union[pd.Series, DiscountCurve],
     prev_intensity: float,
     prev_expiry: Union[dt.date, pd.Timestamp],
     notional: float = 1.0,
-) -> float:
+    compute_node_sensitivities: bool = False,
+) -> Union[float, Tuple[float, np.ndarray, float]]:
     """
     Calculate the dirty price of a defaultable bond neglecting the recovery of the coupon payments.
 
@@ -188,46 +393,233 @@ def defaultable_bond_dirty_price_from_intensity_and_previous_lambda(
     recovery_rate (float): Recovery rate.
     intensity (Union[float, pd.Series]): Intensity, can be the average intensity (float) or a
         piecewise constant function of time (pd.Series).
-    discount_factors (pd.Series): Discount factors.
+    discount_factors (Union[pd.Series, DiscountCurve]): Discount factors indexed by date or discount curve.
     notional (float): Notional amount.
+    compute_node_sensitivities (bool): Flag to also return, with an adjoint (reverse-mode) sweep, the
+        sensitivities of the price to the node discount factors of the curve and to the intensity
+        after prev_expiry.
 
     Returns:
         float: Dirty price of the bond.
+        If compute_node_sensitivities, the tuple (price, node sensitivities, d price / d intensity).
     """
 
-    # 1) Calcoliamo i flussi (cedole + rimborso)
-    cash_flow = bond_cash_flows(ref_date, expiry, coupon_rate, coupon_freq, notional)
+    bond = DefaultableBond(ref_date, expiry, coupon_rate, coupon_freq, recovery_rate, discount_factors, notional)
+    # Intensity pari a prev_intensity fino a prev_expiry, poi intensity
+    price, price_intensity = bond.price_from_intensity(intensity, prev_intensity, prev_expiry)
 
-    # 2) Creiamo la lista dei year fraction dei flussi (rispetto a ref_date)
-    yfrac = [year_frac_act_x(ref_date, d, 365) for d in cash_flow.index]
+    if not compute_node_sensitivities:
+        return price
 
-    # 3) Calcoliamo il year fraction da ref_date a prev_expiry
-    yfrac_prev_expiry = year_frac_act_x(ref_date, prev_expiry, 365)
+    prob, _ = bond.survival_probabilities(intensity, prev_intensity, prev_expiry)
+    return price, bond.node_sensitivities(prob), price_intensity
 
-    # 4) Calcoliamo i discount factor via interpolazione
-    discounts = [
-        get_discount_factor_by_zero_rates_linear_interp(
-            ref_date, d, discount_factors.index, discount_factors.values
-        )
-        for d in cash_flow.index
-    ]
 
-    # 5) Calcoliamo le probabilità di sopravvivenza a ciascuna data
-    prob = [1.0]  # la sopravvivenza iniziale è 1
-    for yf_current, flow_date in zip(yfrac, cash_flow.index):
-        if yf_current <= yfrac_prev_expiry:
-            # Tutto il periodo fino alla data del flusso è coperto da prev_intensity
-            p_surv = math.exp(-prev_intensity * yf_current)
-        else:
-            # Spezzetto: fino a prev_expiry si usa prev_intensity,
-            # poi, da prev_expiry a flow_date, si usa intensity.
-            yf_additional = year_frac_act_x(prev_expiry, flow_date, 365)
-            p_surv = math.exp( - (prev_intensity * yfrac_prev_expiry + intensity * yf_additional))
-        prob.append(p_surv)
-
-    price = sum(
-        cash_flow.values[i] * discounts[i] * prob[i+1] + recovery_rate * discounts[i] * (prob[i] - prob[i+1]) * notional
-        for i in range(len(discounts))
-    )
+@dataclass
+class CalibrationResult:
+    """
+    Outcome of a batched calibration: calibrated values with per-bond convergence flags and number of
+    Newton iterations (values of the bonds that did not converge are the last iterates).
+    """
+    values: np.ndarray
+    converged: np.ndarray
+    iterations: np.ndarray
+
+
+def _newton_vec(
+    func: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]],
+    x0: np.ndarray,
+    tol: float = 1e-12,
+    max_iter: int = 50,
+) -> CalibrationResult:
+    """
+    Newton-Raphson iteration run in parallel on independent scalar equations. Each equation stops
+    moving as soon as its own step is below the tolerance.
+
+    Parameters:
+        func (Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]): Function returning the values and the
+            exact derivatives of all the equations.
+        x0 (np.ndarray): Initial guesses.
+        tol (float): Absolute tolerance on the Newton step.
+        max_iter (int): Maximum number of iterations.
+
+    Returns:
+        CalibrationResult: Roots, convergence flags and iteration counts.
+    """
+    x = np.array(x0, dtype=float)
+    converged = np.zeros(x.shape, dtype=bool)
+    stopped = np.zeros(x.shape, dtype=bool)
+    iterations = np.zeros(x.shape, dtype=int)
+
+    for _ in range(max_iter):
+        active = ~stopped
+        if not np.any(active):
+            break
+        value, derivative = func(x)
+        # A zero or non-finite derivative (or value) stops the equation, which is reported as not converged
+        failed = active & ((derivative == 0) | ~np.isfinite(derivative) | ~np.isfinite(value))
+        step = np.zeros(x.shape)
+        moving = active & ~failed
+        step[moving] = value[moving] / derivative[moving]
+
+        x -= step
+        iterations += moving
+        converged |= moving & (np.abs(step) < tol)
+        stopped |= converged | failed
+
+    return CalibrationResult(x, converged, iterations)
+
+
+class BondBook:
+    """
+    Set of defaultable bonds stored in flat, ragged-array form (concatenated payment times and price
+    weights as in DefaultableBond, offset of each bond), so that the prices of all the bonds for given
+    intensities or Z-spreads are evaluated with np.add.reduceat and all of them are calibrated together.
+    """
 
-    return price
\ No newline at end of file
+    def __init__(
+        self,
+        ref_date: Union[dt.date, pd.Timestamp],
+        expiries: Iterable[Union[dt.date, pd.Timestamp]],
+        coupon_rates: Union[float, Iterable[float]],
+        coupon_freqs: Union[int, Iterable[int]],
+        recovery_rates: Union[float, Iterable[float]],
+        discount_factors: Union[pd.Series, DiscountCurve],
+        notionals: Union[float, Iterable[float]] = 1.0,
+    ):
+        """
+        Parameters:
+        ref_date (Union[dt.date, pd.Timestamp]): Reference date.
+        expiries (Iterable[Union[dt.date, pd.Timestamp]]): Bonds' expiry dates.
+        coupon_rates (Union[float, Iterable[float]]): Coupon rates.
+        coupon_freqs (Union[int, Iterable[int]]): Coupon frequencies in payments a years.
+        recovery_rates (Union[float, Iterable[float]]): Recovery rates.
+        discount_factors (Union[pd.Series, DiscountCurve]): Discount factors indexed by date or discount curve.
+        notionals (Union[float, Iterable[float]]): Notional amounts.
+        """
+        expiries = list(expiries)
+        n_bonds = len(expiries)
+        if n_bonds == 0:
+            raise ValueError("The book must contain at least one bond.")
+
+        def per_bond(x):
+            return np.broadcast_to(np.asarray(x), (n_bonds,))
+
+        coupon_rates, coupon_freqs = per_bond(coupon_rates), per_bond(coupon_freqs)
+        notionals = per_bond(notionals).astype(float)
+        recovery = per_bond(recovery_rates) * notionals
+
+        # Payment schedules (cached) and coupon accruals, as in bond_cash_flows
+        schedules = [payment_schedule(ref_date, expiry, int(freq)) for expiry, freq in zip(expiries, coupon_freqs)]
+        lengths = np.array([len(schedule) - 1 for schedule in schedules], dtype=int)
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        last_flows = self.offsets + lengths - 1
+        # Bond of each cash flow, to broadcast the per-bond parameters on the flat arrays
+        self.flow_bond = np.repeat(np.arange(n_bonds), lengths)
+
+        payment_dates = np.concatenate([schedule[1:] for schedule in schedules])
+        period_starts = np.concatenate([schedule[:-1] for schedule in schedules])
+        cash_flows = (notionals * coupon_rates)[self.flow_bond] * yearfrac_vec(period_starts, payment_dates, mod.EU_30_360)
+        cash_flows[last_flows] += notionals
+
+        # A single curve lookup for the cash flows of all the bonds
+        self.times = yearfrac_vec(ref_date, payment_dates, mod.ACT_365)
+        discounts = as_discount_curve(discount_factors).df(payment_dates)
+
+        # Price weights as in DefaultableBond, the last flow of each bond has no following period
+        next_discounts = np.append(discounts[1:], 0.0)
+        next_discounts[last_flows] = 0.0
+        flow_recovery = recovery[self.flow_bond]
+        self.survival_weights = (cash_flows - flow_recovery) * discounts + flow_recovery * next_discounts
+        self.recovery_first_period = recovery * discounts[self.offsets]
+        self.discounted_cash_flows = cash_flows * discounts
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def prices_from_intensity(self, intensities: Union[float, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Dirty prices of all the bonds for flat intensities and their derivatives with respect to them.
+
+        Parameters:
+        intensities (Union[float, np.ndarray]): Intensity of each bond.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Dirty prices and d price / d intensity.
+        """
+        intensities = np.broadcast_to(np.asarray(intensities, dtype=float), (len(self),))
+        prob = np.exp(-intensities[self.flow_bond] * self.times)
+        weighted_prob = self.survival_weights * prob
+
+        prices = self.recovery_first_period + np.add.reduceat(weighted_prob, self.offsets)
+        return prices, np.add.reduceat(-self.times * weighted_prob, self.offsets)
+
+    def prices_from_z_spread(self, z_spreads: Union[float, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Dirty prices of all the bonds from the Z-spreads and their derivatives with respect to them.
+
+        Parameters:
+        z_spreads (Union[float, np.ndarray]): Z-spread of each bond.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Dirty prices and d price / d z_spread.
+        """
+        z_spreads = np.broadcast_to(np.asarray(z_spreads, dtype=float), (len(self),))
+        discounted = self.discounted_cash_flows * np.exp(-z_spreads[self.flow_bond] * self.times)
+
+        prices = np.add.reduceat(discounted, self.offsets)
+        return prices, np.add.reduceat(-self.times * discounted, self.offsets)
+
+    def calibrate_intensity(
+        self,
+        dirty_prices: Union[float, np.ndarray],
+        x0: Union[float, np.ndarray] = 0.02,
+        tol: float = 1e-12,
+        max_iter: int = 50,
+    ) -> CalibrationResult:
+        """
+        Average intensities matching the dirty prices of all the bonds, by vectorized Newton iterations.
+
+        Parameters:
+        dirty_prices (Union[float, np.ndarray]): Market dirty prices.
+        x0 (Union[float, np.ndarray]): Initial guesses.
+        tol (float): Absolute tolerance on the Newton step.
+        max_iter (int): Maximum number of iterations.
+
+        Returns:
+            CalibrationResult: Intensities, convergence flags and iteration counts.
+        """
+        dirty_prices = np.broadcast_to(np.asarray(dirty_prices, dtype=float), (len(self),))
+
+        def residual(intensities):
+            prices, price_intensity = self.prices_from_intensity(intensities)
+            return prices - dirty_prices, price_intensity
+
+        return _newton_vec(residual, np.broadcast_to(x0, (len(self),)), tol, max_iter)
+
+    def calibrate_z_spread(
+        self,
+        dirty_prices: Union[float, np.ndarray],
+        x0: Union[float, np.ndarray] = 0.02,
+        tol: float = 1e-12,
+        max_iter: int = 50,
+    ) -> CalibrationResult:
+        """
+        Z-spreads matching the dirty prices of all the bonds, by vectorized Newton iterations.
+
+        Parameters:
+        dirty_prices (Union[float, np.ndarray]): Market dirty prices.
+        x0 (Union[float, np.ndarray]): Initial guesses.
+        tol (float): Absolute tolerance on the Newton step.
+        max_iter (int): Maximum number of iterations.
+
+        Returns:
+            CalibrationResult: Z-spreads, convergence flags and iteration counts.
+        """
+        dirty_prices = np.broadcast_to(np.asarray(dirty_prices, dtype=float), (len(self),))
+
+        def residual(z_spreads):
+            prices, price_z_spread = self.prices_from_z_spread(z_spreads)
+            return prices - dirty_prices, price_z_spread
+
+        return _newton_vec(residual, np.broadcast_to(x0, (len(self),)), tol, max_iter)
@@ -0,0 +1,131 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Piecewise constant hazard rate term structure
+"""
+
+import numpy as np
+import pandas as pd
+import datetime as dt
+from typing import Iterable, Union
+from yearfrac import yearfrac_vec, to_datetime64, mod
+
+
+class HazardCurve:
+    """
+    Piecewise constant default intensity: intensities[k] holds between the node k-1 (the reference date
+    for k = 0) and the node k, the last one is extrapolated flat.
+
+    The cumulative hazard at the nodes is stored, so the survival probability of any date is obtained
+    with a binary search on the node times and a single exponential:
+    S(t) = exp(-(H(t_{k-1}) + intensities[k] * (t - t_{k-1}))).
+    """
+
+    def __init__(
+        self,
+        ref_date: Union[dt.date, pd.Timestamp],
+        dates: Iterable[Union[dt.date, pd.Timestamp]],
+        intensities: Iterable[float],
+    ):
+        """
+        Parameters:
+            ref_date (Union[dt.date, pd.Timestamp]): Reference date.
+            dates (Iterable[Union[dt.date, pd.Timestamp]]): Node dates, sorted, after the reference date.
+            intensities (Iterable[float]): Intensity of each period, ending at the corresponding node.
+        """
+        self.ref_date = ref_date
+        self.dates = to_datetime64(list(dates))
+        self.intensities = np.asarray(intensities, dtype=float)
+
+        if self.dates.shape != self.intensities.shape or len(self.dates) == 0:
+            raise ValueError("Dates and intensities must be non-empty and of the same length.")
+
+        # Node times (ACT/365), start of each period and cumulative hazard at the start of each period
+        self.times = np.atleast_1d(yearfrac_vec(ref_date, self.dates, mod.ACT_365))
+        if np.any(np.diff(self.times) <= 0) or self.times[0] <= 0:
+            raise ValueError("Node dates must be sorted and after the reference date.")
+        self.period_starts = np.concatenate(([0.0], self.times[:-1]))
+        self.cumulative_hazard_nodes = np.cumsum(self.intensities * (self.times - self.period_starts))
+        self.period_start_hazard = np.concatenate(([0.0], self.cumulative_hazard_nodes[:-1]))
+
+    @classmethod
+    def bootstrap(cls, bonds: Iterable, dirty_prices: Iterable[float]) -> "HazardCurve":
+        """
+        Sequential bootstrap from a strip of bonds sorted by expiry: the intensity of each period is the
+        one that reprices the bond expiring at its end, given the intensities already bootstrapped.
+
+        Parameters:
+            bonds (Iterable[DefaultableBond]): Bonds with increasing expiries and the same reference date.
+            dirty_prices (Iterable[float]): Market dirty prices of the bonds.
+
+        Returns:
+            HazardCurve: The bootstrapped hazard curve, with a node at each bond expiry.
+        """
+        curve = None
+        for bond, dirty_price in zip(bonds, dirty_prices):
+            intensity = bond.calibrate_intensity(dirty_price, hazard_curve=curve)
+            if curve is None:
+                curve = cls(bond.ref_date, [bond.expiry], [intensity])
+            else:
+                curve = curve.extend(bond.expiry, intensity)
+
+        if curve is None:
+            raise ValueError("At least one bond is needed to bootstrap the hazard curve.")
+
+        return curve
+
+    def extend(self, date: Union[dt.date, pd.Timestamp], intensity: float) -> "HazardCurve":
+        """
+        New curve with an additional node after the last one.
+
+        Parameters:
+            date (Union[dt.date, pd.Timestamp]): New node date.
+            intensity (float): Intensity between the last node and the new one.
+
+        Returns:
+            HazardCurve: The extended curve.
+        """
+        return HazardCurve(
+            self.ref_date,
+            np.append(self.dates, to_datetime64(date)),
+            np.append(self.intensities, intensity),
+        )
+
+    def cumulative_hazard_from_times(self, times: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Cumulative hazard (integral of the intensity from the reference date) at the given ACT/365 times.
+
+        Parameters:
+            times (Union[float, np.ndarray]): Year fractions from the reference date.
+
+        Returns:
+            Union[float, np.ndarray]: Cumulative hazard, with the same shape as the input.
+        """
+        times = np.asarray(times, dtype=float)
+        # Period containing each time (t_{k-1}, t_k], the last one is extrapolated flat
+        k = np.minimum(np.searchsorted(self.times, times, side="left"), len(self.times) - 1)
+        hazard = self.period_start_hazard[k] + self.intensities[k] * (times - self.period_starts[k])
+        return float(hazard) if hazard.ndim == 0 else hazard
+
+    def cumulative_hazard(self, dates) -> Union[float, np.ndarray]:
+        """
+        Cumulative hazard at the given dates.
+
+        Parameters:
+            dates: A single date or an array-like of dates.
+
+        Returns:
+            Union[float, np.ndarray]: Cumulative hazard, with the same shape as the input.
+        """
+        return self.cumulative_hazard_from_times(yearfrac_vec(self.ref_date, dates, mod.ACT_365))
+
+    def survival(self, dates) -> Union[float, np.ndarray]:
+        """
+        Survival probabilities at the given dates.
+
+        Parameters:
+            dates: A single date or an array-like of dates.
+
+        Returns:
+            Union[float, np.ndarray]: Survival probabilities, with the same shape as the input.
+        """
+        return np.exp(-self.cumulative_hazard(dates))
@@ -1,94 +1,304 @@
+import numpy as np
 import pandas as pd
+import datetime as dt
+import fnmatch
+import json
 import os
-from dataclasses import dataclass
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional
 
-def find_file(filename, search_path):
+
+# Snapshots of the parsed workbooks are stored in this folder, next to the workbook
+SNAPSHOT_DIR = "__mktcache__"
+# Bump when the content of the snapshot changes, older snapshots are then parsed again
+SNAPSHOT_VERSION = 2
+
+
+@dataclass
+class DatesSet:
+    settle: str
+    depos: pd.DataFrame
+    future: pd.DataFrame
+    swap: pd.DataFrame
+
+
+@dataclass
+class RatesSet:
+    depos: pd.DataFrame
+    future: pd.DataFrame
+    swap: pd.DataFrame
+
+
+@dataclass(frozen=True)
+class WorkbookLayout:
     """
-    Cerca il file 'filename' all'interno della directory 'search_path' e delle sue sottocartelle.
-    Restituisce il percorso completo se trovato, altrimenti None.
+    Position of the market data in the first sheet of a workbook, as Excel cell ranges (e.g. "H11:I16").
+
+    Row 1 is the header of the sheet and cannot hold data. The ranges of the dates have one column
+    (two for the futures: settle and expiry), the ranges of the rates have two columns (Bid and Ask,
+    the Mid is their mean). Dates and rates of depos and futures must have the same number of rows.
     """
-    for root, dirs, files in os.walk(search_path):
-        if filename in files:
-            return os.path.join(root, filename)
-    return None
+    settle: str = "E8"
+    depos_dates: str = "D11:D16"
+    future_dates: str = "Q12:R20"
+    swap_dates: str = "D39:D55"
+    depos_rates: str = "H11:I16"
+    future_rates: str = "H28:I36"
+    swap_rates: str = "H39:I55"
+
+    def ranges(self):
+        """
+        Positions (first_row, last_row, first_col, last_col) of all the ranges, 0-based and included.
+        """
+        return {name: _range_position(ref) for name, ref in asdict(self).items()}
+
+    def validate(self):
+        """
+        Check the ranges of the layout, raising a ValueError if they are malformed or inconsistent.
+        """
+        ranges = self.ranges()
+        widths = {
+            "settle": 1, "depos_dates": 1, "future_dates": 2, "swap_dates": 1,
+            "depos_rates": 2, "future_rates": 2, "swap_rates": 2,
+        }
+        for name, (first_row, last_row, first_col, last_col) in ranges.items():
+            if first_row == 0:
+                raise ValueError(f"Error: the range {name} ({getattr(self, name)}) overlaps the header row!")
+            if last_col - first_col + 1 != widths[name]:
+                raise ValueError(f"Error: the range {name} ({getattr(self, name)}) must have {widths[name]} column(s)!")
+        if ranges["settle"][0] != ranges["settle"][1]:
+            raise ValueError(f"Error: the settle ({self.settle}) must be a single cell!")
+        for group in ("depos", "future"):
+            n_dates = ranges[f"{group}_dates"][1] - ranges[f"{group}_dates"][0]
+            n_rates = ranges[f"{group}_rates"][1] - ranges[f"{group}_rates"][0]
+            if n_dates != n_rates:
+                raise ValueError(f"Error: the {group} dates and rates must have the same number of rows!")
+
+    def key(self):
+        """
+        Text identifying the layout, stored in the snapshots.
+        """
+        return json.dumps(asdict(self), sort_keys=True)
+
+
+# Layout of MktData_CurveBootstrap.xls
+DEFAULT_LAYOUT = WorkbookLayout()
+
 
-def readExcelData(file_name="MktData_CurveBootstrap.xls"):
+def readExcelData(file_name="MktData_CurveBootstrap.xls", use_snapshot=True, layout=DEFAULT_LAYOUT):
     """
     Load market data from an Excel file and return structured data classes.
 
+    The file is looked up in the current directory and then in the folder of this module, where the
+    workbook of the assignment is stored: no other folder is searched.
+
+    The parsed workbook is stored in a binary snapshot (see SNAPSHOT_DIR) keyed by the path and the
+    modification time of the file: later runs load the snapshot and skip the Excel parsing, which is
+    done again only if the workbook changes.
+
+    Parameters:
+        file_name (str): Name of the Excel file, relative to the current directory, or its full path.
+        use_snapshot (bool): Whether to read and write the binary snapshot.
+        layout (WorkbookLayout): Position of the market data in the workbook.
+
     Returns:
         dates_set (DatesSet): Containing settle date, depos, future, and swap dates.
         rates_set (RatesSet): Containing depos, future, and swap rates.
     """
-    # Get the current working directory
-    current_directory = os.getcwd()
-    
-    # Search for the file recursively in the current directory and subdirectories
-    file_path = find_file(file_name, current_directory)
-    
+    candidates = [
+        os.path.join(os.getcwd(), file_name),
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name),
+    ]
+    file_path = next((path for path in candidates if os.path.exists(path)), None)
+
     # Check if the file was found
     if file_path is None:
-        raise FileNotFoundError(f"Error: The file '{file_name}' was not found in the current directory or its subdirectories!")
-    
-    # Load the Excel file
-    df = pd.read_excel(file_path, engine="xlrd")
+        raise FileNotFoundError(f"Error: The file '{file_name}' was not found in the current directory or in {candidates[1]}!")
+
+    dates_set, rates_set = load_workbook(file_path, layout, use_snapshot)
+
     print("File found and loaded successfully!")
-    
+
+    return dates_set, rates_set
+
+
+def load_workbook(file_path, layout=DEFAULT_LAYOUT, use_snapshot=True):
+    """
+    Load the market data of the workbook at an explicit path, without searching for the file.
+
+    Parameters:
+        file_path (str): Path of the Excel file.
+        layout (WorkbookLayout): Position of the market data in the workbook.
+        use_snapshot (bool): Whether to read and write the binary snapshot.
+
+    Returns:
+        dates_set (DatesSet): Containing settle date, depos, future, and swap dates.
+        rates_set (RatesSet): Containing depos, future, and swap rates.
+    """
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"Error: The file '{file_path}' does not exist!")
+    layout.validate()
+
+    dates_set, rates_set = None, None
+    if use_snapshot:
+        dates_set, rates_set = _load_snapshot(file_path, layout)
+
+    if dates_set is None:
+        dates_set, rates_set = _parse_workbook(file_path, layout)
+        if use_snapshot:
+            _save_snapshot(file_path, layout, dates_set, rates_set)
+
+    return dates_set, rates_set
+
+
+def load_workbooks(directory, pattern="*.xls", layout=DEFAULT_LAYOUT, use_snapshot=True):
+    """
+    Load all the workbooks of a folder with the same layout. Only the folder itself is listed, its
+    subfolders are not searched.
+
+    Parameters:
+        directory (str): Folder of the workbooks.
+        pattern (str): Shell pattern of the names of the workbooks.
+        layout (WorkbookLayout): Position of the market data in the workbooks.
+        use_snapshot (bool): Whether to read and write the binary snapshots.
+
+    Returns:
+        dict: Name of each workbook -> (dates_set, rates_set), sorted by name.
+    """
+    return {
+        path.name: load_workbook(path.path, layout, use_snapshot)
+        for path in _list_workbooks(directory, pattern)
+    }
+
+
+@dataclass
+class IngestResult:
+    """
+    Outcome of the loading of a workbook by ingest_workbooks.
+    """
+    file_path: str
+    seconds: float
+    dates_set: Optional[DatesSet] = None
+    rates_set: Optional[RatesSet] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def ingest_workbooks(paths, pattern="*.xls", layout=DEFAULT_LAYOUT, use_snapshot=True,
+                     return_data=True, max_workers=None):
+    """
+    Load many workbooks in parallel with a pool of processes. A workbook that cannot be loaded does
+    not stop the others: its error is reported in the result.
+
+    With return_data=False the workers only write the binary snapshots (use_snapshot must be True) and
+    send back nothing but the timings: back-filling a history this way is not slowed down by moving
+    the DataFrames between processes, and the snapshots are then loaded quickly by load_workbook.
+
+    Parameters:
+        paths (Union[str, List[str]]): Folder of the workbooks (not searched recursively) or list of paths.
+        pattern (str): Shell pattern of the names of the workbooks, if paths is a folder.
+        layout (WorkbookLayout): Position of the market data in the workbooks.
+        use_snapshot (bool): Whether to read and write the binary snapshots.
+        return_data (bool): Whether to return the DatesSet and RatesSet of each workbook.
+        max_workers (int): Number of processes (default: number of CPUs); 1 loads in this process.
+
+    Returns:
+        List[IngestResult]: Result of each workbook, in the order of the paths.
+    """
+    if not return_data and not use_snapshot:
+        raise ValueError("Error: with return_data=False the snapshots must be enabled!")
+    layout.validate()
+
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [entry.path for entry in _list_workbooks(paths, pattern)]
+    tasks = [(os.fspath(path), layout, use_snapshot, return_data) for path in paths]
+
+    max_workers = min(max_workers or os.cpu_count() or 1, max(len(tasks), 1))
+    if max_workers == 1:
+        return [_ingest_workbook(task) for task in tasks]
+
+    # Few tasks per message: workbooks are small and the pool overhead is per message
+    chunksize = max(1, len(tasks) // (4 * max_workers))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_ingest_workbook, tasks, chunksize=chunksize))
+
+
+def _ingest_workbook(task):
+    """
+    Load a workbook in a worker of ingest_workbooks, catching any error.
+    """
+    file_path, layout, use_snapshot, return_data = task
+    start = time.perf_counter()
+    try:
+        dates_set, rates_set = load_workbook(file_path, layout, use_snapshot)
+    except Exception as e:
+        return IngestResult(file_path, time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+
+    result = IngestResult(file_path, time.perf_counter() - start)
+    if return_data:
+        result.dates_set, result.rates_set = dates_set, rates_set
+    return result
+
+
+def _list_workbooks(directory, pattern):
+    """
+    Files of the folder whose name matches the pattern, sorted by name.
+    """
+    with os.scandir(directory) as entries:
+        paths = [entry for entry in entries if entry.is_file() and fnmatch.fnmatch(entry.name, pattern)]
+    return sorted(paths, key=lambda entry: entry.name)
+
+
+def _parse_workbook(file_path, layout=DEFAULT_LAYOUT):
+    """
+    Parse the Excel workbook at file_path into the DatesSet and RatesSet data classes.
+    """
+    # Load the Excel file (row 1 is the header: the cell in Excel row r is in row r - 2 of df)
+    df = pd.read_excel(file_path, engine="xlrd")
+
+    def cells(name):
+        first_row, last_row, first_col, last_col = ranges[name]
+        if last_row - 1 >= len(df) or last_col >= len(df.columns):
+            raise ValueError(f"Error: the range {name} ({getattr(layout, name)}) is outside the sheet of '{file_path}'!")
+        return df.iloc[first_row - 1:last_row, first_col:last_col + 1].copy()
+
+    ranges = layout.ranges()
+
     # Extract settlement date
-    row_num = 7
-    column_name = df.columns[4]
-    settlement_date = df.at[row_num - 1, column_name]
-    
-    # Extract Depo dates
-    start_row, end_row = 10, 15
-    column_name = df.columns[3]
-    Depo_dates = df.loc[start_row - 1:end_row - 1, column_name].to_frame(name="Settle Dates")
-    
-    # Extract Future dates
-    start_row, end_row = 11, 19
-    column1, column2 = df.columns[16], df.columns[17]
-    Future_dates = df.loc[start_row - 1:end_row - 1, [column1, column2]]
+    settlement_date = cells("settle").iat[0, 0]
+
+    # Extract dates
+    Depo_dates = cells("depos_dates")
+    Depo_dates.columns = ["Settle Dates"]
+    Future_dates = cells("future_dates")
     Future_dates.columns = ["Settle", "Expiry"]
-    
-    # Extract Swap dates
-    start_row, end_row = 38, 55
-    column_name = df.columns[3]
-    Swap_dates = df.loc[start_row - 1:end_row - 1, column_name].to_frame(name="Swap Dates")
-    
-    # Extract Depo rates
-    start_row, end_row = 10, 15
-    column1, column2 = df.columns[7], df.columns[8]
-    depo_rate = df.loc[start_row - 1:end_row - 1, [column1, column2]]
-    depo_rate["Mean"] = depo_rate.mean(axis=1)
-    depo_rate.columns = ["Bid", "Ask", "Mid"]
-    
-    # Extract Future rates
-    start_row, end_row = 27, 35
-    column1, column2 = df.columns[7], df.columns[8]
-    future_rate = df.loc[start_row - 1:end_row - 1, [column1, column2]]
-    future_rate["Mean"] = future_rate.mean(axis=1)
-    future_rate.columns = ["Bid", "Ask", "Mid"]
-    
-    # Extract Swap rates
-    start_row, end_row = 38, 54
-    column1, column2 = df.columns[7], df.columns[8]
-    swap_rate = df.loc[start_row - 1:end_row - 1, [column1, column2]]
-    swap_rate["Mean"] = swap_rate.mean(axis=1)
-    swap_rate.columns = ["Bid", "Ask", "Mid"]
-    
-    # Define dataclasses
-    @dataclass
-    class DatesSet:
-        settle: str
-        depos: pd.DataFrame
-        future: pd.DataFrame
-        swap: pd.DataFrame
-
-    @dataclass
-    class RatesSet:
-        depos: pd.DataFrame
-        future: pd.DataFrame
-        swap: pd.DataFrame
+    Swap_dates = cells("swap_dates")
+    Swap_dates.columns = ["Swap Dates"]
+
+    # Extract rates, the Mid is the mean of Bid and Ask
+    rates = {}
+    for group in ("depos", "future", "swap"):
+        rate = cells(f"{group}_rates")
+        rate["Mean"] = rate.mean(axis=1)
+        rate.columns = ["Bid", "Ask", "Mid"]
+        rates[group] = rate
+
+    dates = {
+        "settle": [settlement_date], "depos_dates": Depo_dates.to_numpy().ravel(),
+        "future_dates": Future_dates.to_numpy().ravel(), "swap_dates": Swap_dates.to_numpy().ravel(),
+    }
+    for name, values in dates.items():
+        if not all(isinstance(value, (dt.date, np.datetime64)) for value in values):
+            raise ValueError(f"Error: the range {name} ({getattr(layout, name)}) of '{file_path}' does not contain only dates!")
+    for group, rate in rates.items():
+        if pd.to_numeric(pd.Series(rate.to_numpy().ravel()), errors="coerce").isna().any():
+            raise ValueError(f"Error: the range {group}_rates ({getattr(layout, group + '_rates')}) of '{file_path}' does not contain only numbers!")
 
     # Create objects for structured data
     dates_set = DatesSet(
@@ -99,9 +309,128 @@ def readExcelData(file_name="MktData_CurveBootstrap.xls"):
     )
 
     rates_set = RatesSet(
-        depos=depo_rate,
-        future=future_rate,
-        swap=swap_rate
+        depos=rates["depos"],
+        future=rates["future"],
+        swap=rates["swap"]
+    )
+
+    return dates_set, rates_set
+
+
+def _range_position(ref):
+    """
+    Position (first_row, last_row, first_col, last_col), 0-based and included, of an Excel range such
+    as "H11:I16" or of a single cell such as "E8".
+    """
+    match = re.fullmatch(r"([A-Z]+)([1-9][0-9]*)(?::([A-Z]+)([1-9][0-9]*))?", ref.strip().upper())
+    if match is None:
+        raise ValueError(f"Error: '{ref}' is not a valid Excel range!")
+    first_col, first_row, last_col, last_row = match.groups()
+    if last_col is None:
+        last_col, last_row = first_col, first_row
+
+    def column(letters):
+        index = 0
+        for letter in letters:
+            index = index * 26 + ord(letter) - ord("A") + 1
+        return index - 1
+
+    position = (int(first_row) - 1, int(last_row) - 1, column(first_col), column(last_col))
+    if position[1] < position[0] or position[3] < position[2]:
+        raise ValueError(f"Error: the range '{ref}' must go from the top-left to the bottom-right cell!")
+    return position
+
+
+def _snapshot_path(file_path):
+    """
+    Path of the snapshot of a workbook.
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, SNAPSHOT_DIR, name + ".npz")
+
+
+def _snapshot_key(file_path):
+    """
+    Key identifying the content of a workbook: absolute path and modification time (ns).
+    """
+    return os.path.abspath(file_path), os.stat(file_path).st_mtime_ns
+
+
+def _save_snapshot(file_path, layout, dates_set, rates_set):
+    """
+    Store the parsed market data as columnar NumPy arrays (dates as datetime64, Bid/Ask/Mid as float
+    matrices) in an .npz file. Failures (e.g. a read-only folder) are ignored: the workbook
+    is then simply parsed again at the next run.
+    """
+    path, mtime_ns = _snapshot_key(file_path)
+    arrays = {
+        "version": np.array(SNAPSHOT_VERSION),
+        "source_path": np.array(path),
+        "source_mtime_ns": np.array(mtime_ns, dtype=np.int64),
+        "layout": np.array(layout.key()),
+        "settle": np.array(dates_set.settle, dtype="datetime64[us]"),
+    }
+    for name in ("depos", "future", "swap"):
+        dates, rates = getattr(dates_set, name), getattr(rates_set, name)
+        arrays[f"dates_{name}"] = dates.to_numpy().astype("datetime64[us]")
+        arrays[f"dates_{name}_index"] = dates.index.to_numpy(dtype=np.int64)
+        arrays[f"rates_{name}"] = rates.to_numpy(dtype=float)
+        arrays[f"rates_{name}_index"] = rates.index.to_numpy(dtype=np.int64)
+
+    snapshot_path = _snapshot_path(file_path)
+    tmp_path = snapshot_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        # Atomic replacement, a concurrent run never reads a partially written snapshot
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        pass
+
+
+def _load_snapshot(file_path, layout):
+    """
+    Load the market data from the snapshot of the workbook, if it exists and it matches the current
+    path and modification time of the file and the layout. Returns (None, None) otherwise.
+    """
+    snapshot_path = _snapshot_path(file_path)
+    if not os.path.exists(snapshot_path):
+        return None, None
+
+    path, mtime_ns = _snapshot_key(file_path)
+    try:
+        with np.load(snapshot_path, allow_pickle=False) as data:
+            if (
+                int(data["version"]) != SNAPSHOT_VERSION
+                or str(data["source_path"]) != path
+                or int(data["source_mtime_ns"]) != mtime_ns
+                or str(data["layout"]) != layout.key()
+            ):
+                return None, None
+            arrays = {key: data[key] for key in data.files}
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+    # Same layout and dtypes of the frames built by _parse_workbook (object columns with datetime and
+    # float values, row labels of the workbook)
+    def frame(values, index, columns):
+        if values.dtype.kind == "M":
+            values = values.astype("datetime64[us]")
+        values = values.reshape(len(index), len(columns)).astype(object)
+        return pd.DataFrame(values, index=pd.Index(index), columns=columns, dtype=object)
+
+    dates_set = DatesSet(
+        settle=arrays["settle"].astype("datetime64[us]").item(),
+        depos=frame(arrays["dates_depos"], arrays["dates_depos_index"], ["Settle Dates"]),
+        future=frame(arrays["dates_future"], arrays["dates_future_index"], ["Settle", "Expiry"]),
+        swap=frame(arrays["dates_swap"], arrays["dates_swap_index"], ["Swap Dates"]),
+    )
+    rates_set = RatesSet(
+        **{
+            name: frame(arrays[f"rates_{name}"], arrays[f"rates_{name}_index"], ["Bid", "Ask", "Mid"])
+            for name in ("depos", "future", "swap")
+        }
     )
 
     return dates_set, rates_set
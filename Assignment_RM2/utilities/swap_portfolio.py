@@ -0,0 +1,125 @@
+"""
+Mathematical Engineering - Financial Engineering, FY 2024-2025
+Risk Management - Portfolio of interest rate swaps priced in a single vectorized pass
+"""
+
+import numpy as np
+import pandas as pd
+import datetime as dt
+from typing import Iterable, List, Tuple, Union
+from yearfrac import yearfrac_vec, to_datetime64, mod
+from discount_curve import DiscountCurve, as_discount_curve
+from ex1_utilities import SwapType
+
+
+class SwapPortfolio:
+    """
+    Book of plain vanilla swaps stored in flat, ragged-array form.
+
+    The fixed leg payment dates of all the trades are concatenated in a single array, together with
+    their EU 30/360 accruals; offsets[k] is the position of the first payment of trade k. Par rates,
+    MtM and BPV of every trade are then obtained with one curve lookup on all the dates and a
+    segmented sum (np.add.reduceat), with the same conventions as swap_par_rate and swap_mtm.
+    """
+
+    def __init__(
+        self,
+        fixed_leg_schedules: Iterable[List[dt.datetime]],
+        start_dates: Union[dt.date, pd.Timestamp, Iterable[dt.date]],
+        swap_rates: Union[float, Iterable[float]] = np.nan,
+        notionals: Union[float, Iterable[float]] = 1.0,
+        swap_types: Union[SwapType, Iterable[SwapType]] = SwapType.PAYER,
+    ):
+        """
+        Parameters:
+            fixed_leg_schedules (Iterable[List[dt.datetime]]): Fixed leg payment dates of each trade.
+            start_dates (Union[dt.date, pd.Timestamp, Iterable[dt.date]]): Start date of each trade, i.e.
+                accrual start of its first fixed coupon and start of its floating leg. A single date is
+                used for all the trades (spot starting swaps valued at that date).
+            swap_rates (Union[float, Iterable[float]]): Fixed rate of each trade, needed only for the MtM.
+            notionals (Union[float, Iterable[float]]): Notional of each trade.
+            swap_types (Union[SwapType, Iterable[SwapType]]): Swap type (payer or receiver) of each trade.
+        """
+        schedules = [to_datetime64(schedule) for schedule in fixed_leg_schedules]
+        n_trades = len(schedules)
+        lengths = np.array([len(schedule) for schedule in schedules], dtype=int)
+
+        # np.add.reduceat needs a non-empty segment for every trade
+        if n_trades == 0 or np.any(lengths == 0):
+            raise ValueError("Every trade must have at least one fixed leg payment date.")
+
+        self.payment_dates = np.concatenate(schedules)
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        self.last_payments = self.offsets + lengths - 1
+
+        self.start_dates = np.broadcast_to(to_datetime64(start_dates), (n_trades,)).copy()
+        self.swap_rates = np.broadcast_to(np.asarray(swap_rates, dtype=float), (n_trades,)).copy()
+        self.notionals = np.broadcast_to(np.asarray(notionals, dtype=float), (n_trades,)).copy()
+
+        # +1 for receivers, -1 for payers as in swap_mtm
+        if isinstance(swap_types, SwapType):
+            swap_types = [swap_types] * n_trades
+        swap_types = list(swap_types)
+        if len(swap_types) != n_trades or not all(isinstance(swap_type, SwapType) for swap_type in swap_types):
+            raise ValueError("Unknown swap type.")
+        self.multipliers = np.array([1.0 if swap_type is SwapType.RECEIVER else -1.0 for swap_type in swap_types])
+
+        # Accrual periods: each coupon starts at the previous payment date, the first one at the trade start
+        period_starts = np.empty_like(self.payment_dates)
+        period_starts[1:] = self.payment_dates[:-1]
+        period_starts[self.offsets] = self.start_dates
+        self.accruals = yearfrac_vec(period_starts, self.payment_dates, mod.EU_30_360)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _legs(self, curve: DiscountCurve) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Annuities (unit notional) and floating leg values of all the trades from one curve lookup.
+        """
+        # A single interpolation on the payment dates followed by the start dates
+        discounts = curve.df(np.concatenate((self.payment_dates, self.start_dates)))
+        payment_discounts = discounts[: len(self.payment_dates)]
+        start_discounts = discounts[len(self.payment_dates):]
+
+        annuities = np.add.reduceat(self.accruals * payment_discounts, self.offsets)
+        float_legs = start_discounts - payment_discounts[self.last_payments]
+        return annuities, float_legs
+
+    def price(
+        self, discount_factors: Union[pd.Series, DiscountCurve]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Par rates, MtM and BPV of every trade.
+
+        Parameters:
+            discount_factors (Union[pd.Series, DiscountCurve]): Series of discount factors indexed by date or discount curve.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Par rates, MtM (scaled by the notionals) and
+                BPV, i.e. notional times the annuity of the fixed leg, of each trade.
+        """
+        annuities, float_legs = self._legs(as_discount_curve(discount_factors))
+
+        par_rates = float_legs / annuities
+        mtm = self.notionals * self.multipliers * (self.swap_rates * annuities - float_legs)
+        bpv = self.notionals * annuities
+        return par_rates, mtm, bpv
+
+    def par_rates(self, discount_factors: Union[pd.Series, DiscountCurve]) -> np.ndarray:
+        """
+        Par rates of every trade (forward swap rates for trades starting after the curve reference date).
+        """
+        return self.price(discount_factors)[0]
+
+    def mtm(self, discount_factors: Union[pd.Series, DiscountCurve]) -> np.ndarray:
+        """
+        Mark-to-market value of every trade, scaled by its notional.
+        """
+        return self.price(discount_factors)[1]
+
+    def bpv(self, discount_factors: Union[pd.Series, DiscountCurve]) -> np.ndarray:
+        """
+        Basis point value (notional times the fixed leg annuity) of every trade.
+        """
+        return self.price(discount_factors)[2]